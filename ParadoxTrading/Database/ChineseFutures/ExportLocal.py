@@ -0,0 +1,84 @@
+import logging
+import os
+import typing
+
+import pymongo
+
+from ParadoxTrading.Fetch.ChineseFutures import FetchLocal, LocalIndex, \
+    RegisterIndex
+from ParadoxTrading.Fetch.ChineseFutures.FetchBase import FetchBase
+from ParadoxTrading.Fetch.FetchShared import SharedMarketStore
+
+
+class ExportLocal:
+    def __init__(self, _path: str = 'local'):
+        """
+        dump mongo and psql into local files read by FetchLocal
+
+        :param _path: root dir of local data
+        """
+        self.path: str = _path
+
+    def exportIndex(
+            self, _fetcher: FetchBase, _begin_day: str, _end_day: str
+    ):
+        """
+        dump collections tradingday, product and instrument
+        from _begin_day to _end_day(excluded)
+
+        :param _fetcher: any fetcher of ChineseFutures, used to connect mongo
+        :param _begin_day:
+        :param _end_day:
+        :return:
+        """
+        db = _fetcher._get_mongo_db()
+        query = {'TradingDay': {'$gte': _begin_day, '$lt': _end_day}}
+        sort = [('TradingDay', pymongo.ASCENDING)]
+        LocalIndex.store(
+            self.path,
+            db.tradingday.find(query, sort=sort),
+            db.product.find(query, sort=sort),
+            db.instrument.find(query, sort=sort),
+        )
+
+    def exportData(
+            self, _fetcher: FetchBase, _begin_day: str, _end_day: str,
+            _symbols: typing.Iterable[str] = None
+    ):
+        """
+        dump market data of each symbol and each day, exportIndex
+        should be called first. The fetcher should be columnar,
+        only typed columns can be read by mmap
+
+        :param _fetcher: like FetchInstrumentTickData(_columnar=True)
+        :param _begin_day:
+        :param _end_day: excluded
+        :param _symbols: symbols to export, default all the instruments,
+            or all the products if it is index
+        :return:
+        """
+        local = FetchLocal(
+            _fetcher.psql_dbname, self.path, _fetcher.register_type
+        )
+        store = SharedMarketStore(os.path.join(
+            self.path, _fetcher.psql_dbname
+        ))
+
+        for day in local.fetchTradingDayList(_begin_day, _end_day):
+            if _symbols is not None:
+                symbols = _symbols
+            elif _fetcher.register_type is RegisterIndex:
+                symbols = local.fetchAvailableProduct(day)
+            else:
+                symbols = []
+                for product in local.fetchAvailableProduct(day):
+                    symbols += local.fetchAvailableInstrument(product, day)
+
+            for symbol in symbols:
+                key = FetchLocal.dataKey(symbol, day)
+                if store.contains(key):
+                    continue
+                store.publish(key, _fetcher.fetchData(day, symbol))
+            logging.info('export {} {} done'.format(
+                _fetcher.psql_dbname, day
+            ))
@@ -4,3 +4,4 @@ from .ReceiveDCE import ReceiveDCE
 from .ReceiveDailyCTP import ReceiveDailyCTP
 from .ReceiveSHFE import ReceiveSHFE
 from .StoreDailyData import StoreDailyData
+from .ExportLocal import ExportLocal
@@ -1,11 +1,14 @@
+import logging
 import typing
 from collections import deque
 from datetime import datetime
 
-from ParadoxTrading.Engine.Event import EventAbstract
+from ParadoxTrading.Engine.Event import EventAbstract, EventType, \
+    MarketEvent, SettlementEvent
 from ParadoxTrading.Engine.Execution import ExecutionAbstract
 from ParadoxTrading.Engine.MarketSupply import MarketSupplyAbstract
 from ParadoxTrading.Engine.Portfolio import PortfolioAbstract
+from ParadoxTrading.Engine.Profiler import Profiler
 from ParadoxTrading.Engine.Strategy import StrategyAbstract
 from ParadoxTrading.Utils import Serializable
 
@@ -26,6 +29,12 @@ class EngineAbstract(Serializable):
         self.execution: ExecutionAbstract = None
         self.portfolio: PortfolioAbstract = None
         self.strategy_dict: typing.Dict[str, StrategyAbstract] = {}
+        # map register key to strategies, used by broadcast market event
+        self.subscriber_dict: typing.Dict[
+            str, typing.Tuple[StrategyAbstract, ...]
+        ] = {}
+        # set by enableProfiler, reported at the end of run
+        self.profiler: Profiler = None
 
         self._add_market_supply(_market_supply)
         self._add_execution(_execution)
@@ -48,6 +57,59 @@ class EngineAbstract(Serializable):
         assert isinstance(_event, EventAbstract)
         self.event_queue.append(_event)
 
+    def enableProfiler(
+            self, _interval: int = 32, _json_path: str = None
+    ) -> Profiler:
+        """
+        time the calls of each part in run, call it after parts
+        are loaded
+
+        :param _interval: time per tick parts once every _interval ticks
+        :param _json_path: write report as json if set, else log a table
+        :return: the profiler
+        """
+        self.disableProfiler()
+        self.profiler = Profiler(_interval, _json_path)
+        if self.market_supply.fetcher is not None:
+            self.profiler.attachFetcher(self.market_supply.fetcher)
+        return self.profiler
+
+    def disableProfiler(self):
+        if self.profiler is not None:
+            self.profiler.detach()
+            self.profiler = None
+
+    def _timed(
+            self, _func: typing.Callable, _key: str, _per_tick: bool = False
+    ) -> typing.Callable:
+        """
+        _func timed by profiler under _key, or _func itself if profiler
+        is not enabled, so run wraps its callables once
+
+        :param _func:
+        :param _key: component name in report
+        :param _per_tick: time once every profiler.interval calls
+        :return:
+        """
+        if self.profiler is None:
+            return _func
+        return self.profiler.timed(
+            _func, _key, self.profiler.interval if _per_tick else 1
+        )
+
+    def _timed_table(
+            self,
+            _table: typing.Dict[int, typing.Callable[[EventAbstract], None]],
+            _market: bool = False
+    ) -> typing.Dict[int, typing.Callable[[EventAbstract], None]]:
+        """
+        dispatch table timed by profiler, see Profiler.timedTable,
+        or _table itself if profiler is not enabled
+        """
+        if self.profiler is None:
+            return _table
+        return self.profiler.timedTable(_table, _market)
+
     def _add_market_supply(self, _market_supply: MarketSupplyAbstract):
         """
         set marketsupply
@@ -100,6 +162,70 @@ class EngineAbstract(Serializable):
         _strategy.setEngine(self)
         self.market_supply.addStrategy(_strategy)
 
+    def _deal_market_event(self, _event: MarketEvent):
+        self.strategy_dict[_event.strategy].deal(_event)
+
+    def _broadcast_market_event(self, _event: MarketEvent):
+        for s in self.subscriber_dict[_event.market_register_key]:
+            s.deal(_event)
+
+    def _deal_settlement_event(self, _event: SettlementEvent):
+        for s in self.strategy_dict.values():
+            s.settlement(_event)
+
+    def createDispatchTable(
+            self, _types: typing.Iterable[int] = None
+    ) -> typing.Dict[int, typing.Callable[[EventAbstract], None]]:
+        """
+        map event type to the func dealing it, create it before run,
+        because components may be reloaded after init
+
+        :param _types: only keep these event types, default all
+        :return:
+        """
+        deal_market_event = self._deal_market_event
+        if self.market_supply.broadcast:
+            # map register key to its strategies, in the same order as
+            # the events created by market supply without broadcast
+            self.subscriber_dict = dict(
+                (k, tuple(self.strategy_dict[s] for s in v.strategy_set))
+                for k, v in self.market_supply.register_dict.items()
+            )
+            deal_market_event = self._broadcast_market_event
+
+        table = {
+            EventType.MARKET: deal_market_event,
+            EventType.SIGNAL: self.portfolio.dealSignal,
+            EventType.ORDER: self.execution.dealOrderEvent,
+            EventType.FILL: self.portfolio.dealFill,
+            EventType.SETTLEMENT: self._deal_settlement_event,
+        }
+        if _types is not None:
+            table = dict((k, table[k]) for k in _types)
+        return table
+
+    def dealEventQueue(
+            self,
+            _table: typing.Dict[int, typing.Callable[[EventAbstract], None]]
+    ):
+        """
+        deal all the events in queue by dispatch table,
+        events added while dealing are dealt too
+
+        :param _table: created by createDispatchTable
+        :return:
+        """
+        queue = self.event_queue
+        popleft = queue.popleft
+        while queue:
+            event = popleft()
+            try:
+                func = _table[event.type]
+            except KeyError:
+                logging.error(event)
+                raise Exception('unavailable event type!')
+            func(event)
+
     def getTradingDay(self) -> str:
         """
         Return cur tradingday of market
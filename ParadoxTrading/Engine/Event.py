@@ -125,14 +125,27 @@ class DirectionType:
 
 
 class EventAbstract:
+    """
+    events use __slots__ to save memory, subclass sets type as
+    class attribute
+    """
+
+    __slots__ = ()
+
+    type: int = None
+
     def __init__(self):
-        self.type = None
+        pass
 
     def toDict(self) -> dict:
         raise NotImplementedError('toDict not implemented')
 
 
 class MarketEvent(EventAbstract):
+    __slots__ = ('market_register_key', 'strategy', 'symbol', 'data')
+
+    type = EventType.MARKET
+
     def __init__(
             self,
             _market_register_key: str,
@@ -140,8 +153,6 @@ class MarketEvent(EventAbstract):
             _symbol: typing.Hashable,
             _data: typing.Union[None, DataStruct] = None
     ):
-        super().__init__()
-        self.type = EventType.MARKET
         self.market_register_key = _market_register_key
         self.strategy = _strategy
         self.symbol = _symbol
@@ -176,6 +187,17 @@ class MarketEvent(EventAbstract):
 
 
 class SignalEvent(EventAbstract):
+    __slots__ = (
+        'symbol',
+        'strategy',
+        'signal_type',
+        'tradingday',
+        'datetime',
+        'strength',
+    )
+
+    type = EventType.SIGNAL
+
     def __init__(
             self,
             _symbol: str,
@@ -185,8 +207,6 @@ class SignalEvent(EventAbstract):
             _datetime: typing.Union[str, datetime],
             _strength: typing.Any = None
     ):
-        super().__init__()
-        self.type = EventType.SIGNAL
         self.symbol = _symbol
         self.strategy = _strategy
         self.signal_type = _signal_type
@@ -202,7 +222,7 @@ class SignalEvent(EventAbstract):
             'signal_type': self.signal_type,
             'tradingday': self.tradingday,
             'datetime': self.datetime,
-            'strength': self.strength
+            'strength': self.strength,
         }
 
     @staticmethod
@@ -232,6 +252,20 @@ class SignalEvent(EventAbstract):
 
 
 class OrderEvent(EventAbstract):
+    __slots__ = (
+        'index',
+        'symbol',
+        'tradingday',
+        'datetime',
+        'order_type',
+        'action',
+        'direction',
+        'quantity',
+        'price',
+    )
+
+    type = EventType.ORDER
+
     def __init__(
             self,
             _index: int,
@@ -244,8 +278,6 @@ class OrderEvent(EventAbstract):
             _quantity: int = 1,
             _price: float = None
     ):
-        super().__init__()
-        self.type = EventType.ORDER
         self.index = _index
         self.symbol = _symbol
         self.tradingday = _tradingday
@@ -305,6 +337,20 @@ class OrderEvent(EventAbstract):
 
 
 class FillEvent(EventAbstract):
+    __slots__ = (
+        'index',
+        'symbol',
+        'tradingday',
+        'datetime',
+        'quantity',
+        'action',
+        'direction',
+        'price',
+        'commission',
+    )
+
+    type = EventType.FILL
+
     def __init__(
             self,
             _index: int,
@@ -317,8 +363,6 @@ class FillEvent(EventAbstract):
             _price: float,
             _commission: float
     ):
-        super().__init__()
-        self.type = EventType.FILL
         self.index = _index
         self.symbol = _symbol
         self.tradingday = _tradingday
@@ -377,12 +421,16 @@ class FillEvent(EventAbstract):
 
 
 class SettlementEvent(EventAbstract):
+    __slots__ = (
+        'tradingday',
+    )
+
+    type = EventType.SETTLEMENT
+
     def __init__(
             self,
             _tradingday: str,
     ):
-        super().__init__()
-        self.type = EventType.SETTLEMENT
         self.tradingday = _tradingday
 
     def toDict(self) -> dict:
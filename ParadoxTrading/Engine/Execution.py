@@ -5,6 +5,8 @@ import tabulate
 
 import ParadoxTrading.Engine
 from ParadoxTrading.Engine.Event import OrderEvent, FillEvent, DirectionType, ActionType
+from ParadoxTrading.Engine.OrderIndex import OrderIndex
+from ParadoxTrading.Engine.Trace import TRACER, Tracer
 from ParadoxTrading.Utils import DataStruct
 from ParadoxTrading.Utils import Serializable
 
@@ -19,11 +21,42 @@ class ExecutionAbstract(Serializable):
         self.order_dict: typing.Dict[
             int, ParadoxTrading.Engine.Event.OrderEvent] = {}
 
+        # order_dict indexed by symbol, maintained by addOrder and
+        # removeOrder, not pickled
+        self.order_index: OrderIndex = OrderIndex()
+
         self.addPickleKey('order_dict')
 
     def setEngine(self, _engine: 'ParadoxTrading.Engine.EngineAbstract'):
         self.engine = _engine
 
+    def load_state_dict(
+            self, _state_dict: typing.Dict[str, typing.Any]
+    ):
+        super().load_state_dict(_state_dict)
+        self.order_index.rebuild(self.order_dict.values())
+
+    def addOrder(self, _order_event: OrderEvent):
+        """
+        add pending order into order_dict and order_index
+
+        :param _order_event:
+        :return:
+        """
+        assert _order_event.index not in self.order_dict.keys()
+        self.order_dict[_order_event.index] = _order_event
+        self.order_index.add(_order_event)
+
+    def removeOrder(self, _order_event: OrderEvent):
+        """
+        remove pending order from order_dict and order_index
+
+        :param _order_event:
+        :return:
+        """
+        del self.order_dict[_order_event.index]
+        self.order_index.remove(_order_event)
+
     def dealOrderEvent(self, _order_event: OrderEvent):
         raise NotImplementedError('deal not implemented')
 
@@ -32,14 +65,17 @@ class ExecutionAbstract(Serializable):
 
     def addEvent(self, _fill_event: FillEvent):
         self.engine.addEvent(_fill_event)
-        logging.info('Execution send {} {} {} {} at {} when {}'.format(
-            ActionType.toStr(_fill_event.action),
-            DirectionType.toStr(_fill_event.direction),
-            _fill_event.quantity,
-            _fill_event.symbol,
-            _fill_event.price,
-            _fill_event.datetime
-        ))
+        if TRACER.enabled and TRACER.sample(Tracer.FILL):
+            TRACER.record(
+                Tracer.FILL, logging.INFO,
+                'Execution send {} {} {} {} at {} when {}',
+                ActionType.toStr(_fill_event.action),
+                DirectionType.toStr(_fill_event.direction),
+                _fill_event.quantity,
+                _fill_event.symbol,
+                _fill_event.price,
+                _fill_event.datetime
+            )
 
     def __repr__(self) -> str:
         ret = '<<< ORDER DICT >>>\n'
@@ -4,6 +4,7 @@ from datetime import datetime
 
 import ParadoxTrading.Engine
 from ParadoxTrading.Engine.Event import MarketEvent, SettlementEvent
+from ParadoxTrading.Engine.Trace import TRACER, Tracer
 from ParadoxTrading.Fetch import FetchAbstract, RegisterAbstract
 from ParadoxTrading.Utils import DataStruct, Serializable
 
@@ -28,14 +29,22 @@ class ReturnSettlement:
 
 
 class MarketSupplyAbstract(Serializable):
-    def __init__(self, _fetcher: FetchAbstract = None):
+    def __init__(
+            self, _fetcher: FetchAbstract = None, _broadcast: bool = False
+    ):
         """
         base class market supply
 
+        :param _fetcher:
+        :param _broadcast: if True, create one market event for each
+            register key of symbol with strategy None, and the engine
+            delivers it to all the strategies of that register in turn.
+            The event is shared, so strategies should not change it
         """
         super().__init__()
 
         self.fetcher: FetchAbstract = _fetcher
+        self.broadcast: bool = _broadcast
 
         # map market register's key to its object,
         # it will be assigned by addStrategy, record all register
@@ -69,9 +78,11 @@ class MarketSupplyAbstract(Serializable):
 
     def addSettlementEvent(self, _tradingday) -> ReturnSettlement:
         self.engine.addEvent(SettlementEvent(_tradingday))
-        logging.debug('Settlement - tradingday:{}'.format(
-            _tradingday
-        ))
+        if TRACER.enabled and TRACER.sample(Tracer.SETTLEMENT):
+            TRACER.record(
+                Tracer.SETTLEMENT, logging.DEBUG,
+                'Settlement - tradingday:{}', _tradingday
+            )
         return ReturnSettlement(_tradingday)
 
     def addMarketEvent(
@@ -84,11 +95,22 @@ class MarketSupplyAbstract(Serializable):
         :param _data:
         :return:
         """
-        for k in self.symbol_dict[_symbol]:
-            # add event for each strategy if necessary
-            for strategy in self.register_dict[k].strategy_set:
-                self.engine.addEvent(MarketEvent(k, strategy, _symbol, _data))
-        logging.debug('Data({}) {}'.format(_symbol, _data.toDict()))
+        if self.broadcast:
+            # one event for each register, engine delivers to strategies
+            for k in self.symbol_dict[_symbol]:
+                self.engine.addEvent(MarketEvent(k, None, _symbol, _data))
+        else:
+            for k in self.symbol_dict[_symbol]:
+                # add event for each strategy if necessary
+                for strategy in self.register_dict[k].strategy_set:
+                    self.engine.addEvent(
+                        MarketEvent(k, strategy, _symbol, _data)
+                    )
+        if TRACER.enabled and TRACER.sample(Tracer.MARKET):
+            TRACER.record(
+                Tracer.MARKET, logging.DEBUG,
+                'Data({}) {}', _symbol, _data.toDict()
+            )
         return ReturnMarket(_symbol, _data)
 
     def getTradingDay(self) -> str:
@@ -108,6 +130,13 @@ class MarketSupplyAbstract(Serializable):
         """
         raise NotImplementedError('updateData not implemented')
 
+    def close(self):
+        """
+        release resources like background threads, called by engine
+        when run ends, even if it fails
+        """
+        pass
+
     def __repr__(self):
         ret = '### MARKET REGISTER ###\n'
         ret += '\n'.join([str(v) for v in self.register_dict.values()])
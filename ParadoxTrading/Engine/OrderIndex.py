@@ -0,0 +1,164 @@
+import typing
+from bisect import bisect_left, bisect_right, insort
+
+from ParadoxTrading.Engine.Event import DirectionType, OrderEvent, OrderType
+
+
+class SymbolOrders:
+    """
+    pending orders of one symbol. Market orders are kept in FIFO,
+    limit orders in price sorted ladders of (key, index), the key of
+    buy ladder is -price, so the orders most likely to cross are at
+    the front of both ladders
+    """
+
+    __slots__ = ('order_dict', 'market', 'buy', 'sell')
+
+    def __init__(self):
+        # index -> order, in the order added
+        self.order_dict: typing.Dict[int, OrderEvent] = {}
+        # index -> order of market orders
+        self.market: typing.Dict[int, OrderEvent] = {}
+        self.buy: typing.List[typing.Tuple[float, int]] = []
+        self.sell: typing.List[typing.Tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.order_dict)
+
+    @staticmethod
+    def _ladder_key(_order: OrderEvent) -> typing.Tuple[float, int]:
+        if _order.direction == DirectionType.BUY:
+            return -_order.price, _order.index
+        elif _order.direction == DirectionType.SELL:
+            return _order.price, _order.index
+        else:
+            raise Exception('unknown direction type')
+
+    def _ladder(self, _order: OrderEvent) -> list:
+        if _order.direction == DirectionType.BUY:
+            return self.buy
+        return self.sell
+
+    def add(self, _order: OrderEvent):
+        self.order_dict[_order.index] = _order
+        if _order.order_type == OrderType.MARKET:
+            self.market[_order.index] = _order
+        else:
+            if _order.price is None:
+                raise Exception('limit order without price')
+            insort(self._ladder(_order), self._ladder_key(_order))
+
+    def remove(self, _index: int) -> OrderEvent:
+        order = self.order_dict.pop(_index)
+        if order.order_type == OrderType.MARKET:
+            del self.market[_index]
+        else:
+            ladder = self._ladder(order)
+            del ladder[bisect_left(ladder, self._ladder_key(order))]
+        return order
+
+    def popCrossed(
+            self, _askprice: float, _bidprice: float
+    ) -> typing.List[OrderEvent]:
+        """
+        remove and return the orders which can be filled, market orders,
+        buy limit orders whose price >= _askprice and sell limit orders
+        whose price <= _bidprice. Invalid price (<= 0) matches nothing
+        on its side
+
+        :return: orders sorted by index
+        """
+        indexes = []
+        if self.market:
+            for k, v in self.market.items():
+                if v.direction == DirectionType.BUY:
+                    if _askprice > 0:
+                        indexes.append(k)
+                elif _bidprice > 0:
+                    indexes.append(k)
+        # only compare the front of ladders if nothing crosses
+        buy = self.buy
+        if buy and 0 < _askprice <= -buy[0][0]:
+            end = bisect_right(buy, (-_askprice, float('inf')))
+            indexes += [i for _, i in buy[:end]]
+            del buy[:end]
+        sell = self.sell
+        if sell and 0 < _bidprice and sell[0][0] <= _bidprice:
+            end = bisect_right(sell, (_bidprice, float('inf')))
+            indexes += [i for _, i in sell[:end]]
+            del sell[:end]
+        if not indexes:
+            return indexes
+
+        ret = []
+        for index in sorted(indexes):
+            order = self.order_dict.pop(index)
+            self.market.pop(index, None)
+            ret.append(order)
+        return ret
+
+
+class OrderIndex:
+    """
+    pending orders of execution indexed by symbol, so matching a market
+    update only touches the orders of its symbol. It is derived from
+    execution.order_dict, and rebuilt after loading it
+    """
+
+    def __init__(self):
+        self.symbol_dict: typing.Dict[str, SymbolOrders] = {}
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self.symbol_dict.values())
+
+    def add(self, _order: OrderEvent):
+        try:
+            orders = self.symbol_dict[_order.symbol]
+        except KeyError:
+            orders = self.symbol_dict[_order.symbol] = SymbolOrders()
+        orders.add(_order)
+
+    def remove(self, _order: OrderEvent):
+        orders = self.symbol_dict[_order.symbol]
+        orders.remove(_order.index)
+        if not orders:
+            del self.symbol_dict[_order.symbol]
+
+    def getOrders(self, _symbol: str) -> typing.List[OrderEvent]:
+        """
+        :return: pending orders of symbol sorted by index
+        """
+        try:
+            orders = self.symbol_dict[_symbol].order_dict
+        except KeyError:
+            return []
+        return [orders[k] for k in sorted(orders)]
+
+    def popCrossed(
+            self, _symbol: str, _askprice: float, _bidprice: float
+    ) -> typing.List[OrderEvent]:
+        """
+        remove and return the orders of symbol which can be filled
+        by the ask and bid, see SymbolOrders.popCrossed
+        """
+        try:
+            orders = self.symbol_dict[_symbol]
+        except KeyError:
+            return []
+        ret = orders.popCrossed(_askprice, _bidprice)
+        if not orders:
+            del self.symbol_dict[_symbol]
+        return ret
+
+    def popAll(self, _symbol: str) -> typing.List[OrderEvent]:
+        """
+        remove and return all the orders of symbol sorted by index
+        """
+        ret = self.getOrders(_symbol)
+        self.symbol_dict.pop(_symbol, None)
+        return ret
+
+    def rebuild(self, _orders: typing.Iterable[OrderEvent]):
+        self.symbol_dict = {}
+        for order in _orders:
+            self.add(order)
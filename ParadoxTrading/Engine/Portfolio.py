@@ -1,9 +1,9 @@
+import copy
 import logging
 import sys
 import typing
-from copy import copy
+from datetime import datetime, timedelta
 
-import pymongo
 import tabulate
 from pymongo import MongoClient
 from pymongo.collection import Collection
@@ -11,7 +11,60 @@ from pymongo.collection import Collection
 import ParadoxTrading.Engine
 from ParadoxTrading.Engine.Event import ActionType, DirectionType, EventType, \
     FillEvent, OrderEvent, OrderType, SignalEvent, SignalType
-from ParadoxTrading.Utils import DataStruct, Serializable
+from ParadoxTrading.Engine.RecordSink import RecordSinkAbstract, \
+    createRecordCollection
+from ParadoxTrading.Engine.Trace import TRACER, Tracer
+from ParadoxTrading.Utils import DataStruct, RecordStore, Serializable
+
+# fields of records, dtype None means stored as categories
+SIGNAL_FIELDS = [
+    ('type', 'int8'), ('symbol', None), ('strategy', None),
+    ('signal_type', 'int8'), ('tradingday', None), ('datetime', None),
+    ('strength', 'float64'),
+]
+ORDER_FIELDS = [
+    ('type', 'int8'), ('index', 'int64'), ('symbol', None),
+    ('tradingday', None), ('datetime', None), ('order_type', 'int8'),
+    ('action', 'int8'), ('direction', 'int8'), ('quantity', 'int64'),
+    ('price', 'float64'), ('strategy', None),
+]
+FILL_FIELDS = [
+    ('type', 'int8'), ('index', 'int64'), ('symbol', None),
+    ('tradingday', None), ('datetime', None), ('quantity', 'int64'),
+    ('action', 'int8'), ('direction', 'int8'), ('price', 'float64'),
+    ('commission', 'float64'), ('strategy', None),
+]
+SETTLEMENT_FIELDS = [
+    ('tradingday', None), ('type', 'int8'), ('fund', 'float64'),
+    ('commission', 'float64'), ('margin', 'float64'),
+]
+# intraday samples, not stored by storeRecords
+EQUITY_FIELDS = [
+    ('tradingday', None), ('datetime', None), ('equity', 'float64'),
+    ('margin', 'float64'), ('exposure', 'float64'),
+]
+
+
+def _create_records() -> typing.Dict[str, RecordStore]:
+    """
+    empty record stores of PortfolioMgr, int enums are exported as strings
+    """
+    return {
+        'signal_record': RecordStore(
+            SIGNAL_FIELDS, {'signal_type': SignalType.toStr}
+        ),
+        'order_record': RecordStore(ORDER_FIELDS, {
+            'order_type': OrderType.toStr,
+            'action': ActionType.toStr,
+            'direction': DirectionType.toStr,
+        }),
+        'fill_record': RecordStore(FILL_FIELDS, {
+            'action': ActionType.toStr,
+            'direction': DirectionType.toStr,
+        }),
+        'settlement_record': RecordStore(SETTLEMENT_FIELDS),
+        'equity_record': RecordStore(EQUITY_FIELDS),
+    }
 
 
 class PositionMgr:
@@ -25,6 +78,10 @@ class PositionMgr:
 
         self.margin_count: int = 0
         self.margin: float = 0.0
+        # profit and loss and value at the last price,
+        # kept by PortfolioMgr
+        self.profit_and_loss: float = 0.0
+        self.exposure: float = 0.0
 
     def getPosition(self, _type: int) -> int:
         if _type == SignalType.LONG:
@@ -34,6 +91,13 @@ class PositionMgr:
         else:
             raise Exception('unavailable type')
 
+    def getProfitAndLoss(self, _price: float) -> float:
+        return self.long * (_price - self.long_price) + \
+            self.short * (self.short_price - _price)
+
+    def getExposure(self, _price: float) -> float:
+        return (self.long + self.short) * _price
+
     def updateMargin(self, _price: float, _margin_rate: float):
         # margin count is the max of long or short
         cur_margin_count = max(self.long, self.short)
@@ -148,11 +212,18 @@ class PortfolioMgr:
     ):
         super().__init__()
 
-        # records for signal, order and fill
-        self.signal_record: typing.List[typing.Dict] = []
-        self.order_record: typing.List[typing.Dict] = []
-        self.fill_record: typing.List[typing.Dict] = []
-        self.settlement_record: typing.List[typing.Dict] = []
+        # records for signal, order and fill, stored by columns
+        records = _create_records()
+        self.signal_record: RecordStore = records['signal_record']
+        self.order_record: RecordStore = records['order_record']
+        self.fill_record: RecordStore = records['fill_record']
+        self.settlement_record: RecordStore = records['settlement_record']
+        self.equity_record: RecordStore = records['equity_record']
+        # stream records to sink during backtest if set
+        self.record_sink: RecordSinkAbstract = None
+        self.sink_chunk_size: int = 0
+        # kinds of records sent to sink, removed from memory
+        self.streamed_kinds: typing.Set[str] = set()
 
         # map order index to unfilled orders
         self.unfilled_order: typing.Dict[int, OrderEvent] = {}
@@ -164,6 +235,99 @@ class PortfolioMgr:
         self.position_mgr: typing.Dict[str, PositionMgr] = {}
         self.fund_mgr: FundMgr = FundMgr(_init_fund)
 
+        # running sums over positions, so querying them is O(1)
+        self.margin: float = 0.0
+        self.profit_and_loss: float = 0.0
+        self.exposure: float = 0.0
+        # map symbol to its latest price, see updatePrice
+        self.last_price_dict: typing.Dict[str, float] = {}
+
+        # sample equity intraday if set, see setEquityInterval
+        self.equity_interval: timedelta = None
+        self.next_equity_time: datetime = None
+
+    def __getstate__(self) -> dict:
+        # sink owns thread and connection, not pickled
+        state = dict(self.__dict__)
+        state['record_sink'] = None
+        return state
+
+    def __setstate__(self, _state: dict):
+        # records pickled by older versions are lists of dicts
+        self.__dict__.update(_state)
+        self.__dict__.setdefault('record_sink', None)
+        self.__dict__.setdefault('sink_chunk_size', 0)
+        self.__dict__.setdefault('streamed_kinds', set())
+        self.__dict__.setdefault('equity_interval', None)
+        self.__dict__.setdefault('next_equity_time', None)
+        if 'exposure' not in self.__dict__:
+            # positions are marked at their own prices until updated
+            for p in self.position_mgr.values():
+                p.profit_and_loss = 0.0
+                p.exposure = 0.0
+            self.margin = sum(p.margin for p in self.position_mgr.values())
+            self.profit_and_loss = 0.0
+            self.exposure = 0.0
+            self.__dict__.setdefault('last_price_dict', {})
+        for key, store in _create_records().items():
+            records = self.__dict__.setdefault(key, [])
+            if isinstance(records, list):
+                for d in records:
+                    store.appendDict(d)
+                self.__dict__[key] = store
+
+    def setRecordSink(
+            self, _sink: RecordSinkAbstract, _chunk_size: int = 10000
+    ):
+        """
+        stream records to sink, each kind of records is sent when there
+        are _chunk_size of them, and the rest by closeRecordSink.
+        Records sent are removed from memory, so getFillData and others
+        only return records not sent yet. Settlement records are one
+        each day, they are kept in memory and sent by closeRecordSink,
+        so getSettlementData is complete
+
+        :param _sink:
+        :param _chunk_size: records in each chunk
+        :return:
+        """
+        assert _chunk_size > 0
+        self.record_sink = _sink
+        self.sink_chunk_size = _chunk_size
+
+    def _stream_records(self, _kind: str, _records: RecordStore):
+        if len(_records) >= self.sink_chunk_size:
+            self.streamed_kinds.add(_kind)
+            self.record_sink.put(_kind, _records.detach())
+
+    def _warn_streamed(self, _kind: str):
+        if _kind in self.streamed_kinds:
+            logging.warning(
+                '{} records are streamed to sink, only the ones not sent '
+                'are returned'.format(_kind)
+            )
+
+    def closeRecordSink(self):
+        """
+        send the rest records, and wait until sink finishes writing
+        """
+        if self.record_sink is None:
+            return
+        sink = self.record_sink
+        self.record_sink = None
+        for kind, records in (
+                ('signal', self.signal_record),
+                ('order', self.order_record),
+                ('fill', self.fill_record),
+                ('equity', self.equity_record),
+        ):
+            if len(records):
+                self.streamed_kinds.add(kind)
+                sink.put(kind, records.detach())
+        if len(self.settlement_record):
+            sink.put('settlement', copy.deepcopy(self.settlement_record))
+        sink.close()
+
     def getSymbolList(self) -> typing.List[str]:
         """
         get symbols which have long or short positions
@@ -185,7 +349,7 @@ class PortfolioMgr:
         """
         get current total margin
         """
-        return sum([p.margin for p in self.position_mgr.values()])
+        return self.margin
 
     def setStaticFund(self, _fund: float):
         """
@@ -207,16 +371,57 @@ class PortfolioMgr:
         return self.fund_mgr.getCommission()
 
     def getProfitAndLoss(
-            self, _symbol_price_dict: typing.Dict[str, float]
+            self, _symbol_price_dict: typing.Dict[str, float] = None
     ) -> float:
+        """
+        :param _symbol_price_dict: price of each symbol in positions,
+            if None, use the latest prices of updatePrice in O(1)
+        :return: floating profit and loss of positions
+        """
+        if _symbol_price_dict is None:
+            return self.profit_and_loss
         ret = 0
         for k, v in self.position_mgr.items():
-            price = _symbol_price_dict[k]
-            long_part = v.long * (price - v.long_price)
-            short_part = v.short * (v.short_price - price)
-            ret += long_part + short_part
+            ret += v.getProfitAndLoss(_symbol_price_dict[k])
         return ret
 
+    def getEquity(self) -> float:
+        """
+        dynamic fund at the latest prices, O(1)
+        """
+        return self.fund_mgr.getDynamicFund(self.profit_and_loss)
+
+    def getExposure(self) -> float:
+        """
+        value of long and short positions at the latest prices, O(1)
+        """
+        return self.exposure
+
+    def _mark_position(self, _position: PositionMgr, _price: float):
+        """
+        update profit and loss and exposure of position and the running sums
+        """
+        profit_and_loss = _position.getProfitAndLoss(_price)
+        self.profit_and_loss += profit_and_loss - _position.profit_and_loss
+        _position.profit_and_loss = profit_and_loss
+        exposure = _position.getExposure(_price)
+        self.exposure += exposure - _position.exposure
+        _position.exposure = exposure
+
+    def updatePrice(self, _symbol: str, _price: float):
+        """
+        set the latest price of symbol, and mark its position to market
+
+        :param _symbol:
+        :param _price:
+        :return:
+        """
+        self.last_price_dict[_symbol] = _price
+        try:
+            self._mark_position(self.position_mgr[_symbol], _price)
+        except KeyError:
+            pass
+
     def incPosition(
             self, _symbol: str, _type: int,
             _quantity: int, _price: float
@@ -233,16 +438,17 @@ class PortfolioMgr:
         assert _type == SignalType.LONG or _type == SignalType.SHORT
         assert _quantity > 0
         try:
-            # try to add directly
-            self.position_mgr[_symbol].incPosition(
-                _type, _quantity, _price, self.margin_rate
-            )
+            tmp = self.position_mgr[_symbol]
         except KeyError:
-            # create if failed
-            self.position_mgr[_symbol] = PositionMgr(_symbol)
-            self.position_mgr[_symbol].incPosition(
-                _type, _quantity, _price, self.margin_rate
-            )
+            # create if not exists
+            tmp = self.position_mgr[_symbol] = PositionMgr(_symbol)
+        margin = tmp.margin
+        tmp.incPosition(_type, _quantity, _price, self.margin_rate)
+        self.margin += tmp.margin - margin
+        # fill price is the latest price of symbol, the one left in
+        # dict may be stale if no market data is fed by updatePrice
+        self.last_price_dict[_symbol] = _price
+        self._mark_position(tmp, _price)
 
     def decPosition(
             self, _symbol: str, _type: int,
@@ -261,9 +467,13 @@ class PortfolioMgr:
         assert _quantity > 0
         assert _symbol in self.position_mgr.keys()
         tmp = self.position_mgr[_symbol]
+        margin = tmp.margin
         profit_loss = tmp.decPosition(
             _type, _quantity, _price, self.margin_rate
         )
+        self.margin += tmp.margin - margin
+        self.last_price_dict[_symbol] = _price
+        self._mark_position(tmp, _price)
         # delete if empty, speed up and reduce memory
         if tmp.long == 0 and tmp.short == 0:
             del self.position_mgr[_symbol]
@@ -277,16 +487,19 @@ class PortfolioMgr:
         :param _signal_event:
         :return:
         """
-        self.signal_record.append(_signal_event.toDict())
+        self.signal_record.appendDict(_signal_event.toDict())
+        if self.record_sink is not None:
+            self._stream_records('signal', self.signal_record)
 
-    def getSignalData(self):
-        tmp = DataStruct([
+    def getSignalData(self, _typed: bool = False) -> DataStruct:
+        """
+        :param _typed: numeric columns as numpy arrays, see
+            RecordStore.toDataStruct
+        """
+        self._warn_streamed('signal')
+        return self.signal_record.toDataStruct('datetime', [
             'strategy', 'tradingday', 'datetime', 'symbol', 'strength'
-        ], 'datetime')
-        for d in self.signal_record:
-            tmp.addDict(d)
-
-        return tmp
+        ], _typed)
 
     def dealOrder(self, _strategy: str, _order_event: OrderEvent):
         """
@@ -300,23 +513,22 @@ class PortfolioMgr:
         # store record
         order_dict = _order_event.toDict()
         order_dict['strategy'] = _strategy
-        self.order_record.append(order_dict)
+        self.order_record.appendDict(order_dict)
+        if self.record_sink is not None:
+            self._stream_records('order', self.order_record)
         # add to unfilled table
         self.unfilled_order[_order_event.index] = _order_event
 
-    def getOrderData(self):
-        tmp = DataStruct([
+    def getOrderData(self, _typed: bool = False) -> DataStruct:
+        """
+        :param _typed: numeric columns as numpy arrays, see
+            RecordStore.toDataStruct
+        """
+        self._warn_streamed('order')
+        return self.order_record.toDataStruct('datetime', [
             'strategy', 'tradingday', 'datetime', 'symbol', 'index',
             'order_type', 'action', 'direction', 'quantity', 'price'
-        ], 'datetime')
-        for d in self.order_record:
-            d = copy(d)
-            d['order_type'] = OrderType.toStr(d['order_type'])
-            d['action'] = ActionType.toStr(d['action'])
-            d['direction'] = DirectionType.toStr(d['direction'])
-            tmp.addDict(d)
-
-        return tmp
+        ], _typed)
 
     def dealFill(self, _strategy: str, _fill_event: FillEvent):
         """
@@ -329,7 +541,9 @@ class PortfolioMgr:
         # store record
         fill_dict = _fill_event.toDict()
         fill_dict['strategy'] = _strategy
-        self.fill_record.append(fill_dict)
+        self.fill_record.appendDict(fill_dict)
+        if self.record_sink is not None:
+            self._stream_records('fill', self.fill_record)
 
         try:
             assert _fill_event.index in self.unfilled_order.keys()
@@ -387,18 +601,16 @@ class PortfolioMgr:
         # add commission
         self.fund_mgr.incCommission(_fill_event.commission)
 
-    def getFillData(self):
-        tmp = DataStruct([
+    def getFillData(self, _typed: bool = False) -> DataStruct:
+        """
+        :param _typed: numeric columns as numpy arrays, see
+            RecordStore.toDataStruct
+        """
+        self._warn_streamed('fill')
+        return self.fill_record.toDataStruct('datetime', [
             'strategy', 'tradingday', 'datetime', 'symbol', 'index',
             'action', 'direction', 'price', 'quantity', 'commission'
-        ], 'datetime')
-        for d in self.fill_record:
-            d = copy(d)
-            d['action'] = ActionType.toStr(d['action'])
-            d['direction'] = DirectionType.toStr(d['direction'])
-            tmp.addDict(d)
-
-        return tmp
+        ], _typed)
 
     def dealSettlement(
             self, _tradingday: str,
@@ -413,32 +625,96 @@ class PortfolioMgr:
         """
         profit_loss = self.getProfitAndLoss(_symbol_price_dict)
 
-        self.settlement_record.append({
-            'tradingday': _tradingday,
-            'type': EventType.SETTLEMENT,
-            'fund': self.getDynamicFund(profit_loss),
-            'commission': self.getCommission(),
-            'margin': self.getMargin(),
-        })
+        self.settlement_record.append((
+            _tradingday,
+            EventType.SETTLEMENT,
+            self.getDynamicFund(profit_loss),
+            self.getCommission(),
+            self.getMargin(),
+        ))
 
         self.fund_mgr.dealSettlement(profit_loss)
+        # positions are marked at settlement price, and running sums
+        # are refreshed, so float error does not accumulate
+        self.margin = 0.0
+        self.exposure = 0.0
         for k, v in self.position_mgr.items():
-            v.dealSettlement(_symbol_price_dict[k], self.margin_rate)
-
-    def getSettlementData(self):
-        tmp = DataStruct([
+            price = _symbol_price_dict[k]
+            v.dealSettlement(price, self.margin_rate)
+            v.profit_and_loss = 0.0
+            v.exposure = v.getExposure(price)
+            self.last_price_dict[k] = price
+            self.margin += v.margin
+            self.exposure += v.exposure
+        self.profit_and_loss = 0.0
+        # start sampling again in the next tradingday
+        self.next_equity_time = None
+
+    def getSettlementData(self, _typed: bool = False) -> DataStruct:
+        """
+        :param _typed: numeric columns as numpy arrays, see
+            RecordStore.toDataStruct
+        """
+        return self.settlement_record.toDataStruct('tradingday', [
             'tradingday', 'fund', 'commission', 'margin'
-        ], 'tradingday')
-        for d in self.settlement_record:
-            tmp.addDict(d)
+        ], _typed)
 
-        return tmp
+    def setEquityInterval(self, _seconds: float = None):
+        """
+        sample equity, margin and exposure by sampleEquity at most
+        once every _seconds of market time, samples are aligned to
+        multiples of _seconds from midnight
+
+        :param _seconds: None to disable
+        :return:
+        """
+        if _seconds is None:
+            self.equity_interval = None
+        else:
+            assert _seconds > 0
+            self.equity_interval = timedelta(seconds=_seconds)
+        self.next_equity_time = None
+
+    def sampleEquity(self, _tradingday: str, _datetime: datetime):
+        """
+        store one sample by the running sums, and set the time of next
+        sample. Caller checks next_equity_time on each market data,
+        see PortfolioAbstract.sampleEquity
+
+        :param _tradingday:
+        :param _datetime: market time
+        :return:
+        """
+        self.equity_record.append((
+            _tradingday, _datetime, self.getEquity(),
+            self.margin, self.exposure,
+        ))
+        if self.record_sink is not None:
+            self._stream_records('equity', self.equity_record)
+        interval = self.equity_interval
+        self.next_equity_time = _datetime + interval - (
+            _datetime - _datetime.replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+        ) % interval
+
+    def getEquityData(self, _typed: bool = False) -> DataStruct:
+        """
+        :param _typed: numeric columns as numpy arrays, see
+            RecordStore.toDataStruct
+        """
+        self._warn_streamed('equity')
+        return self.equity_record.toDataStruct('datetime', [
+            'tradingday', 'datetime', 'equity', 'margin', 'exposure'
+        ], _typed)
 
     def resetRecords(self):
-        self.signal_record = []
-        self.order_record = []
-        self.fill_record = []
-        self.settlement_record = []
+        self.signal_record.clear()
+        self.order_record.clear()
+        self.fill_record.clear()
+        self.settlement_record.clear()
+        self.equity_record.clear()
+        self.streamed_kinds = set()
 
     def storeRecords(self, _coll: Collection):
         """
@@ -449,8 +725,8 @@ class PortfolioMgr:
         """
         logging.info('Portfolio store records...')
         _coll.insert_many(
-            self.signal_record + self.order_record +
-            self.fill_record + self.settlement_record
+            self.signal_record.toDicts() + self.order_record.toDicts() +
+            self.fill_record.toDicts() + self.settlement_record.toDicts()
         )
 
     def getPositionTable(self):
@@ -563,11 +839,15 @@ class PortfolioAbstract(Serializable):
 
         # add it into event queue
         self.engine.addEvent(_order_event)
-        logging.info('Portfolio send: {} {} {} {} at {} when {}'.format(
-            ActionType.toStr(_order_event.action),
-            DirectionType.toStr(_order_event.direction), _order_event.quantity,
-            _order_event.symbol, _order_event.price, _order_event.datetime
-        ))
+        if TRACER.enabled and TRACER.sample(Tracer.ORDER):
+            TRACER.record(
+                Tracer.ORDER, logging.INFO,
+                'Portfolio send: {} {} {} {} at {} when {}',
+                ActionType.toStr(_order_event.action),
+                DirectionType.toStr(_order_event.direction),
+                _order_event.quantity, _order_event.symbol,
+                _order_event.price, _order_event.datetime
+            )
 
     def storeRecords(
             self,
@@ -586,22 +866,57 @@ class PortfolioAbstract(Serializable):
         :return:
         """
         client = MongoClient(host=_mongo_host)
-        db = client[_mongo_database]
-        # clear old backtest records
-        if _backtest_key in db.collection_names() and _clear:
-            db.drop_collection(_backtest_key)
-
-        coll = db[_backtest_key]
-        coll.create_index([
-            ('type', pymongo.ASCENDING),
-            ('strategy', pymongo.ASCENDING),
-            ('tradingday', pymongo.ASCENDING),
-            ('datetime', pymongo.ASCENDING),
-        ])
+        coll = createRecordCollection(
+            client[_mongo_database], _backtest_key, _clear
+        )
         self.portfolio_mgr.storeRecords(coll)
 
         client.close()
 
+    def setRecordSink(
+            self, _sink: RecordSinkAbstract, _chunk_size: int = 10000
+    ):
+        """
+        stream records to sink during backtest instead of keeping them
+        in memory, see PortfolioMgr.setRecordSink. The engine closes it
+        when backtest ends
+
+        :param _sink: like CSVRecordSink or MongoRecordSink
+        :param _chunk_size: records in each chunk
+        :return:
+        """
+        self.portfolio_mgr.setRecordSink(_sink, _chunk_size)
+
+    def closeRecordSink(self):
+        self.portfolio_mgr.closeRecordSink()
+
+    def setEquityInterval(self, _seconds: float = None):
+        """
+        sample intraday equity curve every _seconds of market time,
+        see getEquityData
+
+        :param _seconds: None to disable
+        :return:
+        """
+        self.portfolio_mgr.setEquityInterval(_seconds)
+
+    def sampleEquity(self):
+        """
+        called by subclass in dealMarket after prices are updated,
+        sample if equity sampling is enabled and the interval is reached
+        """
+        if self.portfolio_mgr.equity_interval is None:
+            return
+        now = self.engine.getDatetime()
+        next_time = self.portfolio_mgr.next_equity_time
+        if next_time is None or now >= next_time:
+            self.portfolio_mgr.sampleEquity(
+                self.engine.getTradingDay(), now
+            )
+
+    def getEquityData(self, _typed: bool = False):
+        return self.portfolio_mgr.getEquityData(_typed)
+
     def dealSignal(self, _event: SignalEvent):
         """
         deal signal event from strategy
@@ -611,11 +926,11 @@ class PortfolioAbstract(Serializable):
         """
         raise NotImplementedError('dealSignal not implemented')
 
-    def getSignalData(self):
-        return self.portfolio_mgr.getSignalData()
+    def getSignalData(self, _typed: bool = False):
+        return self.portfolio_mgr.getSignalData(_typed)
 
-    def getOrderData(self):
-        return self.portfolio_mgr.getOrderData()
+    def getOrderData(self, _typed: bool = False):
+        return self.portfolio_mgr.getOrderData(_typed)
 
     def dealFill(self, _event: FillEvent):
         """
@@ -626,14 +941,14 @@ class PortfolioAbstract(Serializable):
         """
         raise NotImplementedError('dealFill not implemented')
 
-    def getFillData(self):
-        return self.portfolio_mgr.getFillData()
+    def getFillData(self, _typed: bool = False):
+        return self.portfolio_mgr.getFillData(_typed)
 
     def dealSettlement(self, _tradingday: str):
         raise NotImplementedError('dealSettlement not implemented')
 
-    def getSettlementData(self):
-        return self.portfolio_mgr.getSettlementData()
+    def getSettlementData(self, _typed: bool = False):
+        return self.portfolio_mgr.getSettlementData(_typed)
 
     def dealMarket(self, _symbol: str, _data: DataStruct):
         raise NotImplementedError('dealMarket not implemented')
@@ -0,0 +1,272 @@
+import json
+import logging
+import threading
+import typing
+from math import frexp, ldexp
+from time import perf_counter
+
+import tabulate
+
+from ParadoxTrading.Engine.Event import EventAbstract, EventType
+
+
+class ProfileStat:
+    """
+    latency stat of one component. Latencies are counted in a log
+    histogram, 8 buckets for each power of 2, so percentiles are
+    accurate to about 6% with O(1) cost each call.
+
+    If only one of every weight calls is timed, calls and total are
+    estimated by weight
+    """
+
+    __slots__ = ('weight', 'count', 'total', 'max', 'hist')
+
+    def __init__(self, _weight: int = 1):
+        self.weight: int = _weight
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+        # (exponent << 3) + sub bucket -> count
+        self.hist: typing.Dict[int, int] = {}
+
+    def add(self, _cost: float):
+        self.count += 1
+        self.total += _cost
+        if _cost > self.max:
+            self.max = _cost
+        m, e = frexp(_cost)
+        key = (e << 3) + int(m * 16) - 8
+        hist = self.hist
+        hist[key] = hist.get(key, 0) + 1
+
+    def percentile(self, _q: float) -> float:
+        """
+        :param _q: in [0, 100]
+        :return: latency in seconds, mid of the bucket
+        """
+        if not self.count:
+            return float('nan')
+        rank = _q / 100.0 * self.count
+        acc = 0
+        for key in sorted(self.hist):
+            acc += self.hist[key]
+            if acc >= rank:
+                e, sub = key >> 3, key & 7
+                return min(ldexp((sub + 8.5) / 16, e), self.max)
+        return self.max
+
+    def toDict(self) -> dict:
+        return {
+            'calls': self.count * self.weight,
+            'sampled': self.count,
+            'total': self.total * self.weight,
+            'mean': self.total / self.count if self.count else float('nan'),
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+class Profiler:
+    """
+    opt-in instrumentation of engine, created by
+    EngineAbstract.enableProfiler.
+
+    Timing every call costs more than a tick of a simple strategy,
+    so the per tick parts (updateData, matchMarket, dealMarket and
+    strategies' deal) are only timed on one of every interval calls.
+    Signal, order, fill, settlement and fetcher are rare and always
+    timed.
+    """
+
+    # event type -> component name
+    TABLE_KEYS: typing.Dict[int, str] = {
+        EventType.SIGNAL: 'portfolio.dealSignal',
+        EventType.ORDER: 'execution.dealOrderEvent',
+        EventType.FILL: 'portfolio.dealFill',
+        EventType.SETTLEMENT: 'strategy.settlement',
+    }
+
+    def __init__(self, _interval: int = 32, _json_path: str = None):
+        """
+
+        :param _interval: time per tick parts once every _interval ticks
+        :param _json_path: if not None, report() writes json into it,
+            else report() logs a table
+        """
+        assert _interval >= 1
+        self.interval: int = _interval
+        self.json_path: str = _json_path
+        self.stat_dict: typing.Dict[str, ProfileStat] = {}
+        # (obj, method name) wrapped by attachFetcher
+        self.wrapped: typing.List[typing.Tuple[object, str]] = []
+        # fetcher may be called by prefetch threads
+        self.lock: threading.Lock = threading.Lock()
+
+    def getStat(self, _key: str, _weight: int = 1) -> ProfileStat:
+        try:
+            return self.stat_dict[_key]
+        except KeyError:
+            stat = self.stat_dict[_key] = ProfileStat(_weight)
+            return stat
+
+    def timed(
+            self, _func: typing.Callable, _key: str,
+            _weight: int = 1, _lock: bool = False
+    ) -> typing.Callable:
+        """
+        return a func timing each call of _func under _key
+
+        :param _func:
+        :param _key: component name in report
+        :param _weight: _func is timed once every _weight calls
+        :param _lock: set True if it is called from several threads
+        :return:
+        """
+        add = self.getStat(_key, _weight).add
+
+        if _lock:
+            lock = self.lock
+
+            def wrapper(*_args, **_kwargs):
+                begin = perf_counter()
+                try:
+                    return _func(*_args, **_kwargs)
+                finally:
+                    cost = perf_counter() - begin
+                    with lock:
+                        add(cost)
+        else:
+            def wrapper(*_args, **_kwargs):
+                begin = perf_counter()
+                try:
+                    return _func(*_args, **_kwargs)
+                finally:
+                    add(perf_counter() - begin)
+
+        if _weight > 1:
+            timed_func = wrapper
+            calls = 0
+
+            def wrapper(*_args, **_kwargs):
+                nonlocal calls
+                calls += 1
+                if calls % _weight:
+                    return _func(*_args, **_kwargs)
+                return timed_func(*_args, **_kwargs)
+
+        return wrapper
+
+    def timedTable(
+            self,
+            _table: typing.Dict[int, typing.Callable[[EventAbstract], None]],
+            _market: bool = False
+    ) -> typing.Dict[int, typing.Callable[[EventAbstract], None]]:
+        """
+        copy dispatch table with its funcs timed
+
+        :param _table: created by engine.createDispatchTable
+        :param _market: also time market event, once every interval
+            calls. Market event is timed by the name of its strategy,
+            or of its register key when it is broadcast
+        :return:
+        """
+        table = dict(_table)
+        for k, key in self.TABLE_KEYS.items():
+            if k in table:
+                table[k] = self.timed(table[k], key)
+        if _market and EventType.MARKET in table:
+            deal = table[EventType.MARKET]
+            weight = self.interval
+            get_stat = self.getStat
+            # calls of each strategy or register key, counted apart so
+            # strategies receiving ticks in turn are all sampled
+            calls_dict: typing.Dict[str, int] = {}
+
+            def deal_market_event(_event):
+                name = _event.strategy or _event.market_register_key
+                calls = calls_dict.get(name, 0) + 1
+                calls_dict[name] = calls
+                if calls % weight:
+                    deal(_event)
+                    return
+                if _event.strategy is None:
+                    key = 'broadcast.{}.deal'.format(
+                        _event.market_register_key
+                    )
+                else:
+                    key = 'strategy.{}.deal'.format(_event.strategy)
+                begin = perf_counter()
+                deal(_event)
+                get_stat(key, weight).add(perf_counter() - begin)
+
+            table[EventType.MARKET] = deal_market_event
+        return table
+
+    def attachFetcher(self, _fetcher: object):
+        """
+        time the fetch methods, replaced on the instance
+
+        :param _fetcher:
+        :return:
+        """
+        for name in ('fetchSymbol', 'fetchData', 'fetchTradingDayList'):
+            func = getattr(_fetcher, name, None)
+            if func is None:
+                continue
+            setattr(_fetcher, name, self.timed(
+                func, 'fetcher.' + name, _lock=True
+            ))
+            self.wrapped.append((_fetcher, name))
+
+    def detach(self):
+        """
+        restore the methods replaced by attachFetcher
+        """
+        for obj, name in self.wrapped:
+            try:
+                delattr(obj, name)
+            except AttributeError:
+                pass
+        self.wrapped = []
+
+    def clear(self):
+        self.stat_dict = {}
+
+    def toDict(self) -> typing.Dict[str, dict]:
+        return dict((k, v.toDict()) for k, v in self.stat_dict.items())
+
+    def toJson(self) -> str:
+        return json.dumps(self.toDict(), indent=2, sort_keys=True)
+
+    def getTable(self) -> str:
+        """
+        table sorted by total time, latencies in microseconds.
+        nested calls are counted in both, such as fetcher in updateData
+        """
+        stats = sorted(
+            self.toDict().items(), key=lambda x: x[1]['total'], reverse=True
+        )
+        table = []
+        for k, d in stats:
+            table.append([
+                k, d['calls'], d['sampled'], d['total'],
+                d['mean'] * 1e6, d['p50'] * 1e6, d['p90'] * 1e6,
+                d['p99'] * 1e6, d['max'] * 1e6,
+            ])
+        return tabulate.tabulate(table, headers=[
+            'component', 'calls', 'sampled', 'total(s)', 'mean(us)',
+            'p50(us)', 'p90(us)', 'p99(us)', 'max(us)'
+        ], floatfmt='.3f')
+
+    def report(self):
+        """
+        called by engine at the end of run
+        """
+        if self.json_path is None:
+            logging.info('Profile:\n{}'.format(self.getTable()))
+        else:
+            with open(self.json_path, 'w') as f:
+                f.write(self.toJson())
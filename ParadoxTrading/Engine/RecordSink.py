@@ -0,0 +1,203 @@
+import csv
+import logging
+import os
+import queue
+import threading
+import typing
+
+import pymongo
+from pymongo import MongoClient
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from ParadoxTrading.Utils import RecordStore
+
+
+def createRecordCollection(
+        _db: Database, _backtest_key: str, _clear: bool = True
+) -> Collection:
+    """
+    !!! This func will delete the old coll of _backtest_key if _clear !!!
+    get the coll to store records, indexed as FetchRecord queries
+
+    :param _db:
+    :param _backtest_key:
+    :param _clear:
+    :return:
+    """
+    # clear old backtest records
+    if _backtest_key in _db.collection_names() and _clear:
+        _db.drop_collection(_backtest_key)
+
+    coll = _db[_backtest_key]
+    coll.create_index([
+        ('type', pymongo.ASCENDING),
+        ('strategy', pymongo.ASCENDING),
+        ('tradingday', pymongo.ASCENDING),
+        ('datetime', pymongo.ASCENDING),
+    ])
+    return coll
+
+
+class RecordSinkAbstract:
+    """
+    receive chunks of records from PortfolioMgr during backtest and
+    write them by a background thread. At most max_chunks chunks wait
+    in the queue, put blocks when it is full, so the memory is bounded
+    even if writing is slower than backtest.
+    The writer thread shares the GIL with backtest, so the cost of
+    writing is spread over the run instead of stalling at the end,
+    the total time is about the same as dumping records at the end.
+
+    :param _max_chunks: size of the queue
+    """
+
+    def __init__(self, _max_chunks: int = 4):
+        assert _max_chunks > 0
+        self.queue: queue.Queue = queue.Queue(_max_chunks)
+        self.thread: threading.Thread = None
+        # the first error raised by writer thread
+        self.error: Exception = None
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            if self.error is not None:
+                continue  # keep draining, so put never blocks forever
+            try:
+                self.writeRecords(*item)
+            except Exception as e:
+                logging.error('record sink write failed: {}'.format(e))
+                self.error = e
+
+    def put(self, _kind: str, _records: RecordStore):
+        """
+        send one chunk to writer thread, block if the queue is full
+
+        :param _kind: signal, order, fill or settlement
+        :param _records: records detached from PortfolioMgr
+        :return:
+        """
+        if self.error is not None:
+            raise self.error
+        if self.thread is None:
+            self.thread = threading.Thread(
+                target=self._run, name='RecordSink', daemon=True
+            )
+            self.thread.start()
+        self.queue.put((_kind, _records))
+
+    def close(self):
+        """
+        wait until all chunks are written, then close the storage
+        """
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        self.closeStorage()
+        if self.error is not None:
+            raise self.error
+
+    def writeRecords(self, _kind: str, _records: RecordStore):
+        """
+        called by writer thread
+
+        :param _kind: signal, order, fill or settlement
+        :param _records:
+        :return:
+        """
+        raise NotImplementedError('writeRecords not implemented')
+
+    def closeStorage(self):
+        pass
+
+
+class CSVRecordSink(RecordSinkAbstract):
+    """
+    append records to {path}/{kind}.csv, int enums are written as strings
+
+    :param _path: dir of csv files, created if not exists
+    """
+
+    def __init__(self, _path: str, _max_chunks: int = 4):
+        super().__init__(_max_chunks)
+
+        self.path: str = _path
+        os.makedirs(_path, exist_ok=True)
+        # map kind to opened file and its csv writer
+        self.file_dict: typing.Dict[str, typing.TextIO] = {}
+        self.writer_dict: typing.Dict[str, typing.Any] = {}
+
+    def writeRecords(self, _kind: str, _records: RecordStore):
+        # writer thread shares GIL with backtest, so rows are written
+        # by csv module, it is about twice as fast as pandas to_csv
+        try:
+            writer = self.writer_dict[_kind]
+        except KeyError:
+            f = self.file_dict[_kind] = open(
+                os.path.join(self.path, '{}.csv'.format(_kind)),
+                'w', newline=''
+            )
+            writer = self.writer_dict[_kind] = csv.writer(
+                f, lineterminator='\n'
+            )
+            writer.writerow(_records.fields)
+        writer.writerows(_records.toRows())
+
+    def closeStorage(self):
+        for f in self.file_dict.values():
+            f.close()
+        self.file_dict = {}
+        self.writer_dict = {}
+
+
+class MongoRecordSink(RecordSinkAbstract):
+    """
+    !!! It will delete the old colls of _backtest_key if _clear !!!
+    insert records into mongodb chunk by chunk. Signal, order, fill
+    and settlement records are in coll _backtest_key, the same format
+    as PortfolioAbstract.storeRecords. Equity samples have no type,
+    so they are in coll _backtest_key + '_equity'
+
+    :param _backtest_key:
+    :param _mongo_host:
+    :param _mongo_database:
+    :param _clear:
+    """
+
+    def __init__(
+            self,
+            _backtest_key: str,
+            _mongo_host: str = 'localhost',
+            _mongo_database: str = 'Backtest',
+            _clear: bool = True,
+            _max_chunks: int = 4
+    ):
+        super().__init__(_max_chunks)
+
+        self.client: MongoClient = MongoClient(host=_mongo_host)
+        db = self.client[_mongo_database]
+        self.coll: Collection = createRecordCollection(
+            db, _backtest_key, _clear
+        )
+        equity_key = '{}_equity'.format(_backtest_key)
+        if equity_key in db.collection_names() and _clear:
+            db.drop_collection(equity_key)
+        self.equity_coll: Collection = db[equity_key]
+        self.equity_coll.create_index([
+            ('tradingday', pymongo.ASCENDING),
+            ('datetime', pymongo.ASCENDING),
+        ])
+
+    def writeRecords(self, _kind: str, _records: RecordStore):
+        if _kind == 'equity':
+            coll = self.equity_coll
+        else:
+            coll = self.coll
+        coll.insert_many(_records.toDicts(), ordered=False)
+
+    def closeStorage(self):
+        self.client.close()
@@ -5,6 +5,7 @@ from collections import Hashable
 import ParadoxTrading.Engine
 from ParadoxTrading.Engine.Event import MarketEvent, SettlementEvent, \
     SignalEvent, SignalType
+from ParadoxTrading.Engine.Trace import TRACER, Tracer
 from ParadoxTrading.Fetch import RegisterAbstract
 from ParadoxTrading.Utils import Serializable
 
@@ -98,12 +99,15 @@ class StrategyAbstract(Serializable):
             _signal_type=signal_type,
             _strength=_strength,
         ))
-        logging.info('Strategy({}) send {} {} {} when {}'.format(
-            self.name, _symbol,
-            SignalType.toStr(signal_type),
-            _strength,
-            self.engine.getDatetime()
-        ))
+        if TRACER.enabled and TRACER.sample(Tracer.SIGNAL):
+            TRACER.record(
+                Tracer.SIGNAL, logging.INFO,
+                'Strategy({}) send {} {} {} when {}',
+                self.name, _symbol,
+                SignalType.toStr(signal_type),
+                _strength,
+                self.engine.getDatetime()
+            )
 
     def __repr__(self) -> str:
         ret = 'Strategy:\n\t{}\nMarket Register:\n\t{}'
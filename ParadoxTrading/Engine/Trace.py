@@ -0,0 +1,142 @@
+import logging
+import sys
+import typing
+from collections import deque
+
+
+class Tracer:
+    """
+    trace of the per event messages in engine. It is disabled by default,
+    so hot paths only check self.enabled and never format anything.
+
+    When enabled, each category is sampled by its rate, sampled records
+    are kept unformatted in a ring buffer and also sent to logging if
+    the level is enabled. The buffer can be dumped when engine fails.
+
+    hot path usage:
+
+        if TRACER.enabled and TRACER.sample(Tracer.MARKET):
+            TRACER.record(Tracer.MARKET, logging.DEBUG, 'Data({})', data)
+    """
+
+    MARKET = 'market'
+    SETTLEMENT = 'settlement'
+    SIGNAL = 'signal'
+    ORDER = 'order'
+    FILL = 'fill'
+
+    def __init__(self, _capacity: int = 10000):
+        """
+
+        :param _capacity: max number of records in ring buffer
+        """
+        self.enabled: bool = False
+        self.dump_on_error: bool = True
+        self.logger: logging.Logger = logging.getLogger()
+
+        # (category, level, msg, args), formatted when needed
+        self.buffer: deque = deque(maxlen=_capacity)
+        # record one of every n messages of category
+        self.interval_dict: typing.Dict[str, int] = {}
+        self.count_dict: typing.Dict[str, int] = {}
+
+    def enable(
+            self, _capacity: int = None, _dump_on_error: bool = True
+    ):
+        """
+        start tracing
+
+        :param _capacity: resize ring buffer if not None
+        :param _dump_on_error: dump buffer when engine raises
+        :return:
+        """
+        if _capacity is not None:
+            self.buffer = deque(self.buffer, maxlen=_capacity)
+        self.dump_on_error = _dump_on_error
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self.buffer.clear()
+        self.count_dict.clear()
+
+    def setSampleRate(self, _category: str, _rate: float):
+        """
+        set the ratio of messages recorded for category,
+        1.0 records all, 0.01 records one of every 100
+
+        :param _category: MARKET, SIGNAL ...
+        :param _rate: in (0, 1]
+        :return:
+        """
+        if not 0.0 < _rate <= 1.0:
+            raise Exception('sample rate should be in (0, 1]')
+        self.interval_dict[_category] = max(int(round(1.0 / _rate)), 1)
+
+    def sample(self, _category: str) -> bool:
+        """
+        count a message of category, and return whether to record it
+
+        :param _category:
+        :return:
+        """
+        count = self.count_dict.get(_category, 0)
+        self.count_dict[_category] = count + 1
+        return count % self.interval_dict.get(_category, 1) == 0
+
+    def record(
+            self, _category: str, _level: int, _msg: str, *_args
+    ):
+        """
+        store message into ring buffer, and send it to logging
+        if level is enabled. _msg.format(*_args) is delayed
+
+        :param _category:
+        :param _level: logging level
+        :param _msg: format string
+        :param _args: args of format string
+        :return:
+        """
+        self.buffer.append((_category, _level, _msg, _args))
+        if self.logger.isEnabledFor(_level):
+            self.logger.log(_level, _msg.format(*_args))
+
+    def getRecords(self) -> typing.List[str]:
+        """
+        format records in ring buffer, oldest first
+
+        :return:
+        """
+        return [
+            '[{}] {}'.format(category, msg.format(*args))
+            for category, level, msg, args in self.buffer
+        ]
+
+    def dump(self, _file: typing.TextIO = None):
+        """
+        write records in ring buffer into file
+
+        :param _file: sys.stderr if None
+        :return:
+        """
+        if _file is None:
+            _file = sys.stderr
+        for line in self.getRecords():
+            _file.write(line + '\n')
+        _file.flush()
+
+    def dumpOnError(self):
+        """
+        called by engine when it raises
+        """
+        if self.enabled and self.dump_on_error and self.buffer:
+            self.logger.error('dump last {} trace records'.format(
+                len(self.buffer)
+            ))
+            self.dump()
+
+
+# trace used by engine parts
+TRACER = Tracer()
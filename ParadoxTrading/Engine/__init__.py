@@ -3,5 +3,9 @@ from .Event import ActionType, DirectionType, EventType, FillEvent, \
     MarketEvent, OrderEvent, OrderType, SignalEvent, SignalType, SettlementEvent
 from .Execution import ExecutionAbstract
 from .MarketSupply import MarketSupplyAbstract, ReturnMarket, ReturnSettlement
+from .OrderIndex import OrderIndex, SymbolOrders
 from .Portfolio import PortfolioAbstract
+from .Profiler import Profiler
+from .RecordSink import CSVRecordSink, MongoRecordSink, RecordSinkAbstract
 from .Strategy import StrategyAbstract
+from .Trace import TRACER, Tracer
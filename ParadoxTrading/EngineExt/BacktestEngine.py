@@ -2,8 +2,8 @@ import logging
 
 import typing
 from ParadoxTrading.Engine import EngineAbstract, EventType, \
-    ExecutionAbstract, MarketSupplyAbstract, PortfolioAbstract, ReturnMarket, \
-    ReturnSettlement, StrategyAbstract
+    ExecutionAbstract, MarketSupplyAbstract, OrderEvent, PortfolioAbstract, \
+    ReturnMarket, ReturnSettlement, StrategyAbstract, TRACER
 
 
 class BacktestEngine(EngineAbstract):
@@ -23,9 +23,23 @@ class BacktestEngine(EngineAbstract):
             _market_supply, _execution, _portfolio, _strategy
         )
 
+        # latest market update, used to match new orders
+        self.market_ret: ReturnMarket = None
+
+    def _deal_order_and_match(self, _event: OrderEvent):
+        """
+        new order may be filled by current market at once
+        """
+        self.execution.dealOrderEvent(_event)
+        self.execution.matchMarket(
+            self.market_ret.symbol, self.market_ret.data
+        )
+
     def run(self):
         """
-        backtest until there is no market tick
+        backtest until there is no market tick,
+        see enableProfiler to profile it. If portfolio streams records
+        to a sink, the sink is closed at the end
 
         :return:
         """
@@ -33,46 +47,78 @@ class BacktestEngine(EngineAbstract):
         assert self.portfolio is not None
         assert self.execution is not None
 
-        logging.info('Begin RUN!')
-        while True:
-            ret = self.market_supply.updateData()
-            if ret is None:
-                return
+        settlement_table = self._timed_table(self.createDispatchTable())
+        market_table = self.createDispatchTable()
+        market_table[EventType.ORDER] = self._deal_order_and_match
+        market_table = self._timed_table(market_table, True)
+
+        # per tick parts are timed once every profiler.interval ticks
+        update_data = self._timed(
+            self.market_supply.updateData, 'market_supply.updateData', True
+        )
+        match_market = self._timed(
+            self.execution.matchMarket, 'execution.matchMarket', True
+        )
+        deal_market = self._timed(
+            self.portfolio.dealMarket, 'portfolio.dealMarket', True
+        )
+        deal_settlement = self._timed(
+            self.portfolio.dealSettlement, 'portfolio.dealSettlement'
+        )
+        deal_event_queue = self.dealEventQueue
 
-            # loop until finished all the events
+        logging.info('Begin RUN!')
+        failed = True
+        try:
             while True:
+                ret = update_data()
+                if ret is None:
+                    failed = False
+                    return
+
                 if isinstance(ret, ReturnMarket):
                     # !!! the trigger must be ReturnMarket !!!
-                    # match market for each tick,
+                    # match market once for each tick,
                     # maybe there are orders to be filled.
                     # If filled, execution will add fill event into queue
-                    # in fact, this is the simulation of exchange
-                    self.execution.matchMarket(ret.symbol, ret.data)
-
-                if len(self.event_queue):  # deal all event at that moment
-                    event = self.event_queue.popleft()
-                    if event.type == EventType.MARKET:
-                        self.strategy_dict[event.strategy].deal(event)
-                    elif event.type == EventType.SIGNAL:
-                        self.portfolio.dealSignal(event)
-                    elif event.type == EventType.ORDER:
-                        self.execution.dealOrderEvent(event)
-                    elif event.type == EventType.FILL:
-                        self.portfolio.dealFill(event)
-                    elif event.type == EventType.SETTLEMENT:
-                        for s in self.strategy_dict.values():
-                            s.settlement(event)
-                    else:
-                        raise Exception('Unknown event type!')
+                    # in fact, this is the simulation of exchange,
+                    # and it matches again after each new order
+                    self.market_ret = ret
+                    match_market(ret.symbol, ret.data)
+                    # deal all event at that moment
+                    deal_event_queue(market_table)
+                    # deal something after all events if necessary
+                    deal_market(ret.symbol, ret.data)
+                elif isinstance(ret, ReturnSettlement):
+                    deal_event_queue(settlement_table)
+                    deal_settlement(ret.tradingday)
                 else:
-                    break
+                    raise Exception('unknown ret instance')
+        except Exception:
+            # show what happened just before the error
+            TRACER.dumpOnError()
+            raise
+        finally:
+            self._finish_run(failed)
 
-            # deal something after all events if necessary
-            if isinstance(ret, ReturnSettlement):
-                self.portfolio.dealSettlement(
-                    ret.tradingday
-                )
-            elif isinstance(ret, ReturnMarket):
-                self.portfolio.dealMarket(ret.symbol, ret.data)
-            else:
-                raise Exception('unknown ret instance')
+    def _finish_run(self, _failed: bool):
+        """
+        close market supply, write the rest records if streaming,
+        and report profiler. If run failed, the error of closing is
+        logged, so it does not replace the error of backtest
+
+        :param _failed: whether run is leaving by an error
+        :return:
+        """
+        try:
+            try:
+                self.market_supply.close()
+            finally:
+                self.portfolio.closeRecordSink()
+        except Exception:
+            if not _failed:
+                raise
+            logging.exception('close market supply or record sink failed')
+        finally:
+            if self.profiler is not None:
+                self.profiler.report()
@@ -1,12 +1,63 @@
+import heapq
 import logging
-import operator
 import typing
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+from diskcache import Cache
 
 from ParadoxTrading.Engine import (MarketSupplyAbstract, ReturnMarket,
                                    ReturnSettlement)
 from ParadoxTrading.Fetch import FetchAbstract, RegisterAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, DataStructView
+
+
+DayData = typing.Tuple[
+    typing.Dict[str, DataStruct], typing.Dict[str, typing.Set[str]]
+]
+
+
+def _load_day(
+        _tradingday: str,
+        _register_dict: typing.Dict[str, RegisterAbstract],
+        _fetcher: FetchAbstract
+) -> DayData:
+    """
+    fetch data of one tradingday according to market registers,
+    it changes nothing, so it can run in another thread
+
+    :param _tradingday: the day to fetch
+    :param _register_dict:
+    :param _fetcher:
+    :return: map symbol to data, and map symbol to market register keys
+    """
+    data_dict: typing.Dict[str, DataStruct] = {}
+    symbol_dict: typing.Dict[str, typing.Set[str]] = {}
+
+    for k, v in _register_dict.items():
+        symbol = _fetcher.fetchSymbol(
+            _tradingday, **v.toKwargs()
+        )
+        if symbol is None:
+            continue
+
+        if symbol not in data_dict.keys():
+            # fetch data
+            data = _fetcher.fetchData(_tradingday, _symbol=symbol)
+            if data is None:
+                logging.warning('data {} not available'.format(symbol))
+                continue
+            data_dict[symbol] = data
+
+        # map symbol to market register key
+        try:
+            symbol_dict[symbol].add(k)
+        except KeyError:
+            symbol_dict[symbol] = {k}
+
+    return data_dict, symbol_dict
 
 
 class DataGenerator:
@@ -19,45 +70,53 @@ class DataGenerator:
             _tradingday: str,
             _register_dict: typing.Dict[str, RegisterAbstract],
             _symbol_dict: typing.Dict[str, typing.Set[str]],
-            _fetcher: FetchAbstract
+            _fetcher: FetchAbstract,
+            _day_data: DayData = None
     ):
         """
         fetch data according to market registers,
-        and pop tick data by happentime
+        and pop tick data by happentime.
+
+        symbols are merged by a heap with one entry per symbol,
+        (happentime, order, symbol), order is the sequence the symbol
+        is fetched, so ties are always popped in the same order
 
         :param _tradingday: the day to fetch
         :param _register_dict:
         :param _symbol_dict:
+        :param _day_data: data already loaded by _load_day, if set,
+            nothing will be fetched
         """
-        self.data_dict: typing.Dict[str, DataStruct] = {}
-        self.index_dict: typing.Dict[str, int] = {}
+        if _day_data is None:
+            _day_data = _load_day(_tradingday, _register_dict, _fetcher)
+        data_dict, symbol_dict = _day_data
+
+        self.data_dict: typing.Dict[str, DataStruct] = data_dict
+        # set index to 0 init
+        self.index_dict: typing.Dict[str, int] = dict(
+            (k, 0) for k in data_dict.keys()
+        )
         self.datetime: typing.Union[str, datetime] = None
 
         # have to reset it, it is a ref to market supply's dict
         _symbol_dict.clear()
+        _symbol_dict.update(symbol_dict)
+        logging.debug('Available symbol: {}'.format(_symbol_dict.keys()))
 
-        for k, v in _register_dict.items():
-            symbol = _fetcher.fetchSymbol(
-                _tradingday, **v.toKwargs()
-            )
-            if symbol is None:
-                continue
+        self._init_cursor()
 
-            if symbol not in self.data_dict.keys():
-                # fetch data and set index to 0 init
-                data = _fetcher.fetchData(_tradingday, _symbol=symbol)
-                if data is None:
-                    logging.warning('data {} not available'.format(symbol))
-                    continue
-                self.data_dict[symbol] = data
-                self.index_dict[symbol] = 0
-
-            # map symbol to market register key
-            try:
-                _symbol_dict[symbol].add(k)
-            except KeyError:
-                _symbol_dict[symbol] = {k}
-        logging.debug('Available symbol: {}'.format(_symbol_dict.keys()))
+    def _init_cursor(self):
+        """
+        init the state used by gen() to pop data
+        """
+        # heap of (happentime, order, symbol), one for each symbol
+        self.heap: typing.List[typing.Tuple[
+            typing.Any, int, str
+        ]] = []
+        for order, (symbol, data) in enumerate(self.data_dict.items()):
+            if len(data):
+                self.heap.append((data.index()[0], order, symbol))
+        heapq.heapify(self.heap)
 
     def gen(self) -> typing.Union[None, typing.Tuple[str, DataStruct]]:
         """
@@ -66,48 +125,199 @@ class DataGenerator:
         :return: (symbol, one tick datastruct) or None
         """
 
-        # get latest one of each symbol
         assert self.data_dict and self.index_dict
-        tmp = []
-        for k, v in self.index_dict.items():
-            d = self.data_dict[k]
-            if v < len(d):
-                tmp.append((k, d.index()[v]))
+        if not self.heap:
+            # 1. data_dict and index_dict are empty
+            # 2. all symbols reach the end
+            return None
 
-        if tmp:
-            # get the latest market data of all
-            tmp.sort(key=operator.itemgetter(1))
+        # get the latest market data of all
+        happentime, order, symbol = self.heap[0]
+        data = self.data_dict[symbol]
+        index = self.index_dict[symbol]
+        ret: typing.Tuple[str, DataStruct] = (
+            symbol, DataStructView(data, index, index + 1))
+        index += 1  # point to next one
+        self.index_dict[symbol] = index
+
+        # move the cursor of this symbol
+        if index < len(data):
+            heapq.heapreplace(
+                self.heap, (data.index()[index], order, symbol)
+            )
+        else:
+            heapq.heappop(self.heap)
 
-            symbol = tmp[0][0]
+        # set cur datetime to latest tick's happentime
+        self.datetime = happentime
 
-            index = self.index_dict[symbol]
-            ret: typing.Tuple[str, DataStruct] = (
-                symbol, self.data_dict[symbol].iloc[index])
-            self.index_dict[symbol] += 1  # point to next one
+        return ret
 
-            # set cur datetime to latest tick's happentime
-            self.datetime = tmp[0][1]
 
-            return ret
+class DayTape:
+    """
+    all the data of one tradingday merged into one stream, each item is
+    (symbol id, row offset, timestamp), sorted by timestamp. It is built
+    by one stable argsort over all symbols, so ties are kept in
+    the order of symbols, the same as DataGenerator
+
+    :param _symbols: symbols in the fetched order
+    :param _data_dict: map symbol to its data
+    """
+
+    def __init__(
+            self, _symbols: typing.Sequence[str],
+            _data_dict: typing.Dict[str, DataStruct]
+    ):
+        self.symbols: typing.List[str] = list(_symbols)
+        self.lengths: typing.List[int] = [
+            len(_data_dict[s]) for s in self.symbols
+        ]
+
+        time_list = []
+        symbol_id_list = []
+        row_list = []
+        for i, (s, n) in enumerate(zip(self.symbols, self.lengths)):
+            time_list.append(_to_time_array(_data_dict[s].index()))
+            symbol_id_list.append(np.full(n, i, dtype=np.int32))
+            row_list.append(np.arange(n, dtype=np.int64))
+
+        if time_list:
+            timestamp = np.concatenate(time_list)
+            order = np.argsort(timestamp, kind='stable')
+            self.timestamp: np.ndarray = timestamp[order]
+            self.symbol_id: np.ndarray = np.concatenate(symbol_id_list)[order]
+            self.row: np.ndarray = np.concatenate(row_list)[order]
         else:
-            # 1. data_dict and index_dict are empty
-            # 2. all symbols reach the end
+            self.timestamp = np.empty(0)
+            self.symbol_id = np.empty(0, dtype=np.int32)
+            self.row = np.empty(0, dtype=np.int64)
+
+    def match(
+            self, _symbols: typing.Sequence[str],
+            _data_dict: typing.Dict[str, DataStruct]
+    ) -> bool:
+        """
+        check whether this tape is built from the same symbols and data
+
+        :param _symbols:
+        :param _data_dict:
+        :return:
+        """
+        return self.symbols == list(_symbols) and self.lengths == [
+            len(_data_dict[s]) for s in _symbols
+        ]
+
+    def __len__(self) -> int:
+        return len(self.row)
+
+
+def _to_time_array(_index: typing.Sequence[typing.Any]) -> np.ndarray:
+    """
+    turn index column into numpy array which can be sorted vectorized
+    """
+    ret = np.asarray(_index)
+    if ret.dtype == object:
+        try:
+            ret = ret.astype('datetime64[us]')
+        except (TypeError, ValueError):
+            pass
+    return ret
+
+
+class TapeDataGenerator(DataGenerator):
+    """
+    JUST FOR BACKTEST !!!
+
+    the same as DataGenerator, but walks a pre-merged DayTape instead
+    of merging symbols tick by tick
+
+    :param _tape_cache: if set, tapes are stored and loaded from it
+    """
+
+    def __init__(
+            self,
+            _tradingday: str,
+            _register_dict: typing.Dict[str, RegisterAbstract],
+            _symbol_dict: typing.Dict[str, typing.Set[str]],
+            _fetcher: FetchAbstract,
+            _day_data: DayData = None,
+            _tape_cache: Cache = None
+    ):
+        self.tradingday = _tradingday
+        self.tape_cache = _tape_cache
+        super().__init__(
+            _tradingday, _register_dict, _symbol_dict, _fetcher,
+            _day_data
+        )
+
+    def _init_cursor(self):
+        symbols = list(self.data_dict.keys())
+        key = 'tape_{}_{}'.format(self.tradingday, '_'.join(symbols))
+
+        tape: DayTape = None
+        if self.tape_cache is not None:
+            tape = self.tape_cache.get(key)
+        if tape is None or not tape.match(symbols, self.data_dict):
+            tape = DayTape(symbols, self.data_dict)
+            if self.tape_cache is not None:
+                self.tape_cache.set(key, tape)
+
+        self.tape: DayTape = tape
+        # python lists are faster to read one by one
+        self.tape_symbol_id: typing.List[int] = tape.symbol_id.tolist()
+        self.tape_row: typing.List[int] = tape.row.tolist()
+        self.tape_data: typing.List[DataStruct] = [
+            self.data_dict[s] for s in tape.symbols
+        ]
+        self.cursor: int = 0
+
+    def gen(self) -> typing.Union[None, typing.Tuple[str, DataStruct]]:
+        """
+        gen one tick data
+
+        :return: (symbol, one tick datastruct) or None
+        """
+        cursor = self.cursor
+        if cursor >= len(self.tape_row):
             return None
+        self.cursor = cursor + 1
+
+        symbol_id = self.tape_symbol_id[cursor]
+        index = self.tape_row[cursor]
+        symbol = self.tape.symbols[symbol_id]
+        data = self.tape_data[symbol_id]
+        self.index_dict[symbol] = index + 1
+
+        # set cur datetime to latest tick's happentime
+        self.datetime = data.index()[index]
+
+        return symbol, DataStructView(data, index, index + 1)
 
 
 class BacktestMarketSupply(MarketSupplyAbstract):
     def __init__(
             self: 'BacktestMarketSupply',
             _begin_day: str, _end_day: str,
-            _fetcher: FetchAbstract
+            _fetcher: FetchAbstract,
+            _use_tape: bool = False,
+            _tape_cache_path: str = None,
+            _prefetch_days: int = 0,
+            _broadcast: bool = False
     ):
         """
         market supply for backtest
 
         :param _begin_day: begin date of backtest, like '20170123'
         :param _end_day: end date of backtest, like '20170131'
+        :param _use_tape: merge each day into a DayTape before replay
+        :param _tape_cache_path: path to cache DayTape on disk,
+            only used when _use_tape is True
+        :param _prefetch_days: load the next days in background threads
+            while current day replays, 0 means load synchronously
+        :param _broadcast: see MarketSupplyAbstract
         """
-        super().__init__(_fetcher)
+        super().__init__(_fetcher, _broadcast)
 
         self.begin_day: str = _begin_day
         self.end_day: str = _end_day
@@ -119,14 +329,130 @@ class BacktestMarketSupply(MarketSupplyAbstract):
         self.datetime: typing.Union[str, datetime] = None
         self.data_generator: DataGenerator = None
 
+        # tradingdays in [begin_day, end_day), loaded from fetcher
+        # when replay starts
+        self.tradingday_list: typing.List[str] = None
+        self.tradingday_idx: int = 0
+
+        self.use_tape: bool = _use_tape
+        self.tape_cache: Cache = None
+        if _use_tape and _tape_cache_path is not None:
+            self.tape_cache = Cache(_tape_cache_path)
+
+        # at most prefetch_days days are loaded or loading in background
+        self.prefetch_days: int = _prefetch_days
+        self.prefetch_executor: ThreadPoolExecutor = None
+        self.prefetch_queue: typing.Deque[
+            typing.Tuple[str, Future]
+        ] = deque()
+        self.prefetch_idx: int = 0  # next day to prefetch
+
+    def _create_generator(self) -> DataGenerator:
+        day_data = self._fetch_prefetched()
+        if self.use_tape:
+            return TapeDataGenerator(
+                _tradingday=self.tradingday,
+                _register_dict=self.register_dict,
+                _symbol_dict=self.symbol_dict,
+                _fetcher=self.fetcher,
+                _day_data=day_data,
+                _tape_cache=self.tape_cache
+            )
+        return DataGenerator(
+            _tradingday=self.tradingday,
+            _register_dict=self.register_dict,
+            _symbol_dict=self.symbol_dict,
+            _fetcher=self.fetcher,
+            _day_data=day_data
+        )
+
+    def _fill_prefetch(self):
+        """
+        submit days to load until queue is full or end_day is reached
+        """
+        while len(self.prefetch_queue) < self.prefetch_days and \
+                self.prefetch_idx < len(self.tradingday_list):
+            day = self.tradingday_list[self.prefetch_idx]
+            future = self.prefetch_executor.submit(
+                _load_day, day, self.register_dict, self.fetcher
+            )
+            self.prefetch_queue.append((day, future))
+            self.prefetch_idx += 1
+
+    def _fetch_prefetched(self) -> typing.Union[None, DayData]:
+        """
+        get the data of current tradingday loaded in background,
+        return None if prefetch is disabled
+        """
+        if self.prefetch_days <= 0:
+            return None
+
+        if self.prefetch_executor is None:
+            self.prefetch_executor = ThreadPoolExecutor(self.prefetch_days)
+        # days before current day are not needed anymore
+        while self.prefetch_queue and \
+                self.prefetch_queue[0][0] < self.tradingday:
+            self.prefetch_queue.popleft()[1].cancel()
+        if self.prefetch_idx < self.tradingday_idx:
+            self.prefetch_idx = self.tradingday_idx
+        self._fill_prefetch()
+
+        day, future = self.prefetch_queue.popleft()
+        assert day == self.tradingday
+        self._fill_prefetch()
+        return future.result()
+
+    def _stop_prefetch(self):
+        """
+        cancel the days not started, and wait the running ones
+        """
+        for _, future in self.prefetch_queue:
+            future.cancel()
+        self.prefetch_queue.clear()
+        if self.prefetch_executor is not None:
+            self.prefetch_executor.shutdown()
+            self.prefetch_executor = None
+
+    def close(self):
+        """
+        stop prefetch, so no thread is left if run stops early
+        """
+        self._stop_prefetch()
+
+    def _load_tradingday_list(self):
+        """
+        load the trading calendar and the contract calendar of
+        registers once, and point to the first tradingday
+        """
+        if self.tradingday_list is None:
+            self.tradingday_list = self.fetcher.fetchTradingDayList(
+                self.begin_day, self.end_day
+            )
+            self.fetcher.loadContractCalendar(
+                self.tradingday_list, self.register_dict.values()
+            )
+            self.tradingday_idx = 0
+            self._set_tradingday()
+
+    def _set_tradingday(self):
+        """
+        set cur date by tradingday_idx, end_day if all days are passed
+        """
+        if self.tradingday_idx < len(self.tradingday_list):
+            self.tradingday = self.tradingday_list[self.tradingday_idx]
+        else:
+            self.tradingday = self.end_day
+        self.tradingday_obj = datetime.strptime(self.tradingday, '%Y%m%d')
+
     def incDate(self) -> str:
         """
-        inc cur date and return
+        move to next tradingday and return
 
         :return: cur date
         """
-        self.tradingday_obj += timedelta(days=1)
-        self.tradingday = self.tradingday_obj.strftime('%Y%m%d')
+        self._load_tradingday_list()
+        self.tradingday_idx += 1
+        self._set_tradingday()
         return self.tradingday
 
     def updateData(self) -> typing.Union[
@@ -138,16 +464,13 @@ class BacktestMarketSupply(MarketSupplyAbstract):
         :return: flag of current market status
         """
 
+        self._load_tradingday_list()
         while self.data_generator is None:
             if self.tradingday >= self.end_day:
+                self._stop_prefetch()
                 return None
 
-            self.data_generator = DataGenerator(
-                _tradingday=self.tradingday,
-                _register_dict=self.register_dict,
-                _symbol_dict=self.symbol_dict,
-                _fetcher=self.fetcher
-            )
+            self.data_generator = self._create_generator()
             if not self.symbol_dict:
                 self.incDate()
                 self.data_generator: DataGenerator = None
@@ -1,9 +1,14 @@
 from ParadoxTrading.Engine import ExecutionAbstract, OrderEvent, OrderType, \
     DirectionType, FillEvent
+from ParadoxTrading.Fetch.Crypto.DepthArray import depthVWAP, getDepthArray
 from ParadoxTrading.Utils import DataStruct
 
 
 class DepthBacktestExecution(ExecutionAbstract):
+    """
+    fill market orders by the vwap of walking the depth, data can be
+    in the flat or array layout of DepthArray
+    """
 
     def __init__(
             self, _commission_rate: float = 0.0
@@ -16,26 +21,7 @@ class DepthBacktestExecution(ExecutionAbstract):
             self, _order_event: OrderEvent
     ):
         assert _order_event.order_type == OrderType.MARKET
-        assert _order_event.index not in self.order_dict.keys()
-        self.order_dict[_order_event.index] = _order_event
-
-    def _get_mean_price(self, _data_dict, _amount, _direction):
-        turnover = 0.0
-        tmp_amount = _amount
-        for i in range(10):
-            price = _data_dict['{}price{}'.format(_direction, i)]
-            amount = _data_dict['{}amount{}'.format(_direction, i)]
-            if price is None or amount is None:
-                break
-            if tmp_amount > amount:  # not enough
-                turnover += amount * price
-                tmp_amount -= amount
-            else:  # end
-                turnover += tmp_amount * price
-                return turnover / _amount
-
-        turnover += tmp_amount * price
-        return turnover / _amount
+        self.addOrder(_order_event)
 
     def _gen_event(
             self, _price: float,
@@ -58,23 +44,18 @@ class DepthBacktestExecution(ExecutionAbstract):
             return
 
         assert len(_data) == 1
-        data_dict = _data.toDict()
+        orders = self.order_index.popAll(_symbol)
+        if not orders:
+            return
 
-        for index in sorted(self.order_dict.keys()):
-            order = self.order_dict[index]
-            if order.symbol != _symbol:
-                continue
+        for order in orders:
+            del self.order_dict[order.index]
             if order.direction == DirectionType.BUY:
-                avg_price = self._get_mean_price(
-                    data_dict, order.quantity, 'ask'
-                )
-                self.addEvent(self._gen_event(avg_price, order))
-                del self.order_dict[index]
+                depth = getDepthArray(_data, 'ask')
             elif order.direction == DirectionType.SELL:
-                avg_price = self._get_mean_price(
-                    data_dict, order.quantity, 'bid'
-                )
-                self.addEvent(self._gen_event(avg_price, order))
-                del self.order_dict[index]
+                depth = getDepthArray(_data, 'bid')
             else:
                 raise Exception('unknown direction type')
+            self.addEvent(self._gen_event(
+                depthVWAP(depth, order.quantity), order
+            ))
@@ -3,10 +3,12 @@ import typing
 from datetime import datetime
 from time import time
 
+import numpy as np
 from TdServer.utilPool.dataFetcher import DataSub
 from TdServer.utilPool.dataProcessor import clip_depth
 
 from ParadoxTrading.Engine import MarketSupplyAbstract, ReturnMarket, ReturnSettlement
+from ParadoxTrading.Fetch.Crypto.DepthArray import DEPTH_ARRAY_COLUMNS
 from ParadoxTrading.Fetch.Crypto.FetchBase import FetchBase
 from ParadoxTrading.Utils import DataStruct
 
@@ -15,7 +17,12 @@ TIMEOUT = 1000
 
 
 class DepthMarketSupply(MarketSupplyAbstract):
-    def __init__(self):
+    def __init__(self, _depth_array: bool = False):
+        """
+
+        :param _depth_array: if True, market data has the array layout
+            of DepthArray, columns ask, bid and datetime
+        """
         super().__init__(FetchBase())
 
         self.data_sub = DataSub()
@@ -30,6 +37,9 @@ class DepthMarketSupply(MarketSupplyAbstract):
             self.column_list.append('bidprice{}'.format(i))
             self.column_list.append('bidamount{}'.format(i))
         self.column_list.append('datetime')
+        self.depth_array: bool = _depth_array
+        if _depth_array:
+            self.column_list = list(DEPTH_ARRAY_COLUMNS)
         self.last_data_dict = {}  # map symbol to data tuple
 
     def getTradingDay(self) -> str:
@@ -85,17 +95,24 @@ class DepthMarketSupply(MarketSupplyAbstract):
             try:
                 last_data = self.last_data_dict[symbol]
                 if last_data != tuple_data:
-                    return self.addMarketEvent(symbol, DataStruct(
-                        self.column_list, 'datetime',
-                        [tuple_data + (self.cur_datetime,)]
-                    ))
+                    return self.addMarketEvent(
+                        symbol, self._to_struct(tuple_data)
+                    )
                 else:
                     continue
             except KeyError:
-                datastruct = DataStruct(
-                    self.column_list, 'datetime',
-                    [tuple_data + (self.cur_datetime,)]
+                return self.addMarketEvent(
+                    symbol, self._to_struct(tuple_data)
                 )
-                return self.addMarketEvent(symbol, datastruct)
             finally:
                 self.last_data_dict[symbol] = tuple_data
+
+    def _to_struct(self, _tuple_data: tuple) -> DataStruct:
+        if self.depth_array:
+            depth = np.array(
+                _tuple_data, dtype='float64'
+            ).reshape(2, LEVEL, 2)
+            row = (depth[0], depth[1], self.cur_datetime)
+        else:
+            row = _tuple_data + (self.cur_datetime,)
+        return DataStruct(self.column_list, 'datetime', [row])
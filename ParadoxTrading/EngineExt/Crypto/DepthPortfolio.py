@@ -19,6 +19,8 @@ class DepthPortfolio(PortfolioAbstract):
 
         self.index_strategy_table: typing.Dict[int, str] = {}
         self.symbol_price_dict = {}
+        # whether market data is in the array layout of DepthArray
+        self.depth_array: bool = None
 
     def _gen_order(
             self, _symbol,
@@ -114,8 +116,22 @@ class DepthPortfolio(PortfolioAbstract):
             self.portfolio_mgr.getSettlementData().toPandas().to_csv(
                 '{}/{}_settlement.csv'.format(self.store_path, _tradingday, )
             )
+            if self.portfolio_mgr.equity_interval is not None:
+                self.portfolio_mgr.getEquityData().toPandas().to_csv(
+                    '{}/{}_equity.csv'.format(self.store_path, _tradingday)
+                )
             self.portfolio_mgr.resetRecords()
 
     def dealMarket(self, _symbol: str, _data: DataStruct):
-        tmp = _data.toDict()
-        self.symbol_price_dict[_symbol] = (tmp['askprice0'] + tmp['bidprice0']) / 2
+        if self.depth_array is None:  # check layout of the first data
+            self.depth_array = 'ask' in _data.getColumnNames()
+        if self.depth_array:
+            askprice = _data['ask'][0][0, 0]
+            bidprice = _data['bid'][0][0, 0]
+        else:
+            askprice = _data['askprice0'][0]
+            bidprice = _data['bidprice0'][0]
+        price = (askprice + bidprice) / 2
+        self.symbol_price_dict[_symbol] = price
+        self.portfolio_mgr.updatePrice(_symbol, price)
+        self.sampleEquity()
@@ -30,7 +30,7 @@ class OnlineMinBarStrategy(StrategyAbstract):
                 spliter = self.split_dict[key] = SplitIntoMinute(period)
 
             flag = False
-            for d in data:
+            for d in data.iterRows(True):
                 flag = flag or spliter.addOne(d)
             if flag:  # gen new bar
                 if len(spliter.getBarList()) > 1:  # has finished bar
@@ -16,8 +16,7 @@ class TickerBacktestExecution(ExecutionAbstract):
             self, _order_event: OrderEvent
     ):
         assert _order_event.order_type == OrderType.MARKET
-        assert _order_event.index not in self.order_dict.keys()
-        self.order_dict[_order_event.index] = _order_event
+        self.addOrder(_order_event)
 
     def _gen_event(
             self, _price: float, _order_event: OrderEvent
@@ -38,10 +37,7 @@ class TickerBacktestExecution(ExecutionAbstract):
         if not self.order_dict:  # skip if no order
             return
 
-        for index in sorted(self.order_dict.keys()):
-            order = self.order_dict[index]
-            if order.symbol != _symbol:
-                continue
+        for order in self.order_index.popAll(_symbol):
             last_price = _data['price'][-1]
             self.addEvent(self._gen_event(last_price, order))
-            del self.order_dict[index]
+            del self.order_dict[order.index]
@@ -114,7 +114,14 @@ class TickerPortfolio(PortfolioAbstract):
             self.portfolio_mgr.getSettlementData().toPandas().to_csv(
                 '{}/{}_settlement.csv'.format(self.store_path, _tradingday, )
             )
+            if self.portfolio_mgr.equity_interval is not None:
+                self.portfolio_mgr.getEquityData().toPandas().to_csv(
+                    '{}/{}_equity.csv'.format(self.store_path, _tradingday)
+                )
             self.portfolio_mgr.resetRecords()
 
     def dealMarket(self, _symbol: str, _data: DataStruct):
-        self.symbol_price_dict[_symbol] = _data['price'][-1]
+        price = _data['price'][-1]
+        self.symbol_price_dict[_symbol] = price
+        self.portfolio_mgr.updatePrice(_symbol, price)
+        self.sampleEquity()
@@ -57,8 +57,9 @@ class ArbitrageEqualFundSimplePortfolio(InterDayPortfolio):
         openinterest_dict = {}
         price_dict = {}
         volume_dict = {}
+        self.price_service.prefetch(_tradingday, instrument_list)
         for instrument in instrument_list:
-            tmp = self.fetcher.fetchData(_tradingday, instrument)
+            tmp = self.price_service.getData(_tradingday, instrument)
             openinterest_dict[instrument] = tmp['openinterest'][0]
             price_dict[instrument] = tmp[self.settlement_price_index][0]
             volume_dict[instrument] = tmp['volume'][0]
@@ -24,17 +24,18 @@ class BarBacktestExecution(ExecutionAbstract):
     def dealOrderEvent(
             self, _order_event: OrderEvent
     ):
-        assert _order_event.index not in self.order_dict.keys()
-        self.order_dict[_order_event.index] = _order_event
+        self.addOrder(_order_event)
 
     def matchMarket(self, _symbol: str, _data: DataStruct):
+        if not self.order_dict:  # skip if no order
+            return
+
         assert len(_data) == 1
 
         time = _data.index()[0]
 
-        for index in sorted(self.order_dict.keys()):
-            order = self.order_dict[index]
-            if order.symbol == _symbol and time > order.datetime:
+        for order in self.order_index.getOrders(_symbol):
+            if time > order.datetime:
                 exec_price: float = _data[self.price_idx][0]
                 comm = self.commission_rate * order.quantity * exec_price
                 self.addEvent(FillEvent(
@@ -48,4 +49,4 @@ class BarBacktestExecution(ExecutionAbstract):
                     _price=exec_price,
                     _commission=comm
                 ))
-                del self.order_dict[index]
+                self.removeOrder(order)
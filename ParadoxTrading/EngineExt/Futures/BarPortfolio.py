@@ -6,6 +6,8 @@ import typing
 from ParadoxTrading.Engine import FillEvent, SignalEvent, SignalType, \
     OrderEvent, OrderType, ActionType, DirectionType
 from ParadoxTrading.Engine import PortfolioAbstract
+from ParadoxTrading.EngineExt.Futures.DailyPriceService import \
+    DailyPriceService
 from ParadoxTrading.EngineExt.Futures.PointValue import POINT_VALUE
 from ParadoxTrading.Fetch import FetchAbstract
 from ParadoxTrading.Utils import DataStruct
@@ -26,16 +28,26 @@ class BarPortfolio(PortfolioAbstract):
             _init_fund: float = 0.0,
             _margin_rate: float = 1.0,
             _settlement_price_index: str = 'closeprice',
+            _market_price_index: str = 'closeprice',
     ):
         super().__init__(_init_fund, _margin_rate)
 
         self.index_strategy_table: typing.Dict[int, str] = {}
 
         self.fetcher = _fetcher
+        self.price_service = DailyPriceService(_fetcher)
         self.settlement_price_index = _settlement_price_index
+        # price of market data to mark positions
+        self.market_price_index = _market_price_index
 
         self.addPickleKey('index_strategy_table')
 
+    def setPriceService(self, _price_service: DailyPriceService):
+        """
+        share price service with other components, see DailyPriceService
+        """
+        self.price_service = _price_service
+
     def _gen_order(
             self, _symbol: str,
             _action: int, _direction: int, _quantity: int
@@ -132,11 +144,13 @@ class BarPortfolio(PortfolioAbstract):
 
         # do settlement for cur positions
         symbol_price_dict = {}
-        for symbol in self.portfolio_mgr.getSymbolList():
+        symbols = self.portfolio_mgr.getSymbolList()
+        self.price_service.prefetch(_tradingday, symbols)
+        for symbol in symbols:
             try:
-                symbol_price_dict[symbol] = self.fetcher.fetchData(
-                    _tradingday, symbol
-                )[self.settlement_price_index][0]
+                symbol_price_dict[symbol] = self.price_service.getPrice(
+                    _tradingday, symbol, self.settlement_price_index
+                )
             except TypeError as e:
                 logging.error('Tradingday: {}, Symbol: {}, e: {}'.format(
                     _tradingday, symbol, e
@@ -147,4 +161,7 @@ class BarPortfolio(PortfolioAbstract):
         )
 
     def dealMarket(self, _symbol: str, _data: DataStruct):
-        pass
+        self.portfolio_mgr.updatePrice(
+            _symbol, _data[self.market_price_index][-1]
+        )
+        self.sampleEquity()
@@ -0,0 +1,91 @@
+import typing
+
+from ParadoxTrading.Fetch import FetchAbstract
+from ParadoxTrading.Utils import DataStruct
+
+
+class DailyPriceService:
+    """
+    serve open, close and settlement prices of day bars to executions
+    and portfolios. Symbols of one tradingday are fetched together by
+    fetcher.fetchDataMany and memoized, only the latest max_days
+    tradingdays are kept.
+
+    Share one service between execution and portfolio by their
+    setPriceService, then orders sent at settlement are filled from
+    the bars prefetched by portfolio.
+    """
+
+    def __init__(self, _fetcher: FetchAbstract, _max_days: int = 2):
+        """
+
+        :param _fetcher: fetcher of day data
+        :param _max_days: number of tradingdays memoized
+        """
+        assert _max_days >= 1
+        self.fetcher: FetchAbstract = _fetcher
+        self.max_days: int = _max_days
+        # tradingday -> symbol -> day data, in the order of tradingday added
+        self.day_dict: typing.Dict[
+            str, typing.Dict[str, typing.Union[None, DataStruct]]
+        ] = {}
+
+    def _get_day(
+            self, _tradingday: str
+    ) -> typing.Dict[str, typing.Union[None, DataStruct]]:
+        try:
+            return self.day_dict[_tradingday]
+        except KeyError:
+            while len(self.day_dict) >= self.max_days:
+                del self.day_dict[next(iter(self.day_dict))]
+            data_dict = self.day_dict[_tradingday] = {}
+            return data_dict
+
+    def prefetch(
+            self, _tradingday: str, _symbols: typing.Iterable[str]
+    ):
+        """
+        fetch the symbols not memoized in one batch
+
+        :param _tradingday:
+        :param _symbols:
+        :return:
+        """
+        data_dict = self._get_day(_tradingday)
+        missing = [s for s in _symbols if s not in data_dict]
+        if missing:
+            data_dict.update(
+                self.fetcher.fetchDataMany(_tradingday, missing)
+            )
+
+    def getData(
+            self, _tradingday: str, _symbol: str
+    ) -> typing.Union[None, DataStruct]:
+        """
+        :return: day data of symbol, None if not available
+        """
+        data_dict = self._get_day(_tradingday)
+        try:
+            return data_dict[_symbol]
+        except KeyError:
+            data = data_dict[_symbol] = self.fetcher.fetchData(
+                _tradingday, _symbol
+            )
+            return data
+
+    def getPrice(
+            self, _tradingday: str, _symbol: str, _price_index: str
+    ) -> float:
+        """
+        raise TypeError if data is not available, the same as reading
+        the result of fetcher.fetchData directly
+
+        :param _tradingday:
+        :param _symbol:
+        :param _price_index: openprice, closeprice, settlementprice ...
+        :return:
+        """
+        return self.getData(_tradingday, _symbol)[_price_index][0]
+
+    def clear(self):
+        self.day_dict = {}
@@ -3,6 +3,8 @@ import sys
 
 from ParadoxTrading.Engine import ExecutionAbstract, FillEvent, OrderEvent, \
     OrderType
+from ParadoxTrading.EngineExt.Futures.DailyPriceService import \
+    DailyPriceService
 from ParadoxTrading.Fetch.ChineseFutures.FetchBase import FetchBase
 from ParadoxTrading.Utils import DataStruct
 
@@ -27,6 +29,13 @@ class InterDayBacktestExecution(ExecutionAbstract):
         self.fetcher: FetchBase = _fetcher
         self.commission_rate = _commission_rate
         self.price_idx = _price_idx
+        self.price_service = DailyPriceService(_fetcher)
+
+    def setPriceService(self, _price_service: DailyPriceService):
+        """
+        share price service with portfolio, see DailyPriceService
+        """
+        self.price_service = _price_service
 
     def dealOrderEvent(
             self, _order_event: OrderEvent
@@ -36,9 +45,9 @@ class InterDayBacktestExecution(ExecutionAbstract):
         tradingday = self.engine.getTradingDay()
         symbol = _order_event.symbol
         try:
-            price = self.fetcher.fetchData(
-                self.engine.getTradingDay(), _order_event.symbol,
-            )[self.price_idx][0]
+            price = self.price_service.getPrice(
+                tradingday, symbol, self.price_idx
+            )
         except TypeError as e:
             # if not available, use last tradingday's closeprice
             logging.warning('Tradingday: {}, Symbol: {}, e: {}'.format(
@@ -46,11 +55,10 @@ class InterDayBacktestExecution(ExecutionAbstract):
             ))
             if input('Continue?(y/n): ') != 'y':
                 sys.exit(1)
-            price = self.fetcher.fetchData(
-                self.fetcher.instrumentLastTradingDay(
-                    _order_event.symbol, self.engine.getTradingDay()
-                ), _order_event.symbol
-            )[self.price_idx][0]
+            price = self.price_service.getPrice(
+                self.fetcher.instrumentLastTradingDay(symbol, tradingday),
+                symbol, self.price_idx
+            )
 
         fill_event = FillEvent(
             _index=_order_event.index,
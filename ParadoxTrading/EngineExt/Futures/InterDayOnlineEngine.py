@@ -59,61 +59,46 @@ class InterDayOnlineEngine(EngineAbstract):
             s.save('{}/{}'.format(self.dump_path, s.name))
 
     def update_position(self):
-        self.execution.loadCSV()
-        while True:
-            if len(self.event_queue):
-                event = self.event_queue.popleft()
-                if event.type == EventType.FILL:
-                    self.portfolio.dealFill(event)
-                else:
-                    raise Exception('Except FILL event')
-            else:
-                break
+        self._timed(self.execution.loadCSV, 'execution.loadCSV')()
+        self.dealEventQueue(self._timed_table(
+            self.createDispatchTable([EventType.FILL])
+        ))
 
     def update_market_info(self) -> typing.Union[None, str]:
+        table = self._timed_table(self.createDispatchTable([
+            EventType.MARKET, EventType.SIGNAL, EventType.SETTLEMENT
+        ]), True)
+        update_data = self._timed(
+            self.market_supply.updateData, 'market_supply.updateData', True
+        )
+        deal_market = self._timed(
+            self.portfolio.dealMarket, 'portfolio.dealMarket', True
+        )
         while True:
-            ret = self.market_supply.updateData()
+            ret = update_data()
             if ret is None:
                 return None
 
             # strategy receive from market
             # portfolio receive from strategy
-            while True:
-                if len(self.event_queue):  # deal all event at that moment
-                    event = self.event_queue.popleft()
-                    if event.type == EventType.MARKET:
-                        self.strategy_dict[event.strategy].deal(event)
-                    elif event.type == EventType.SIGNAL:
-                        self.portfolio.dealSignal(event)
-                    elif event.type == EventType.SETTLEMENT:
-                        for s in self.strategy_dict.values():
-                            s.settlement(event)
-                    else:
-                        logging.error(event)
-                        raise Exception('unavailable event type!')
-                else:
-                    break
+            self.dealEventQueue(table)
 
             # update portfolio status if necessary
             if isinstance(ret, ReturnMarket):
-                self.portfolio.dealMarket(ret.symbol, ret.data)
+                deal_market(ret.symbol, ret.data)
             elif isinstance(ret, ReturnSettlement):
                 return ret.tradingday
             else:
                 raise Exception('unknown return by market supply')
 
     def update_orders(self, _tradingday):
-        self.portfolio.dealSettlement(_tradingday)
-        while True:
-            if len(self.event_queue):
-                event = self.event_queue.popleft()
-                if event.type == EventType.ORDER:
-                    self.execution.dealOrderEvent(event)
-                else:
-                    raise Exception('Except ORDER event')
-            else:
-                break
-        self.execution.saveCSV()
+        self._timed(
+            self.portfolio.dealSettlement, 'portfolio.dealSettlement'
+        )(_tradingday)
+        self.dealEventQueue(self._timed_table(
+            self.createDispatchTable([EventType.ORDER])
+        ))
+        self._timed(self.execution.saveCSV, 'execution.saveCSV')()
 
     def run(self):
         """
@@ -135,3 +120,6 @@ class InterDayOnlineEngine(EngineAbstract):
         else:
             logging.warning('market info is None')
         assert len(self.event_queue) == 0
+
+        if self.profiler is not None:
+            self.profiler.report()
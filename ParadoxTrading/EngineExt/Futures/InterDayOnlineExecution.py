@@ -27,7 +27,7 @@ class InterDayOnlineExecution(ExecutionAbstract):
         pass
 
     def dealOrderEvent(self, _order_event: OrderEvent):
-        self.order_dict[_order_event.index] = _order_event
+        self.addOrder(_order_event)
         self.order_buf.append(_order_event)
 
     @staticmethod
@@ -53,7 +53,8 @@ class InterDayOnlineExecution(ExecutionAbstract):
 
                 try:
                     assert index in self.order_dict.keys()
-                    order = self.order_dict.pop(index)
+                    order = self.order_dict[index]
+                    self.removeOrder(order)
                     assert action == order.action
                     assert direction == order.direction
                 except AssertionError as e:
@@ -6,8 +6,11 @@ import tabulate
 
 from ParadoxTrading.Engine import ActionType, DirectionType, FillEvent, \
     OrderEvent, OrderType, PortfolioAbstract, SignalEvent
+from ParadoxTrading.EngineExt.Futures.DailyPriceService import \
+    DailyPriceService
 from ParadoxTrading.EngineExt.Futures.PointValue import POINT_VALUE
-from ParadoxTrading.Fetch.ChineseFutures.FetchBase import FetchBase
+from ParadoxTrading.Fetch.ChineseFutures.FetchBase import FetchBase, \
+    RegisterInstrument
 from ParadoxTrading.Utils import DataStruct
 
 
@@ -377,6 +380,7 @@ class InterDayPortfolio(PortfolioAbstract):
         super().__init__(_init_fund, _margin_rate)
 
         self.fetcher = _fetcher
+        self.price_service = DailyPriceService(_fetcher)
         self.simulate_product_index = _simulate_product_index
         self.settlement_price_index = _settlement_price_index
 
@@ -386,6 +390,14 @@ class InterDayPortfolio(PortfolioAbstract):
 
         # map symbol to latest price, need to be reset after settlement
         self.symbol_price_dict: typing.Dict[str, float] = {}
+        # dominant instruments are resolved at the first settlement
+        self.contract_calendar_loaded: bool = False
+
+    def setPriceService(self, _price_service: DailyPriceService):
+        """
+        share price service with execution, see DailyPriceService
+        """
+        self.price_service = _price_service
 
     def dealSignal(self, _event: SignalEvent):
         self.strategy_mgr.dealSignal(_event)
@@ -400,13 +412,15 @@ class InterDayPortfolio(PortfolioAbstract):
     ):
         # get price dict for each portfolio
         keys = self.symbol_price_dict.keys()
-        for symbol in self.portfolio_mgr.getSymbolList():
-            if symbol in keys:
-                continue
+        symbols = [
+            s for s in self.portfolio_mgr.getSymbolList() if s not in keys
+        ]
+        self.price_service.prefetch(_tradingday, symbols)
+        for symbol in symbols:
             try:
-                self.symbol_price_dict[symbol] = self.fetcher.fetchData(
-                    _tradingday, symbol
-                )[self.settlement_price_index][0]
+                self.symbol_price_dict[symbol] = self.price_service.getPrice(
+                    _tradingday, symbol, self.settlement_price_index
+                )
             except TypeError as e:
                 # if not available, use the last tradingday's price
                 logging.warning('Tradingday: {}, Symbol: {}, e: {}'.format(
@@ -414,10 +428,11 @@ class InterDayPortfolio(PortfolioAbstract):
                 ))
                 if input('Continue?(y/n): ') != 'y':
                     sys.exit(1)
-                self.symbol_price_dict[symbol] = self.fetcher.fetchData(
+                self.symbol_price_dict[symbol] = self.price_service.getPrice(
                     self.fetcher.instrumentLastTradingDay(
-                        symbol, _tradingday), symbol
-                )[self.settlement_price_index][0]
+                        symbol, _tradingday),
+                    symbol, self.settlement_price_index
+                )
 
     def _iter_update_next_status(self, _tradingday):
         """
@@ -441,9 +456,11 @@ class InterDayPortfolio(PortfolioAbstract):
                     POINT_VALUE[i_mgr.product] * quantity
 
     def _iter_send_order(self):
+        symbols = []
         for p_mgr in self.strategy_mgr:
             for i_mgr in p_mgr:
                 for order_dict in i_mgr.getOrderDicts():
+                    symbols.append(order_dict['Instrument'])
                     o = OrderEvent(
                         _index=self.incOrderIndex(),
                         _symbol=order_dict['Instrument'],
@@ -460,6 +477,35 @@ class InterDayPortfolio(PortfolioAbstract):
                     )
                     self.portfolio_mgr.dealOrder(p_mgr.strategy, o)
 
+        # market supply has moved to the next tradingday at settlement,
+        # orders are filled on it, so prefetch the bars of that day
+        # if the price service is shared with execution
+        if symbols and self.price_service is getattr(
+                self.engine.execution, 'price_service', None
+        ):
+            self.price_service.prefetch(self.engine.getTradingDay(), symbols)
+
+    def _load_contract_calendar(self):
+        """
+        resolve dominant instruments of registered products in the
+        backtest range once, so fetchSymbol is an array lookup
+        """
+        self.contract_calendar_loaded = True
+        if self.fetcher.contract_calendar is not None:
+            return  # loaded by market supply with the same fetcher
+        market_supply = self.engine.market_supply
+        tradingdays = getattr(market_supply, 'tradingday_list', None)
+        if tradingdays is None:  # not backtest
+            return
+        products = set()
+        for register in market_supply.register_dict.values():
+            product = register.toKwargs().get('_product')
+            if product is not None:
+                products.add(product)
+        self.fetcher.loadContractCalendar(
+            tradingdays, [RegisterInstrument(p) for p in products]
+        )
+
     def _iter_reset_status(self):
         for p_mgr in self.strategy_mgr:
             for i_mgr in p_mgr:
@@ -468,6 +514,8 @@ class InterDayPortfolio(PortfolioAbstract):
     def dealSettlement(self, _tradingday: str):
         # check it's the end of prev tradingday
         assert _tradingday
+        if not self.contract_calendar_loaded:
+            self._load_contract_calendar()
 
         # settle current portfolio's positions
         self._update_symbol_price_dict(_tradingday)
@@ -570,9 +618,9 @@ class InterDayPortfolio(PortfolioAbstract):
         try:
             price = self.symbol_price_dict[_symbol]
         except KeyError:
-            price = self.fetcher.fetchData(
-                _tradingday, _symbol
-            )[self.settlement_price_index][0]
+            price = self.price_service.getPrice(
+                _tradingday, _symbol, self.settlement_price_index
+            )
             self.symbol_price_dict[_symbol] = price
 
         return price
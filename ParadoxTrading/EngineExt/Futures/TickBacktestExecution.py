@@ -1,5 +1,5 @@
 from ParadoxTrading.Engine import (DirectionType, ExecutionAbstract, FillEvent,
-                                   OrderEvent, OrderType)
+                                   OrderEvent)
 from ParadoxTrading.Utils import DataStruct
 
 
@@ -18,8 +18,7 @@ class TickBacktestExecution(ExecutionAbstract):
     def dealOrderEvent(
             self, _order_event: OrderEvent
     ):
-        assert _order_event.index not in self.order_dict.keys()
-        self.order_dict[_order_event.index] = _order_event
+        self.addOrder(_order_event)
 
     def _gen_event(
             self, _price: float,
@@ -46,19 +45,12 @@ class TickBacktestExecution(ExecutionAbstract):
         askprice: float = _data[self.askprice_idx][0]
         bidprice: float = _data[self.bidprice_idx][0]
 
-        for index in sorted(self.order_dict.keys()):
-            order = self.order_dict[index]
-            if order.symbol != _symbol:
-                continue
+        # only the orders of symbol which cross ask or bid, by index
+        for order in self.order_index.popCrossed(
+                _symbol, askprice, bidprice
+        ):
+            del self.order_dict[order.index]
             if order.direction == DirectionType.BUY:
-                if (order.order_type == OrderType.MARKET or
-                    askprice <= order.price) and askprice > 0:
-                    self.addEvent(self._gen_event(askprice, order))
-                    del self.order_dict[index]
-            elif order.direction == DirectionType.SELL:
-                if (order.order_type == OrderType.MARKET or
-                    bidprice >= order.price) and bidprice > 0:
-                    self.addEvent(self._gen_event(bidprice, order))
-                    del self.order_dict[index]
+                self.addEvent(self._gen_event(askprice, order))
             else:
-                raise Exception('unknown direction type')
+                self.addEvent(self._gen_event(bidprice, order))
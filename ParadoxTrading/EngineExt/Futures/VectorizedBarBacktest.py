@@ -0,0 +1,213 @@
+import re
+import typing
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ParadoxTrading.EngineExt.Futures.PointValue import POINT_VALUE
+from ParadoxTrading.Fetch import FetchAbstract
+from ParadoxTrading.Utils import DataStruct
+
+
+class VectorizedBarBacktest:
+    """
+    vectorized backtest of bar strategies, the same rules as
+    BacktestEngine with BarBacktestExecution and BarPortfolio, but the
+    signals are arrays computed on the whole data at once, such as by
+    fetcher.fetchDayData and numpy or pandas.
+
+    signal[i] is the target strength after bar i, like the strength of
+    SignalEvent, its sign is the direction and int(abs(strength)) is the
+    number of hands, nan keeps the last target. The order is filled by
+    the price_idx of bar i + 1 with commission_rate, and each tradingday
+    is settled by its settlement price.
+
+    The result has the format of PortfolioMgr.getSettlementData(),
+    margin is valued by the settlement price.
+    """
+
+    def __init__(
+            self,
+            _init_fund: float = 0.0,
+            _margin_rate: float = 1.0,
+            _commission_rate: float = 0.0,
+            _price_idx: str = 'openprice',
+            _fetcher: FetchAbstract = None,
+            _settlement_price_index: str = 'closeprice',
+    ):
+        """
+
+        :param _init_fund:
+        :param _margin_rate:
+        :param _commission_rate: see BarBacktestExecution
+        :param _price_idx: see BarBacktestExecution
+        :param _fetcher: fetch day data to settle like BarPortfolio,
+            if None or the day is missing, settle by the closeprice
+            of the last bar each day
+        :param _settlement_price_index: column of the day data
+        """
+        self.init_fund: float = _init_fund
+        self.margin_rate: float = _margin_rate
+        self.commission_rate: float = _commission_rate
+        self.price_idx: str = _price_idx
+        self.fetcher: FetchAbstract = _fetcher
+        self.settlement_price_index: str = _settlement_price_index
+
+        # symbol -> (bars, signal, point value)
+        self.symbol_dict: typing.Dict[
+            str, typing.Tuple[DataStruct, np.ndarray, float]
+        ] = {}
+        self.settlement: DataStruct = None
+
+    def addSymbol(
+            self, _symbol: str, _data: DataStruct,
+            _signal: typing.Sequence[float],
+            _point_value: float = None
+    ) -> 'VectorizedBarBacktest':
+        """
+        add the bars of one symbol and its signals
+
+        :param _symbol: instrument like 'rb1801'
+        :param _data: bars sorted by time, with tradingday column
+        :param _signal: target strength after each bar
+        :param _point_value: default POINT_VALUE of the product
+        :return: self
+        """
+        signal = np.asarray(_signal, dtype='float64')
+        assert len(signal) == len(_data)
+        if _point_value is None:
+            product = re.findall(r'[a-zA-Z]+', _symbol)[0]
+            _point_value = POINT_VALUE[product]
+        self.symbol_dict[_symbol] = (_data, signal, _point_value)
+        return self
+
+    @staticmethod
+    def _fill_signal(_signal: np.ndarray) -> np.ndarray:
+        """
+        forward fill nan, and nan before the first signal is 0
+        """
+        idx = np.arange(len(_signal))
+        idx[np.isnan(_signal)] = 0
+        np.maximum.accumulate(idx, out=idx)
+        target = _signal[idx]
+        target[np.isnan(target)] = 0.0
+        return target
+
+    def _fetch_settlement(
+            self, _symbol: str, _tradingday: np.ndarray,
+            _settlement: np.ndarray
+    ):
+        """
+        replace settlement prices by the day data of fetcher, fetched by
+        one fetchDayData instead of fetchData of each day
+        """
+        end_day = datetime.strptime(
+            _tradingday[-1], '%Y%m%d'
+        ) + timedelta(days=1)
+        day_data = self.fetcher.fetchDayData(
+            _tradingday[0], end_day.strftime('%Y%m%d'), _symbol
+        )
+        if not len(day_data):
+            return
+        days = np.asarray(day_data['tradingday'])
+        prices = np.asarray(
+            day_data[self.settlement_price_index], dtype='float64'
+        )
+        idx = np.minimum(
+            np.searchsorted(days, _tradingday), len(days) - 1
+        )
+        found = days[idx] == _tradingday
+        _settlement[found] = prices[idx[found]]
+
+    def _run_symbol(
+            self, _symbol: str, _data: DataStruct,
+            _signal: np.ndarray, _point_value: float
+    ) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :return: (tradingday, profit and loss, commission, margin)
+            of each tradingday, profit and loss is accumulated from
+            the beginning, commission is of that day
+        """
+        if not len(_data):
+            empty = np.empty(0)
+            return empty.astype(str), empty, empty, empty
+
+        target = np.trunc(self._fill_signal(_signal)) * _point_value
+        # the order sent after bar i is filled by bar i + 1
+        position = np.empty_like(target)
+        position[0] = 0.0
+        position[1:] = target[:-1]
+        delta = np.diff(position, prepend=0.0)
+        price = np.asarray(_data[self.price_idx], dtype='float64')
+        cash = np.cumsum(-delta * price)
+        commission = np.cumsum(
+            self.commission_rate * np.abs(delta) * price
+        )
+
+        # last bar of each tradingday
+        days = np.asarray(_data['tradingday'])
+        last = np.append(
+            np.flatnonzero(days[1:] != days[:-1]), len(days) - 1
+        )
+        tradingday = days[last]
+        position = position[last]
+        settlement = np.asarray(
+            _data['closeprice'], dtype='float64'
+        )[last]
+        if self.fetcher is not None:
+            self._fetch_settlement(_symbol, tradingday, settlement)
+
+        commission = commission[last]
+        profit_loss = cash[last] + position * settlement - commission
+        margin = self.margin_rate * np.abs(position) * settlement
+        return (
+            tradingday, profit_loss,
+            np.diff(commission, prepend=0.0), margin
+        )
+
+    def run(self) -> DataStruct:
+        """
+        run all the symbols, tradingdays are the union of their bars
+
+        :return: settlement data
+        """
+        results = [
+            self._run_symbol(k, *v) for k, v in self.symbol_dict.items()
+        ]
+        tradingday = np.unique(np.concatenate(
+            [r[0] for r in results]
+        )) if results else np.empty(0, dtype=str)
+
+        fund = np.full(len(tradingday), self.init_fund)
+        commission = np.zeros(len(tradingday))
+        margin = np.zeros(len(tradingday))
+        for days, profit_loss, day_commission, day_margin in results:
+            if not len(days):
+                continue
+            # latest tradingday of the symbol, positions are kept
+            # on the days without its bars
+            idx = np.searchsorted(days, tradingday, 'right') - 1
+            valid = idx >= 0
+            idx = idx[valid]
+            fund[valid] += profit_loss[idx]
+            margin[valid] += day_margin[idx]
+            same = days[idx] == tradingday[valid]
+            commission[np.flatnonzero(valid)[same]] += day_commission[
+                idx[same]
+            ]
+
+        self.settlement = DataStruct([
+            'tradingday', 'fund', 'commission', 'margin'
+        ], 'tradingday')
+        self.settlement.addColumns({
+            'tradingday': tradingday.tolist(),
+            'fund': fund.tolist(),
+            'commission': commission.tolist(),
+            'margin': margin.tolist(),
+        })
+        return self.settlement
+
+    def getSettlementData(self) -> DataStruct:
+        if self.settlement is None:
+            return self.run()
+        return self.settlement
@@ -2,6 +2,7 @@ from .Arbitrage import ArbitrageEqualFundSimplePortfolio, \
     ArbitrageEqualFundVolatilityPortfolio, ArbitrageStrategy
 from .BarBacktestExecution import BarBacktestExecution
 from .BarPortfolio import BarPortfolio
+from .DailyPriceService import DailyPriceService
 from .InterDayBacktestExecution import InterDayBacktestExecution
 from .InterDayOnlineEngine import InterDayOnlineEngine
 from .InterDayOnlineExecution import InterDayOnlineExecution
@@ -9,6 +10,7 @@ from .InterDayOnlineMarketSupply import InterDayOnlineMarketSupply
 from .InterDayPortfolio import InterDayPortfolio
 from .TickBacktestExecution import TickBacktestExecution
 from .TickPortfolio import TickPortfolio
+from .VectorizedBarBacktest import VectorizedBarBacktest
 from .Trend import CTAEqualFundPortfolio, CTAEqualRiskATRPortfolio, \
     CTAEqualRiskRatePortfolio, CTAEqualRiskVolatilityPortfolio, \
     CTAStatusType, CTAStrategy, CTAEqualRiskGARCHPortfolio
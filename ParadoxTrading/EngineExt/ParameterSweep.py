@@ -0,0 +1,123 @@
+import itertools
+import logging
+import traceback
+import typing
+from concurrent.futures import ProcessPoolExecutor
+
+from ParadoxTrading.Engine import ExecutionAbstract, MarketSupplyAbstract, \
+    PortfolioAbstract, StrategyAbstract
+from ParadoxTrading.EngineExt.BacktestEngine import BacktestEngine
+from ParadoxTrading.Performance import performanceDict, settlementReturn
+
+# factory(**params) -> (market supply, execution, portfolio, strategies)
+FactoryType = typing.Callable[..., typing.Tuple[
+    MarketSupplyAbstract, ExecutionAbstract, PortfolioAbstract,
+    typing.Union[StrategyAbstract, typing.Iterable[StrategyAbstract]]
+]]
+
+
+def _run_one(
+        _factory: FactoryType, _params: typing.Dict[str, typing.Any],
+        _factor: int, _risk_free: float
+) -> typing.Dict[str, typing.Any]:
+    """
+    run one backtest in worker, records are kept in memory,
+    nothing is written to mongo
+
+    :return: dict of params, settlement, metrics and error
+    """
+    ret = {
+        'params': _params,
+        'settlement': None,
+        'metrics': None,
+        'error': None,
+    }
+    try:
+        market_supply, execution, portfolio, strategy = _factory(**_params)
+        engine = BacktestEngine(market_supply, execution, portfolio, strategy)
+        engine.run()
+
+        settlement = portfolio.getSettlementData()
+        ret['settlement'] = settlement
+        ret['metrics'] = performanceDict(
+            settlementReturn(settlement), _factor, _risk_free
+        )
+    except Exception:
+        ret['error'] = traceback.format_exc()
+        logging.error('sweep {} failed:\n{}'.format(_params, ret['error']))
+    return ret
+
+
+class ParameterSweep:
+    def __init__(
+            self, _factory: FactoryType,
+            _grid: typing.Dict[str, typing.Sequence[typing.Any]],
+            _processes: int = None,
+            _warm_up: bool = False,
+            _factor: int = 252,
+            _risk_free: float = 0.0
+    ):
+        """
+        run the same backtest with all the combinations of params
+        on a process pool.
+
+        _factory and the objects it creates are called in workers,
+        so _factory has to be a module level function. Create fetchers
+        with the same _cache_path inside _factory, then all workers
+        read market data from the same diskcache.
+
+        :param _factory: factory(**params) returns (market supply,
+            execution, portfolio, strategy or list of strategies)
+        :param _grid: map param name to its values to try
+        :param _processes: number of workers, default cpu count
+        :param _warm_up: run the first combination in this process before
+            starting workers, so the shared cache is filled and workers
+            only read it
+        :param _factor: see Performance.Functions
+        :param _risk_free: see Performance.Functions
+        """
+        self.factory: FactoryType = _factory
+        self.grid: typing.Dict[str, typing.Sequence[typing.Any]] = _grid
+        self.processes: int = _processes
+        self.warm_up: bool = _warm_up
+        self.factor: int = _factor
+        self.risk_free: float = _risk_free
+
+    def getParamsList(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        """
+        all the combinations of grid
+
+        :return: list of params
+        """
+        keys = list(self.grid.keys())
+        return [
+            dict(zip(keys, values)) for values in itertools.product(
+                *[self.grid[k] for k in keys]
+            )
+        ]
+
+    def run(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        """
+        run all the combinations, results are in the same order
+        as getParamsList()
+
+        :return: list of dict, 'params', 'settlement' (DataStruct),
+            'metrics' (dict), 'error' (None if succeed)
+        """
+        params_list = self.getParamsList()
+        ret = []
+        if self.warm_up and params_list:
+            ret.append(_run_one(
+                self.factory, params_list[0], self.factor, self.risk_free
+            ))
+            params_list = params_list[1:]
+        if not params_list:
+            return ret
+
+        num = len(params_list)
+        with ProcessPoolExecutor(self.processes) as executor:
+            ret += executor.map(
+                _run_one, [self.factory] * num, params_list,
+                [self.factor] * num, [self.risk_free] * num
+            )
+        return ret
@@ -1,2 +1,3 @@
 from .BacktestEngine import BacktestEngine
 from .BacktestMarketSupply import BacktestMarketSupply
+from .ParameterSweep import ParameterSweep
@@ -1,4 +1,5 @@
 import json
+import threading
 import typing
 
 import psycopg2
@@ -9,7 +10,8 @@ import pymongo.database
 from diskcache import Cache
 from pymongo import MongoClient
 
-from ParadoxTrading.Fetch import FetchAbstract, RegisterAbstract
+from ParadoxTrading.Fetch import ContractCalendar, FetchAbstract, \
+    RegisterAbstract
 from ParadoxTrading.Utils import DataStruct
 
 
@@ -110,8 +112,14 @@ class RegisterIndex(RegisterAbstract):
 class FetchBase(FetchAbstract):
     def __init__(
             self, _mongo_host='localhost', _psql_host='localhost',
-            _psql_user='', _psql_password='', _cache_path='cache'
+            _psql_user='', _psql_password='', _cache_path='cache',
+            _columnar=False
     ):
+        """
+
+        :param _columnar: if True, numeric columns of fetched data will be
+            stored as typed numpy arrays, see self.dtypes
+        """
         super().__init__()
         self.register_type = RegisterInstrument
 
@@ -131,37 +139,64 @@ class FetchBase(FetchAbstract):
 
         self._mongo_client: MongoClient = None
         self._mongo_db: pymongo.database.Database = None
-        self._psql_con: psycopg2.extensions.connection = None
-        self._psql_cur: psycopg2.extensions.cursor = None
+        self._mongo_lock: threading.Lock = threading.Lock()
+        # psql connection and cursor of each thread
+        self._psql_local: threading.local = threading.local()
 
         self.columns: typing.List = []
+        # map numeric column to numpy dtype, used if columnar
+        self.columnar: bool = _columnar
+        self.dtypes: typing.Dict[str, str] = {}
+
+    def cacheKey(self) -> str:
+        return '{}_{}_{}_{}_{}'.format(
+            type(self).__name__, self.mongo_host, self.psql_host,
+            self.psql_dbname, self.columnar
+        )
+
+    def _set_storage(
+            self, _data: typing.Union[None, DataStruct]
+    ) -> typing.Union[None, DataStruct]:
+        """
+        turn data into the storage mode requested by self.columnar
+        """
+        if _data is None:
+            return None
+        if self.columnar:
+            if not _data.dtypes:
+                _data.setDtypes(self.dtypes)
+        elif _data.dtypes:
+            _data.setDtypes(dict((k, None) for k in _data.dtypes))
+        return _data
 
     def _get_mongo_db(self) -> pymongo.database.Database:
-        if not self._mongo_db:
-            if not self._mongo_client:
-                self._mongo_client: MongoClient = MongoClient(
-                    host=self.mongo_host
-                )
-            self._mongo_db: pymongo.database.Database = \
-                self._mongo_client[self.mongo_dbname]
+        with self._mongo_lock:  # client is shared by threads
+            if not self._mongo_db:
+                if not self._mongo_client:
+                    self._mongo_client: MongoClient = MongoClient(
+                        host=self.mongo_host
+                    )
+                self._mongo_db: pymongo.database.Database = \
+                    self._mongo_client[self.mongo_dbname]
         return self._mongo_db
 
     def _get_psql_con_cur(self) -> typing.Tuple[
         psycopg2.extensions.connection, psycopg2.extensions.cursor
     ]:
-        if not self._psql_con:
-            self._psql_con: psycopg2.extensions.connection = \
-                psycopg2.connect(
-                    dbname=self.psql_dbname,
-                    host=self.psql_host,
-                    user=self.psql_user,
-                    password=self.psql_password,
-                )
-        if not self._psql_cur:
-            self._psql_cur: psycopg2.extensions.cursor = \
-                self._psql_con.cursor()
+        # cursor can not be shared between threads, so each thread
+        # has its own connection and cursor
+        local = self._psql_local
+        if getattr(local, 'con', None) is None:
+            local.con = psycopg2.connect(
+                dbname=self.psql_dbname,
+                host=self.psql_host,
+                user=self.psql_user,
+                password=self.psql_password,
+            )
+        if getattr(local, 'cur', None) is None:
+            local.cur = local.con.cursor()
 
-        return self._psql_con, self._psql_cur
+        return local.con, local.cur
 
     def isTradingDay(self, _tradingday: str) -> bool:
         """
@@ -175,6 +210,26 @@ class FetchBase(FetchAbstract):
             _tradingday
         ) is not None
 
+    def fetchTradingDayList(
+            self, _begin_day: str, _end_day: str
+    ) -> typing.List[str]:
+        """
+        get all the tradingdays from _begin_day to _end_day(excluded)
+        in one query, and the records are cached for fetchTradingDayInfo
+        """
+        db = self._get_mongo_db()
+        coll = db.tradingday
+        ret = []
+        for d in coll.find(
+                filter={'TradingDay': {
+                    '$gte': _begin_day, '$lt': _end_day
+                }},
+                sort=[('TradingDay', pymongo.ASCENDING)]
+        ):
+            self.cache[self.tradingday_key.format(d['TradingDay'])] = d
+            ret.append(d['TradingDay'])
+        return ret
+
     def fetchAvailableProduct(self, _tradingday: str) -> list:
         """
         fetch all available product on pointed tradingday
@@ -379,91 +434,163 @@ class FetchBase(FetchAbstract):
             self.cache[key] = data
             return data
 
+    def fetchProductInfoMany(
+            self, _products: typing.Iterable[str],
+            _tradingdays: typing.Sequence[str]
+    ) -> typing.Dict[typing.Tuple[str, str], typing.Dict]:
+        """
+        get product records of tradingdays in one query,
+        and the records are cached for fetchProductInfo
+
+        :param _products:
+        :param _tradingdays: sorted tradingdays
+        :return: map (product, tradingday) to record, missing if
+            product is not traded
+        """
+        ret = {}
+        if not _tradingdays:
+            return ret
+        db = self._get_mongo_db()
+        coll = db.product
+        for d in coll.find(filter={
+            'TradingDay': {
+                '$gte': _tradingdays[0], '$lte': _tradingdays[-1]
+            },
+            'Product': {'$in': [p.lower() for p in _products]},
+        }):
+            key = (d['Product'], d['TradingDay'])
+            self.cache[self.prod_key.format(*key)] = d
+            ret[key] = d
+        return ret
+
     def _get_sorted_list(
-            self, _product: str, _tradingday: str, _key: str
+            self, _instrument_list: typing.List[str],
+            _tradingday: str, _key: str
     ):
-        instrument_list = self.fetchAvailableInstrument(
-            _product, _tradingday
-        )
-        if not instrument_list:
+        if not _instrument_list:
             return None
+        data_dict = self.fetchDataMany(_tradingday, _instrument_list)
         tmp = [(
-            k, self.fetchData(_tradingday, k)[_key][0]
-        ) for k in instrument_list]
+            k, data_dict[k][_key][0]
+        ) for k in _instrument_list]
         tmp.sort(key=lambda x: x[1])
 
         return tmp
 
-    def fetchSymbol(
-            self, _tradingday: str, _product: str = None,
-            _type: int = RegisterInstrument.DOMINANT,
+    def _choose_symbol(
+            self, _product_info: typing.Union[None, typing.Dict],
+            _tradingday: str, _type: int
     ) -> typing.Union[None, str]:
         """
-        get symbol from database
+        choose the symbol of _type from the product record
 
-        :param _tradingday: the tradingday
-        :param _product: the product to fetch
+        :param _product_info: product record of tradingday
+        :param _tradingday:
         :param _type:
         :return:
         """
-
-        assert _product is not None
-
-        product = _product.lower()
-
-        if _type == RegisterInstrument.DOMINANT:
-            return self.fetchDominant(product, _tradingday)
-        elif _type == RegisterInstrument.SUB_DOMINANT:
-            return self.fetchSubDominant(product, _tradingday)
-        elif _type == RegisterInstrument.BEFORE_DOMINANT:
-            dominant = self.fetchDominant(product, _tradingday)
-            if dominant is None:
+        if _type in (
+                RegisterInstrument.DOMINANT,
+                RegisterInstrument.SUB_DOMINANT,
+                RegisterInstrument.BEFORE_DOMINANT,
+                RegisterInstrument.AFTER_DOMINANT,
+        ):
+            if _product_info is None:
                 return None
-            tmp = self.fetchAvailableInstrument(product, _tradingday)
-            if not tmp:
-                return None
-            tmp.sort()
-            tmp_index = tmp.index(dominant)
-            tmp_index -= 1
-            if tmp_index < 0:
-                return None
-            return tmp[tmp_index]
-        elif _type == RegisterInstrument.AFTER_DOMINANT:
-            dominant = self.fetchDominant(product, _tradingday)
+            dominant = _product_info['Dominant']
+            if _type == RegisterInstrument.DOMINANT:
+                return dominant
+            if _type == RegisterInstrument.SUB_DOMINANT:
+                return _product_info['SubDominant']
             if dominant is None:
                 return None
-            tmp = self.fetchAvailableInstrument(product, _tradingday)
+            tmp = sorted(_product_info['InstrumentList'])
             if not tmp:
                 return None
-            tmp.sort()
             tmp_index = tmp.index(dominant)
-            tmp_index += 1
-            if tmp_index >= len(tmp):
+            if _type == RegisterInstrument.BEFORE_DOMINANT:
+                tmp_index -= 1
+            else:
+                tmp_index += 1
+            if tmp_index < 0 or tmp_index >= len(tmp):
                 return None
             return tmp[tmp_index]
-        elif _type == RegisterInstrument.MOST_OPENINTEREST:
-            ret = self._get_sorted_list(
-                product, _tradingday, 'openinterest'
-            )
-            return None if ret is None else ret[-1][0]
-        elif _type == RegisterInstrument.SECOND_OPENINTEREST:
-            ret = self._get_sorted_list(
-                product, _tradingday, 'openinterest'
-            )
-            return None if ret is None else ret[-2][0]
-        elif _type == RegisterInstrument.MOST_VOLUME:
-            ret = self._get_sorted_list(
-                product, _tradingday, 'volume'
-            )
-            return None if ret is None else ret[-1][0]
-        elif _type == RegisterInstrument.SECOND_VOLUME:
+        elif _type in (
+                RegisterInstrument.MOST_OPENINTEREST,
+                RegisterInstrument.SECOND_OPENINTEREST,
+                RegisterInstrument.MOST_VOLUME,
+                RegisterInstrument.SECOND_VOLUME,
+        ):
+            if _product_info is None:
+                return None
+            if _type in (
+                    RegisterInstrument.MOST_OPENINTEREST,
+                    RegisterInstrument.SECOND_OPENINTEREST,
+            ):
+                key = 'openinterest'
+            else:
+                key = 'volume'
             ret = self._get_sorted_list(
-                product, _tradingday, 'volume'
+                _product_info['InstrumentList'], _tradingday, key
             )
-            return None if ret is None else ret[-2][0]
+            if ret is None:
+                return None
+            if _type in (
+                    RegisterInstrument.MOST_OPENINTEREST,
+                    RegisterInstrument.MOST_VOLUME,
+            ):
+                return ret[-1][0]
+            return ret[-2][0]
         else:
             raise Exception('unknown type')
 
+    def fetchSymbol(
+            self, _tradingday: str, _product: str = None,
+            _type: int = RegisterInstrument.DOMINANT,
+    ) -> typing.Union[None, str]:
+        """
+        get symbol from contract calendar if loaded, else database
+
+        :param _tradingday: the tradingday
+        :param _product: the product to fetch
+        :param _type:
+        :return:
+        """
+
+        assert _product is not None
+
+        product = _product.lower()
+        try:
+            return self._get_calendar_symbol(_tradingday, product, _type)
+        except KeyError:
+            pass
+
+        return self._choose_symbol(
+            self.fetchProductInfo(product, _tradingday), _tradingday, _type
+        )
+
+    def _fill_contract_calendar(self, _calendar: ContractCalendar):
+        """
+        product records of the whole range are loaded by one query,
+        and instruments sorted by openinterest or volume are fetched
+        by one query each day
+        """
+        if self.register_type is not RegisterInstrument:
+            # symbol of index fetchers is not chosen from product record
+            return super()._fill_contract_calendar(_calendar)
+        tradingdays = sorted(_calendar.day_index)
+        info_dict = self.fetchProductInfoMany(
+            _calendar.product_index, tradingdays
+        )
+        for tradingday in tradingdays:
+            for product in _calendar.product_index:
+                info = info_dict.get((product, tradingday))
+                for _type in _calendar.type_index:
+                    _calendar.setSymbol(
+                        tradingday, product, _type,
+                        self._choose_symbol(info, tradingday, _type)
+                    )
+
     def fetchData(
             self, _tradingday: str, _symbol: str,
             _cache=True, _index='HappenTime'
@@ -482,7 +609,7 @@ class FetchBase(FetchAbstract):
         key = self.market_key.format(symbol, _tradingday)
         if _cache:
             try:
-                return self.cache[key]
+                return self._set_storage(self.cache[key])
             except KeyError:
                 pass
 
@@ -497,7 +624,9 @@ class FetchBase(FetchAbstract):
         )
         data = list(cur.fetchall())
         if len(data):
-            data = DataStruct(self.columns, _index.lower(), data)
+            data = self._set_storage(
+                DataStruct(self.columns, _index.lower(), data)
+            )
         else:
             data = None
 
@@ -505,6 +634,62 @@ class FetchBase(FetchAbstract):
             self.cache[key] = data
         return data
 
+    def fetchDataMany(
+            self, _tradingday: str, _symbols: typing.Iterable[str],
+            _cache=True, _index='HappenTime'
+    ) -> typing.Dict[str, typing.Union[None, DataStruct]]:
+        """
+        symbols in cache are read from it, the others are fetched
+        from database by one query
+
+        :param _tradingday:
+        :param _symbols:
+        :param _cache: whether to cache by hdf5
+        :param _index: use which column to index
+        :return: map symbol to its data, None if not available
+        """
+        ret = {}
+        missing = []
+        for symbol in _symbols:
+            if symbol in ret or symbol in missing:
+                continue
+            if _cache:
+                try:
+                    ret[symbol] = self._set_storage(self.cache[
+                        self.market_key.format(symbol.lower(), _tradingday)
+                    ])
+                    continue
+                except KeyError:
+                    pass
+            missing.append(symbol)
+        if not missing:
+            return ret
+
+        # fetch from database, rows are tagged by the position of symbol
+        index = _index.lower()
+        con, cur = self._get_psql_con_cur()
+        cur.execute(' UNION ALL '.join(
+            "(SELECT {} AS symbol_idx, * FROM {} "
+            "WHERE TradingDay='{}')".format(i, s.lower(), _tradingday)
+            for i, s in enumerate(missing)
+        ) + ' ORDER BY symbol_idx, {}'.format(index))
+        rows_list = [[] for _ in missing]
+        for row in cur.fetchall():
+            rows_list[row[0]].append(row[1:])
+
+        for symbol, rows in zip(missing, rows_list):
+            data = None
+            if rows:
+                data = self._set_storage(
+                    DataStruct(self.columns, index, rows)
+                )
+            if _cache:
+                self.cache[
+                    self.market_key.format(symbol.lower(), _tradingday)
+                ] = data
+            ret[symbol] = data
+        return ret
+
     def fetchDayData(
             self, _begin_day: str, _end_day: str,
             _symbol: str, _index: str = 'HappenTime'
@@ -527,4 +712,6 @@ class FetchBase(FetchAbstract):
         cur.execute(query)
         data = list(cur.fetchall())
 
-        return DataStruct(self.columns, _index.lower(), data)
+        return self._set_storage(
+            DataStruct(self.columns, _index.lower(), data)
+        )
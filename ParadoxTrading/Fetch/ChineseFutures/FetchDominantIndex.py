@@ -5,10 +5,12 @@ from ParadoxTrading.Fetch.ChineseFutures.FetchInstrumentDayData import FetchInst
 class FetchDominantIndex(FetchInstrumentDayData):
     def __init__(
             self, _mongo_host='localhost', _psql_host='localhost',
-            _psql_user='', _psql_password='', _cache_path='cache'
+            _psql_user='', _psql_password='', _cache_path='cache',
+            _columnar=False
     ):
         super().__init__(
-            _mongo_host, _psql_host, _psql_user, _psql_password, _cache_path
+            _mongo_host, _psql_host, _psql_user, _psql_password, _cache_path,
+            _columnar
         )
 
         self.register_type = RegisterIndex
@@ -21,12 +23,17 @@ class FetchDominantIndex(FetchInstrumentDayData):
             'openprice', 'highprice', 'lowprice', 'closeprice',
             'volume', 'openinterest'
         ]
+        self.dtypes = dict((k, 'float64') for k in self.columns[1:])
 
     def fetchSymbol(
             self, _tradingday: str, _product: str = None, **kwargs
     ):
         assert _product is not None
         _product = _product.lower()
+        try:
+            return self._get_calendar_symbol(_tradingday, _product)
+        except KeyError:
+            pass
 
         if self.productIsAvailable(_product, _tradingday):
             return _product
@@ -7,10 +7,12 @@ from ParadoxTrading.Utils import DataStruct
 class FetchInstrumentDayData(FetchBase):
     def __init__(
             self, _mongo_host='localhost', _psql_host='localhost',
-            _psql_user='', _psql_password='', _cache_path='cache'
+            _psql_user='', _psql_password='', _cache_path='cache',
+            _columnar=False
     ):
         super().__init__(
-            _mongo_host, _psql_host, _psql_user, _psql_password, _cache_path
+            _mongo_host, _psql_host, _psql_user, _psql_password, _cache_path,
+            _columnar
         )
 
         self.psql_dbname: str = 'ChineseFuturesInstrumentDayData'
@@ -21,6 +23,7 @@ class FetchInstrumentDayData(FetchBase):
             'settlementprice', 'volume', 'openinterest',
             'presettlementprice',
         ]
+        self.dtypes = dict((k, 'float64') for k in self.columns[1:])
 
     def fetchData(
             self, _tradingday: str, _symbol: str,
@@ -30,6 +33,14 @@ class FetchInstrumentDayData(FetchBase):
             _tradingday, _symbol, _cache, _index
         )
 
+    def fetchDataMany(
+            self, _tradingday: str, _symbols: typing.Iterable[str],
+            _cache=True, _index='TradingDay'
+    ) -> typing.Dict[str, typing.Union[None, DataStruct]]:
+        return super().fetchDataMany(
+            _tradingday, _symbols, _cache, _index
+        )
+
     def fetchDayData(
             self, _begin_day: str, _end_day: str = None,
             _symbol: str = None, _index: str = 'TradingDay'
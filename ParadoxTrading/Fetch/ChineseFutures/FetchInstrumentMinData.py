@@ -7,10 +7,12 @@ from ParadoxTrading.Utils import DataStruct
 class FetchInstrumentMinData(FetchBase):
     def __init__(
             self, _mongo_host='localhost', _psql_host='localhost',
-            _psql_user='', _psql_password='', _cache_path='cache'
+            _psql_user='', _psql_password='', _cache_path='cache',
+            _columnar=False
     ):
         super().__init__(
-            _mongo_host, _psql_host, _psql_user, _psql_password, _cache_path
+            _mongo_host, _psql_host, _psql_user, _psql_password, _cache_path,
+            _columnar
         )
 
         self.psql_dbname: str = 'ChineseFuturesInstrumentMinData'
@@ -20,6 +22,7 @@ class FetchInstrumentMinData(FetchBase):
             'openprice', 'highprice', 'lowprice', 'closeprice',
             'volume', 'openinterest',
         ]
+        self.dtypes = dict((k, 'float64') for k in self.columns[2:])
 
     def fetchData(
             self, _tradingday: str, _symbol: str,
@@ -29,6 +32,14 @@ class FetchInstrumentMinData(FetchBase):
             _tradingday, _symbol, _cache, _index
         )
 
+    def fetchDataMany(
+            self, _tradingday: str, _symbols: typing.Iterable[str],
+            _cache=True, _index='datetime'
+    ) -> typing.Dict[str, typing.Union[None, DataStruct]]:
+        return super().fetchDataMany(
+            _tradingday, _symbols, _cache, _index
+        )
+
     def fetchDayData(
             self, _begin_day: str, _end_day: str = None,
             _symbol: str = None, _index: str = 'datetime'
@@ -7,10 +7,12 @@ from ParadoxTrading.Utils import DataStruct
 class FetchInstrumentTickData(FetchBase):
     def __init__(
             self, _mongo_host='localhost', _psql_host='localhost',
-            _psql_user='', _psql_password='', _cache_path='cache'
+            _psql_user='', _psql_password='', _cache_path='cache',
+            _columnar=False
     ):
         super().__init__(
-            _mongo_host, _psql_host, _psql_user, _psql_password, _cache_path
+            _mongo_host, _psql_host, _psql_user, _psql_password, _cache_path,
+            _columnar
         )
 
         self.psql_dbname: str = 'ChineseFuturesInstrumentTickData'
@@ -23,3 +25,4 @@ class FetchInstrumentTickData(FetchBase):
             'askprice', 'askvolume', 'bidprice', 'bidvolume',
             'happentime',
         ]
+        self.dtypes = dict((k, 'float64') for k in self.columns[1:-1])
@@ -0,0 +1,319 @@
+import os
+import pickle
+import threading
+import typing
+from bisect import bisect_left, bisect_right
+
+from ParadoxTrading.Fetch.ChineseFutures.FetchBase import FetchBase, \
+    RegisterIndex, RegisterInstrument
+from ParadoxTrading.Fetch.FetchAbstract import FetchAbstract
+from ParadoxTrading.Fetch.FetchShared import SharedMarketStore
+from ParadoxTrading.Utils import DataStruct
+
+
+class LocalIndex:
+    TRADINGDAY = 'tradingday.pkl'
+    PRODUCT = 'product.pkl'
+    INSTRUMENT = 'instrument.pkl'
+
+    def __init__(self, _path: str):
+        """
+        local copy of mongo collections tradingday, product and instrument,
+        each one is a pickled dict, loaded when first used
+
+        :param _path: root dir of local data
+        """
+        self.path: str = _path
+
+        self._tradingday: typing.Dict[str, typing.Dict] = None
+        self._product: typing.Dict[typing.Tuple[str, str], typing.Dict] = None
+        self._instrument: typing.Dict[
+            typing.Tuple[str, str], typing.Dict] = None
+        # map product or instrument to its sorted tradingdays
+        self._product_days: typing.Dict[str, typing.List[str]] = None
+        self._instrument_days: typing.Dict[str, typing.List[str]] = None
+
+    def _load(self, _name: str) -> dict:
+        with open(os.path.join(self.path, _name), 'rb') as f:
+            return pickle.load(f)
+
+    @staticmethod
+    def _days_of(
+            _dict: typing.Dict[typing.Tuple[str, str], typing.Dict]
+    ) -> typing.Dict[str, typing.List[str]]:
+        ret: typing.Dict[str, typing.List[str]] = {}
+        for name, day in _dict.keys():
+            ret.setdefault(name, []).append(day)
+        for v in ret.values():
+            v.sort()
+        return ret
+
+    def tradingday(self) -> typing.Dict[str, typing.Dict]:
+        if self._tradingday is None:
+            self._tradingday = self._load(self.TRADINGDAY)
+        return self._tradingday
+
+    def product(self) -> typing.Dict[typing.Tuple[str, str], typing.Dict]:
+        if self._product is None:
+            self._product = self._load(self.PRODUCT)
+            self._product_days = self._days_of(self._product)
+        return self._product
+
+    def instrument(self) -> typing.Dict[typing.Tuple[str, str], typing.Dict]:
+        if self._instrument is None:
+            self._instrument = self._load(self.INSTRUMENT)
+            self._instrument_days = self._days_of(self._instrument)
+        return self._instrument
+
+    def productDays(self, _product: str) -> typing.List[str]:
+        self.product()
+        return self._product_days.get(_product, [])
+
+    def instrumentDays(self, _instrument: str) -> typing.List[str]:
+        self.instrument()
+        return self._instrument_days.get(_instrument, [])
+
+    @staticmethod
+    def store(
+            _path: str,
+            _tradingday: typing.Iterable[typing.Dict],
+            _product: typing.Iterable[typing.Dict],
+            _instrument: typing.Iterable[typing.Dict]
+    ):
+        """
+        store records of mongo collections into _path
+
+        :param _path: root dir of local data
+        :param _tradingday: records of collection tradingday
+        :param _product: records of collection product
+        :param _instrument: records of collection instrument
+        :return:
+        """
+        def strip_id(_d: typing.Dict) -> typing.Dict:
+            return dict((k, v) for k, v in _d.items() if k != '_id')
+
+        os.makedirs(_path, exist_ok=True)
+        data_list = [
+            (LocalIndex.TRADINGDAY, dict(
+                (d['TradingDay'], strip_id(d)) for d in _tradingday
+            )),
+            (LocalIndex.PRODUCT, dict(
+                ((d['Product'].lower(), d['TradingDay']), strip_id(d))
+                for d in _product
+            )),
+            (LocalIndex.INSTRUMENT, dict(
+                ((d['Instrument'].lower(), d['TradingDay']), strip_id(d))
+                for d in _instrument
+            )),
+        ]
+        for name, data in data_list:
+            tmp_path = os.path.join(_path, name + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(data, f)
+            os.replace(tmp_path, os.path.join(_path, name))
+
+
+class FetchLocal(FetchBase):
+    def __init__(
+            self, _market: str = 'ChineseFuturesInstrumentTickData',
+            _path: str = 'local', _register_type: type = None
+    ):
+        """
+        read the data exported by Database.ChineseFutures.ExportLocal,
+        it needs no mongo or psql. Data of each day is stored by columns,
+        and typed columns are read by mmap.
+
+        :param _market: which data to read, the psql dbname of the fetcher
+            exported, like 'ChineseFuturesInstrumentMinData'
+        :param _path: root dir of local data
+        :param _register_type: default RegisterIndex if _market
+            ends with 'Index', else RegisterInstrument
+        """
+        # FetchBase.__init__ is not called, there is no database to connect
+        FetchAbstract.__init__(self)
+        if _register_type is None:
+            if _market.endswith('Index'):
+                _register_type = RegisterIndex
+            else:
+                _register_type = RegisterInstrument
+        self.register_type = _register_type
+
+        self.market: str = _market
+        self.path: str = _path
+        self.index: LocalIndex = LocalIndex(_path)
+        self.store: SharedMarketStore = SharedMarketStore(
+            os.path.join(_path, _market)
+        )
+
+        # attributes of FetchBase, there is no database or diskcache,
+        # _get_mongo_db and _get_psql_con_cur raise
+        self.mongo_host: str = None
+        self.mongo_dbname: str = 'ChineseFutures'
+        self.psql_host: str = None
+        self.psql_dbname: str = _market
+        self.psql_user: str = None
+        self.psql_password: str = None
+
+        self.cache: dict = {}
+        self.market_key: str = None
+        self.tradingday_key: str = 'ChineseFuturesTradingDay_{}'
+        self.prod_key: str = 'ChineseFuturesProduct_{}_{}'
+        self.inst_key: str = 'ChineseFuturesInstrument_{}_{}'
+
+        self._mongo_client = None
+        self._mongo_db = None
+        self._mongo_lock: threading.Lock = threading.Lock()
+        self._psql_local: threading.local = threading.local()
+
+        self.columns: typing.List = []
+        self.columnar: bool = True
+        self.dtypes: typing.Dict[str, str] = {}
+
+    def _get_mongo_db(self):
+        raise Exception('FetchLocal has no mongo, use the local index')
+
+    def _get_psql_con_cur(self):
+        raise Exception('FetchLocal has no psql, use the local store')
+
+    def cacheKey(self) -> str:
+        return '{}_{}_{}'.format(
+            type(self).__name__, os.path.abspath(self.path), self.market
+        )
+
+    @staticmethod
+    def dataKey(_symbol: str, _tradingday: str) -> str:
+        return '{}_{}'.format(_symbol.lower(), _tradingday)
+
+    def fetchTradingDayList(
+            self, _begin_day: str, _end_day: str
+    ) -> typing.List[str]:
+        days = sorted(self.index.tradingday().keys())
+        return days[
+            bisect_left(days, _begin_day):bisect_left(days, _end_day)
+        ]
+
+    def fetchTradingDayInfo(
+            self, _tradingday: str
+    ) -> typing.Union[None, typing.Dict]:
+        return self.index.tradingday().get(_tradingday)
+
+    def fetchProductInfo(
+            self, _product: str, _tradingday: str
+    ) -> typing.Union[None, typing.Dict]:
+        return self.index.product().get((_product.lower(), _tradingday))
+
+    def fetchProductInfoMany(
+            self, _products: typing.Iterable[str],
+            _tradingdays: typing.Sequence[str]
+    ) -> typing.Dict[typing.Tuple[str, str], typing.Dict]:
+        product_dict = self.index.product()
+        ret = {}
+        for product in _products:
+            for day in _tradingdays:
+                key = (product.lower(), day)
+                if key in product_dict:
+                    ret[key] = product_dict[key]
+        return ret
+
+    def fetchInstrumentInfo(
+            self, _instrument: str, _tradingday: str
+    ) -> typing.Union[None, typing.Dict]:
+        return self.index.instrument().get(
+            (_instrument.lower(), _tradingday)
+        )
+
+    @staticmethod
+    def _last_day(
+            _days: typing.List[str], _tradingday: str
+    ) -> typing.Union[None, str]:
+        i = bisect_left(_days, _tradingday)
+        return _days[i - 1] if i > 0 else None
+
+    @staticmethod
+    def _next_day(
+            _days: typing.List[str], _tradingday: str
+    ) -> typing.Union[None, str]:
+        i = bisect_right(_days, _tradingday)
+        return _days[i] if i < len(_days) else None
+
+    def productLastTradingDay(
+            self, _product: str, _tradingday: str
+    ) -> typing.Union[None, str]:
+        return self._last_day(
+            self.index.productDays(_product.lower()), _tradingday
+        )
+
+    def productNextTradingDay(
+            self, _product: str, _tradingday: str
+    ) -> typing.Union[None, str]:
+        return self._next_day(
+            self.index.productDays(_product.lower()), _tradingday
+        )
+
+    def instrumentLastTradingDay(
+            self, _instrument: str, _tradingday: str
+    ) -> typing.Union[None, str]:
+        return self._last_day(
+            self.index.instrumentDays(_instrument.lower()), _tradingday
+        )
+
+    def instrumentNextTradingDay(
+            self, _instrument: str, _tradingday: str
+    ) -> typing.Union[None, str]:
+        return self._next_day(
+            self.index.instrumentDays(_instrument.lower()), _tradingday
+        )
+
+    def fetchSymbol(
+            self, _tradingday: str, _product: str = None,
+            _type: int = RegisterInstrument.DOMINANT,
+    ) -> typing.Union[None, str]:
+        if self.register_type is RegisterIndex:
+            # the same as FetchDominantIndex
+            assert _product is not None
+            _product = _product.lower()
+            try:
+                return self._get_calendar_symbol(_tradingday, _product)
+            except KeyError:
+                pass
+            if self.productIsAvailable(_product, _tradingday):
+                return _product
+            return None
+        return super().fetchSymbol(_tradingday, _product, _type)
+
+    def fetchData(
+            self, _tradingday: str, _symbol: str, **kwargs
+    ) -> typing.Union[None, DataStruct]:
+        key = self.dataKey(_symbol, _tradingday)
+        if not self.store.contains(key):
+            return None
+        return self.store.attach(key)
+
+    def fetchDataMany(
+            self, _tradingday: str, _symbols: typing.Iterable[str],
+            **kwargs
+    ) -> typing.Dict[str, typing.Union[None, DataStruct]]:
+        # data is read from local store, nothing to batch
+        return FetchAbstract.fetchDataMany(
+            self, _tradingday, _symbols, **kwargs
+        )
+
+    def fetchDayData(
+            self, _begin_day: str, _end_day: str,
+            _symbol: str, **kwargs
+    ) -> DataStruct:
+        """
+        get the data from _begin_day to _end_day(excluded)
+        """
+        ret: DataStruct = None
+        for day in self.fetchTradingDayList(_begin_day, _end_day):
+            data = self.fetchData(day, _symbol)
+            if data is None:
+                continue
+            if ret is None:
+                ret = data.clone()
+            else:
+                ret.addColumns(dict(
+                    (k, data[k]) for k in data.getColumnNames()
+                ))
+        return ret
@@ -4,10 +4,12 @@ from ParadoxTrading.Fetch.ChineseFutures.FetchDominantIndex import FetchDominant
 class FetchProductIndex(FetchDominantIndex):
     def __init__(
             self, _mongo_host='localhost', _psql_host='localhost',
-            _psql_user='', _psql_password='', _cache_path='cache'
+            _psql_user='', _psql_password='', _cache_path='cache',
+            _columnar=False
     ):
         super().__init__(
-            _mongo_host, _psql_host, _psql_user, _psql_password, _cache_path
+            _mongo_host, _psql_host, _psql_user, _psql_password, _cache_path,
+            _columnar
         )
 
         self.psql_dbname: str = 'ChineseFuturesProductIndex'
@@ -0,0 +1,91 @@
+import typing
+
+import numpy as np
+
+
+class ContractCalendar:
+    # type of registers without one, the same as RegisterInstrument.DOMINANT
+    DEFAULT_TYPE = 1
+
+    def __init__(
+            self, _tradingdays: typing.Sequence[str],
+            _products: typing.Sequence[str],
+            _types: typing.Sequence[int]
+    ):
+        """
+        symbols of products in each role (dominant, sub dominant ...)
+        on each tradingday, built once for the backtest range by
+        FetchAbstract.loadContractCalendar. Symbols are stored as codes
+        in a (type, product, tradingday) matrix, so a lookup is one
+        array index instead of database queries
+
+        :param _tradingdays: tradingdays covered
+        :param _products: products covered, lower case
+        :param _types: register types covered, like
+            RegisterInstrument.DOMINANT
+        """
+        self.day_index: typing.Dict[str, int] = dict(
+            (d, i) for i, d in enumerate(_tradingdays)
+        )
+        self.product_index: typing.Dict[str, int] = dict(
+            (p, i) for i, p in enumerate(_products)
+        )
+        self.type_index: typing.Dict[int, int] = dict(
+            (t, i) for i, t in enumerate(_types)
+        )
+
+        # code 0 is None
+        self.symbols: typing.List[typing.Union[None, str]] = [None]
+        self.symbol_code: typing.Dict[str, int] = {}
+        self.matrix: np.ndarray = np.zeros((
+            len(self.type_index), len(self.product_index),
+            len(self.day_index)
+        ), dtype=np.int32)
+
+    def setSymbol(
+            self, _tradingday: str, _product: str, _type: int,
+            _symbol: typing.Union[None, str]
+    ):
+        """
+        set the symbol of product in _type role on tradingday
+
+        :param _tradingday:
+        :param _product:
+        :param _type:
+        :param _symbol: None if not available
+        :return:
+        """
+        code = 0
+        if _symbol is not None:
+            try:
+                code = self.symbol_code[_symbol]
+            except KeyError:
+                code = self.symbol_code[_symbol] = len(self.symbols)
+                self.symbols.append(_symbol)
+        self.matrix[
+            self.type_index[_type], self.product_index[_product],
+            self.day_index[_tradingday]
+        ] = code
+
+    def getSymbol(
+            self, _tradingday: str, _product: str, _type: int
+    ) -> typing.Union[None, str]:
+        """
+        get the symbol of product in _type role on tradingday,
+        raise KeyError if it is not covered by calendar
+
+        :param _tradingday:
+        :param _product:
+        :param _type:
+        :return: None if not available
+        """
+        return self.symbols[self.matrix[
+            self.type_index[_type], self.product_index[_product],
+            self.day_index[_tradingday]
+        ]]
+
+    def __repr__(self) -> str:
+        return 'ContractCalendar: {} days, {} products, {} types'.format(
+            len(self.day_index), len(self.product_index),
+            len(self.type_index)
+        )
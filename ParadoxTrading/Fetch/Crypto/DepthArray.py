@@ -0,0 +1,93 @@
+import typing
+
+import numpy as np
+
+from ParadoxTrading.Utils import DataStruct
+
+DEPTH_LEVEL = 10
+# (price key, amount key) of each level in the flat layout
+DEPTH_KEYS: typing.Dict[str, typing.List[typing.Tuple[str, str]]] = dict(
+    (side, [
+        ('{}price{}'.format(side, i), '{}amount{}'.format(side, i))
+        for i in range(DEPTH_LEVEL)
+    ]) for side in ('ask', 'bid')
+)
+# columns of the array layout, each ask or bid is a (levels x 2) array
+# of price and amount
+DEPTH_ARRAY_COLUMNS: typing.List[str] = ['ask', 'bid', 'datetime']
+
+
+def depthToArray(_data: DataStruct) -> DataStruct:
+    """
+    turn depth data from the flat layout (askprice0, askamount0, ...)
+    into the array layout, missing levels are nan
+
+    :param _data: flat depth data
+    :return: datastruct of DEPTH_ARRAY_COLUMNS
+    """
+    flat = np.column_stack([
+        np.asarray(_data[k], dtype='float64')
+        for side in ('ask', 'bid')
+        for keys in DEPTH_KEYS[side] for k in keys
+    ]) if len(_data) else np.empty((0, 4 * DEPTH_LEVEL))
+    depth = flat.reshape(len(_data), 2, DEPTH_LEVEL, 2)
+
+    ret = DataStruct(DEPTH_ARRAY_COLUMNS, _data.index_name)
+    ret.addColumns({
+        'ask': list(depth[:, 0]),
+        'bid': list(depth[:, 1]),
+        _data.index_name: list(_data.index()),
+    })
+    return ret
+
+
+def getDepthArray(
+        _data: DataStruct, _side: str, _index: int = 0
+) -> np.ndarray:
+    """
+    (levels x 2) array of price and amount of one side,
+    from data of either layout
+
+    :param _data:
+    :param _side: 'ask' or 'bid'
+    :param _index: row of data
+    :return:
+    """
+    try:
+        return _data[_side][_index]
+    except KeyError:
+        return np.array([
+            [_data[p][_index], _data[a][_index]]
+            for p, a in DEPTH_KEYS[_side]
+        ], dtype='float64')
+
+
+def depthVWAP(_depth: np.ndarray, _amount: float) -> float:
+    """
+    average price to fill _amount by walking the levels from the best,
+    the part beyond the last level is filled by the last price.
+    Levels after the first missing (nan) one are ignored
+
+    :param _depth: (levels x 2) array of price and amount
+    :param _amount: amount to fill
+    :return:
+    """
+    # numpy methods on the small arrays, less overhead than functions
+    cum_amounts = _depth[:, 1].cumsum()
+    if cum_amounts[-1] != cum_amounts[-1] or \
+            _depth[-1, 0] != _depth[-1, 0]:  # nan, levels are missing
+        missing = np.isnan(_depth).any(axis=1)
+        _depth = _depth[:missing.argmax()]
+        if not len(_depth):
+            raise Exception('depth is empty')
+        cum_amounts = _depth[:, 1].cumsum()
+
+    # the level where the filled amount reaches _amount
+    i = min(int(cum_amounts.searchsorted(_amount)), len(cum_amounts) - 1)
+    if i:
+        turnover = float(_depth[:i, 0] @ _depth[:i, 1])
+        rest = _amount - cum_amounts[i - 1]
+    else:
+        turnover = 0.0
+        rest = _amount
+    return (turnover + rest * _depth[i, 0]) / _amount
@@ -1,4 +1,5 @@
 import json
+import threading
 import typing
 
 import arrow
@@ -52,8 +53,14 @@ class RegisterSymbol(RegisterAbstract):
 class FetchBase(FetchAbstract):
     def __init__(
             self, _psql_host='localhost', _psql_dbname='data',
-            _psql_user='', _psql_password='', _cache_path='cache'
+            _psql_user='', _psql_password='', _cache_path='cache',
+            _columnar=False
     ):
+        """
+
+        :param _columnar: if True, numeric columns of fetched data will be
+            stored as typed numpy arrays, see self.dtypes
+        """
         super().__init__()
         self.register_type = RegisterSymbol
 
@@ -67,27 +74,52 @@ class FetchBase(FetchAbstract):
         self.cache: Cache = Cache(_cache_path)
         self.market_key: str = 'crypto_{}_{}'
 
-        self._psql_con: psycopg2.extensions.connection = None
-        self._psql_cur: psycopg2.extensions.cursor = None
+        # psql connection and cursor of each thread
+        self._psql_local: threading.local = threading.local()
 
         self.columns: typing.List[str] = []
+        # map numeric column to numpy dtype, used if columnar
+        self.columnar: bool = _columnar
+        self.dtypes: typing.Dict[str, str] = {}
+
+    def cacheKey(self) -> str:
+        return '{}_{}_{}_{}'.format(
+            type(self).__name__, self.psql_host, self.psql_dbname,
+            self.columnar
+        )
+
+    def _set_storage(
+            self, _data: typing.Union[None, DataStruct]
+    ) -> typing.Union[None, DataStruct]:
+        """
+        turn data into the storage mode requested by self.columnar
+        """
+        if _data is None:
+            return None
+        if self.columnar:
+            if not _data.dtypes:
+                _data.setDtypes(self.dtypes)
+        elif _data.dtypes:
+            _data.setDtypes(dict((k, None) for k in _data.dtypes))
+        return _data
 
     def _get_psql_con_cur(self) -> typing.Tuple[
         psycopg2.extensions.connection, psycopg2.extensions.cursor
     ]:
-        if not self._psql_con:
-            self._psql_con: psycopg2.extensions.connection = \
-                psycopg2.connect(
-                    dbname=self.psql_dbname,
-                    host=self.psql_host,
-                    user=self.psql_user,
-                    password=self.psql_password,
-                )
-        if not self._psql_cur:
-            self._psql_cur: psycopg2.extensions.cursor = \
-                self._psql_con.cursor()
-
-        return self._psql_con, self._psql_cur
+        # cursor can not be shared between threads, so each thread
+        # has its own connection and cursor
+        local = self._psql_local
+        if getattr(local, 'con', None) is None:
+            local.con = psycopg2.connect(
+                dbname=self.psql_dbname,
+                host=self.psql_host,
+                user=self.psql_user,
+                password=self.psql_password,
+            )
+        if getattr(local, 'cur', None) is None:
+            local.cur = local.con.cursor()
+
+        return local.con, local.cur
 
     def fetchSymbol(
             self, _tradingday: str, _exname: str = None, _symbol: str = None
@@ -107,7 +139,7 @@ class FetchBase(FetchAbstract):
         key = self.market_key.format(table_name, _tradingday)
         if _cache:
             try:
-                return self.cache[key]
+                return self._set_storage(self.cache[key])
             except KeyError:
                 pass
 
@@ -123,7 +155,9 @@ class FetchBase(FetchAbstract):
         )
         data = list(cur.fetchall())
         if len(data):
-            data = DataStruct(self.columns, _index, data)
+            data = self._set_storage(
+                DataStruct(self.columns, _index, data)
+            )
         else:
             data = None
 
@@ -147,4 +181,4 @@ class FetchBase(FetchAbstract):
         )
         data = list(cur.fetchall())
 
-        return DataStruct(self.columns, _index, data)
+        return self._set_storage(DataStruct(self.columns, _index, data))
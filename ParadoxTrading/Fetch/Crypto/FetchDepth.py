@@ -1,26 +1,56 @@
 import typing
 
+from ParadoxTrading.Fetch.Crypto.DepthArray import DEPTH_KEYS, \
+    depthToArray
 from ParadoxTrading.Fetch.Crypto.FetchBase import FetchBase
+from ParadoxTrading.Utils import DataStruct
 
 
 class FetchDepth(FetchBase):
 
     def __init__(
             self, _psql_host='localhost', _psql_dbname='data',
-            _psql_user='', _psql_password='', _cache_path='cache'
+            _psql_user='', _psql_password='', _cache_path='cache',
+            _columnar=False, _depth_array=False
     ):
+        """
+
+        :param _depth_array: if True, fetched data has the array layout
+            of DepthArray, columns ask, bid and datetime
+        """
         super().__init__(
             _psql_host=_psql_host, _psql_dbname=_psql_dbname,
             _psql_user=_psql_user, _psql_password=_psql_password,
-            _cache_path=_cache_path
+            _cache_path=_cache_path, _columnar=_columnar
         )
 
         self.table_key: str = '{}_rs_{}_depth'
         self.columns: typing.List[str] = []
-        for i in range(10):
-            self.columns.append('askprice{}'.format(i))
-            self.columns.append('askamount{}'.format(i))
-        for i in range(10):
-            self.columns.append('bidprice{}'.format(i))
-            self.columns.append('bidamount{}'.format(i))
+        for side in ('ask', 'bid'):
+            for price_key, amount_key in DEPTH_KEYS[side]:
+                self.columns.append(price_key)
+                self.columns.append(amount_key)
         self.columns.append('datetime')
+        self.dtypes = dict((k, 'float64') for k in self.columns[:-1])
+        self.depth_array: bool = _depth_array
+
+    def cacheKey(self) -> str:
+        return '{}_{}'.format(super().cacheKey(), self.depth_array)
+
+    def fetchData(
+            self, _tradingday: str, _symbol: typing.Tuple[str, str],
+            _cache=True, _index: str = 'datetime'
+    ) -> typing.Union[None, DataStruct]:
+        data = super().fetchData(_tradingday, _symbol, _cache, _index)
+        if self.depth_array and data is not None:
+            return depthToArray(data)
+        return data
+
+    def fetchDayData(
+            self, _begin_day: str, _end_day: str,
+            _symbol: str, _index: str = 'datetime'
+    ) -> DataStruct:
+        data = super().fetchDayData(_begin_day, _end_day, _symbol, _index)
+        if self.depth_array:
+            return depthToArray(data)
+        return data
@@ -1,3 +1,5 @@
+from .DepthArray import DEPTH_ARRAY_COLUMNS, DEPTH_KEYS, DEPTH_LEVEL, \
+    depthToArray, depthVWAP, getDepthArray
 from .FetchBase import RegisterSymbol
 from .FetchDepth import FetchDepth
 from .FetchTicker import FetchTicker
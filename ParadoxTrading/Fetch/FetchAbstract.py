@@ -1,5 +1,7 @@
 import typing
+from datetime import datetime, timedelta
 
+from ParadoxTrading.Fetch.ContractCalendar import ContractCalendar
 from ParadoxTrading.Utils import DataStruct
 
 
@@ -52,6 +54,37 @@ class RegisterAbstract:
 class FetchAbstract:
     def __init__(self):
         self.register_type: RegisterAbstract = None
+        # fetchSymbol is served from it if loaded
+        self.contract_calendar: ContractCalendar = None
+
+    def cacheKey(self) -> str:
+        """
+        identity of the data returned by fetchData, fetchers with the
+        same key return the same data, so FetchShared shares their days.
+        Default the class name, fetcher with config should override it
+
+        :return:
+        """
+        return type(self).__name__
+
+    def fetchTradingDayList(
+            self, _begin_day: str, _end_day: str
+    ) -> typing.List[str]:
+        """
+        get all the tradingdays from _begin_day to _end_day(excluded),
+        default every calendar day is a tradingday
+
+        :param _begin_day: like '20170123'
+        :param _end_day: like '20170131'
+        :return: sorted list of tradingday
+        """
+        ret = []
+        day = datetime.strptime(_begin_day, '%Y%m%d')
+        end_day = datetime.strptime(_end_day, '%Y%m%d')
+        while day < end_day:
+            ret.append(day.strftime('%Y%m%d'))
+            day += timedelta(days=1)
+        return ret
 
     def fetchSymbol(
             self, _tradingday: str, **kwargs
@@ -67,6 +100,67 @@ class FetchAbstract:
         """
         raise NotImplementedError('fetchSymbol')
 
+    def loadContractCalendar(
+            self, _tradingdays: typing.Sequence[str],
+            _registers: typing.Iterable[RegisterAbstract]
+    ) -> typing.Union[None, ContractCalendar]:
+        """
+        resolve symbols of registers on all tradingdays of backtest
+        once, then fetchSymbol is served from the calendar. Only for
+        registers choosing symbol by product and type, like
+        ChineseFutures, others are ignored
+
+        :param _tradingdays: sorted tradingdays, like the return of
+            fetchTradingDayList
+        :param _registers: market registers of backtest
+        :return: None if no register has product
+        """
+        products = set()
+        types = set()
+        for register in _registers:
+            kwargs = register.toKwargs()
+            if '_product' not in kwargs:
+                continue
+            products.add(kwargs['_product'].lower())
+            types.add(kwargs.get('_type', ContractCalendar.DEFAULT_TYPE))
+        if not products:
+            return None
+
+        calendar = ContractCalendar(
+            _tradingdays, sorted(products), sorted(types)
+        )
+        # fill by fetcher itself, not the old calendar
+        self.contract_calendar = None
+        self._fill_contract_calendar(calendar)
+        self.contract_calendar = calendar
+        return calendar
+
+    def _fill_contract_calendar(self, _calendar: ContractCalendar):
+        """
+        default resolve each one by fetchSymbol, fetcher can override it
+        to load them in fewer queries
+        """
+        for tradingday in _calendar.day_index:
+            for product in _calendar.product_index:
+                for _type in _calendar.type_index:
+                    _calendar.setSymbol(
+                        tradingday, product, _type, self.fetchSymbol(
+                            tradingday, _product=product, _type=_type
+                        )
+                    )
+
+    def _get_calendar_symbol(
+            self, _tradingday: str, _product: str,
+            _type: int = ContractCalendar.DEFAULT_TYPE
+    ) -> typing.Union[None, str]:
+        """
+        get symbol from contract calendar, raise KeyError if
+        calendar is not loaded or it is not covered
+        """
+        if self.contract_calendar is None:
+            raise KeyError(_tradingday)
+        return self.contract_calendar.getSymbol(_tradingday, _product, _type)
+
     def fetchData(
             self, _tradingday: str, _symbol: str, **kwargs
     ) -> typing.Union[None, DataStruct]:
@@ -80,6 +174,22 @@ class FetchAbstract:
         """
         raise NotImplementedError('fetchData')
 
+    def fetchDataMany(
+            self, _tradingday: str, _symbols: typing.Iterable[str], **kwargs
+    ) -> typing.Dict[str, typing.Union[None, DataStruct]]:
+        """
+        get one day data of several symbols, fetcher can override it
+        to fetch them in one query
+
+        :param _tradingday:
+        :param _symbols:
+        :param kwargs: passed to fetchData
+        :return: map symbol to its data, None if not available
+        """
+        return dict(
+            (s, self.fetchData(_tradingday, s, **kwargs)) for s in _symbols
+        )
+
     def fetchDayData(
             self, _begin_day: str, _end_day: str, _symbol: str, **kwargs
     ) -> DataStruct:
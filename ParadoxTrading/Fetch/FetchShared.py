@@ -0,0 +1,263 @@
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import typing
+import uuid
+
+import numpy as np
+
+from ParadoxTrading.Fetch.ContractCalendar import ContractCalendar
+from ParadoxTrading.Fetch.FetchAbstract import FetchAbstract, \
+    RegisterAbstract
+from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils.DataStruct import TypedColumn
+
+
+def _default_store_path() -> str:
+    # /dev/shm is in memory on linux
+    if os.path.isdir('/dev/shm'):
+        return '/dev/shm/ParadoxTrading'
+    return os.path.join(tempfile.gettempdir(), 'ParadoxTrading')
+
+
+class SharedMarketStore:
+    # dir size is checked again after this part of _max_bytes is published
+    CHECK_RATIO = 16
+
+    def __init__(self, _path: str = None, _max_bytes: int = None):
+        """
+        market data stored as files, one dir for each key. Typed columns
+        of datastruct are saved as .npy and attached by mmap read-only,
+        so all processes share the same pages in page cache. Other columns
+        are pickled in meta and loaded by each process.
+
+        !!! WARN !!! list columns, usually the index and other datetime
+        or str columns, are not shared, each worker holds its own copy,
+        so their memory still grows with the number of workers
+
+        :param _path: root dir, default in /dev/shm
+        :param _max_bytes: if the files are larger than it, the least
+            recently attached keys are removed. None means no limit
+        """
+        self.path: str = _path if _path is not None else _default_store_path()
+        os.makedirs(self.path, exist_ok=True)
+
+        self.max_bytes: int = _max_bytes
+        # bytes published by this process since the last check
+        self.unchecked_bytes: int = 0
+        if self.max_bytes is not None:
+            self.evict()
+
+    def _key_path(self, _key: str) -> str:
+        return os.path.join(self.path, _key)
+
+    def contains(self, _key: str) -> bool:
+        return os.path.isdir(self._key_path(_key))
+
+    def publish(self, _key: str, _data: typing.Union[None, DataStruct]):
+        """
+        store data of _key, None is stored too, so it is not fetched again.
+        Files are written into a tmp dir and renamed, so other processes
+        never see a half written one
+
+        :param _key:
+        :param _data:
+        :return:
+        """
+        if self.contains(_key):
+            return
+        tmp_path = os.path.join(self.path, '.tmp_{}'.format(uuid.uuid4().hex))
+        os.makedirs(tmp_path)
+
+        meta = None
+        if _data is not None:
+            keys = _data.getColumnNames()
+            meta = {
+                'keys': keys,
+                'index_name': _data.index_name,
+                'dtypes': dict(_data.dtypes),
+                'lists': {},
+            }
+            for i, k in enumerate(keys):
+                if k in _data.dtypes:
+                    np.save(
+                        os.path.join(tmp_path, '{}.npy'.format(i)),
+                        np.ascontiguousarray(_data[k])
+                    )
+                else:
+                    meta['lists'][k] = list(_data[k])
+        with open(os.path.join(tmp_path, 'meta.pkl'), 'wb') as f:
+            pickle.dump(meta, f)
+
+        try:
+            os.rename(tmp_path, self._key_path(_key))
+        except OSError:  # published by another process
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+
+        if self.max_bytes is not None:
+            self.unchecked_bytes += self._dir_bytes(self._key_path(_key))
+            if self.unchecked_bytes * self.CHECK_RATIO > self.max_bytes:
+                self.evict()
+
+    def attach(self, _key: str) -> typing.Union[None, DataStruct]:
+        """
+        load data of _key, typed columns are read-only mmap without copy.
+        They are copied when rows are added or by the first __setitem__
+        of the TypedColumn, numpy arrays got by datastruct[key] are
+        read-only. Raise FileNotFoundError if _key is evicted
+
+        :param _key:
+        :return:
+        """
+        key_path = self._key_path(_key)
+        with open(os.path.join(key_path, 'meta.pkl'), 'rb') as f:
+            meta = pickle.load(f)
+        if self.max_bytes is not None:
+            # mtime of dir is the last use, the oldest is evicted first
+            os.utime(key_path)
+        if meta is None:
+            return None
+
+        keys = meta['keys']
+        data = DataStruct(keys, meta['index_name'], _dtypes=meta['dtypes'])
+        for i, k in enumerate(keys):
+            if k in meta['dtypes']:
+                data.data[k] = TypedColumn.fromArray(np.load(
+                    os.path.join(key_path, '{}.npy'.format(i)),
+                    mmap_mode='r'
+                ))
+            else:
+                data.data[k] = meta['lists'][k]
+        return data
+
+    @staticmethod
+    def _dir_bytes(_path: str) -> int:
+        ret = 0
+        for entry in os.scandir(_path):
+            ret += entry.stat().st_size
+        return ret
+
+    def evict(self):
+        """
+        remove the least recently attached keys until the files are
+        not larger than max_bytes. Files attached by other processes
+        are only unlinked, their mmap is still valid
+        """
+        self.unchecked_bytes = 0
+        if self.max_bytes is None:
+            return
+        keys = []
+        total = 0
+        for entry in os.scandir(self.path):
+            if not entry.is_dir() or entry.name.startswith('.tmp_'):
+                continue
+            try:
+                size = self._dir_bytes(entry.path)
+                keys.append((entry.stat().st_mtime, size, entry.path))
+            except FileNotFoundError:  # evicted by another process
+                continue
+            total += size
+        keys.sort()
+        for _, size, path in keys:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """
+        remove all the stored data, call it at the end of a sweep
+        if the data is not used any more
+        """
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path, exist_ok=True)
+
+
+class FetchShared(FetchAbstract):
+    # default size limit of the store in /dev/shm
+    MAX_BYTES = 2 << 30
+
+    def __init__(
+            self, _fetcher: FetchAbstract, _store_path: str = None,
+            _max_bytes: typing.Union[None, int] = MAX_BYTES
+    ):
+        """
+        wrap a fetcher, and fetchData is served from SharedMarketStore.
+        The first process missing a day fetches it from _fetcher and
+        publishes it, then all processes attach the same files.
+        Use a columnar fetcher, only typed columns are shared.
+
+        other methods are the same as _fetcher
+
+        :param _fetcher: the fetcher to wrap
+        :param _store_path: root dir of SharedMarketStore
+        :param _max_bytes: size limit of SharedMarketStore, None means
+            no limit
+        """
+        super().__init__()
+        self.fetcher: FetchAbstract = _fetcher
+        self.register_type = _fetcher.register_type
+        self.store: SharedMarketStore = SharedMarketStore(
+            _store_path, _max_bytes
+        )
+
+    def __getattr__(self, _name: str):
+        # only called if not found in self, like fetchDominant
+        if _name == 'fetcher':
+            raise AttributeError(_name)
+        return getattr(self.fetcher, _name)
+
+    def cacheKey(self) -> str:
+        return self.fetcher.cacheKey()
+
+    def fetchTradingDayList(
+            self, _begin_day: str, _end_day: str
+    ) -> typing.List[str]:
+        return self.fetcher.fetchTradingDayList(_begin_day, _end_day)
+
+    def fetchSymbol(
+            self, _tradingday: str, **kwargs
+    ) -> typing.Union[None, str]:
+        return self.fetcher.fetchSymbol(_tradingday, **kwargs)
+
+    def loadContractCalendar(
+            self, _tradingdays: typing.Sequence[str],
+            _registers: typing.Iterable[RegisterAbstract]
+    ) -> typing.Union[None, ContractCalendar]:
+        # fetchSymbol is served by the wrapped fetcher
+        self.contract_calendar = self.fetcher.loadContractCalendar(
+            _tradingdays, _registers
+        )
+        return self.contract_calendar
+
+    def fetchData(
+            self, _tradingday: str, _symbol: str, **kwargs
+    ) -> typing.Union[None, DataStruct]:
+        # symbol may be a tuple, and the fetcher config is in cacheKey,
+        # so they are hashed into a valid dir name
+        symbol = _symbol.lower() if isinstance(_symbol, str) else _symbol
+        ident = '{}_{}'.format(self.fetcher.cacheKey(), symbol)
+        for k in sorted(kwargs.keys()):
+            ident += '_{}{}'.format(k, kwargs[k])
+        key = '{}_{}_{}'.format(
+            type(self.fetcher).__name__, _tradingday,
+            hashlib.md5(ident.encode()).hexdigest()
+        )
+        if not self.store.contains(key):
+            self.store.publish(
+                key, self.fetcher.fetchData(_tradingday, _symbol, **kwargs)
+            )
+        try:
+            return self.store.attach(key)
+        except FileNotFoundError:  # evicted by another process
+            return self.fetcher.fetchData(_tradingday, _symbol, **kwargs)
+
+    def fetchDayData(
+            self, _begin_day: str, _end_day: str, _symbol: str, **kwargs
+    ) -> DataStruct:
+        return self.fetcher.fetchDayData(
+            _begin_day, _end_day, _symbol, **kwargs
+        )
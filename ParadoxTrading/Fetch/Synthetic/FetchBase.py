@@ -0,0 +1,343 @@
+import re
+import threading
+import typing
+from binascii import crc32
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ParadoxTrading.Fetch import FetchAbstract
+from ParadoxTrading.Fetch.ChineseFutures.FetchBase import RegisterIndex, \
+    RegisterInstrument
+from ParadoxTrading.Utils import DataStruct
+
+
+class SyntheticInstrument:
+    def __init__(
+            self, _name: str,
+            _price: float = 3000.0,
+            _volatility: float = 0.2,
+            _drift: float = 0.0,
+            _tick_size: float = 1.0,
+            _volume: float = 10.0,
+    ):
+        """
+        config of one synthetic instrument, its price follows GBM
+
+        :param _name: product of futures like 'rb',
+            or symbol of crypto like 'BTC_USDT'
+        :param _price: close price of FetchBase.EPOCH
+        :param _volatility: annualized volatility
+        :param _drift: annualized drift
+        :param _tick_size: prices are rounded to it
+        :param _volume: mean volume of each tick
+        """
+        self.name: str = _name
+        self.price: float = _price
+        self.volatility: float = _volatility
+        self.drift: float = _drift
+        self.tick_size: float = _tick_size
+        self.volume: float = _volume
+
+
+class FetchBase(FetchAbstract):
+    """
+    generate deterministic market data instead of reading databases,
+    used to benchmark and test engines.
+
+    Each weekday is a tradingday. The close of each day is a GBM path
+    of daily returns from EPOCH (forward and backward), and the ticks of
+    a day are a brownian bridge from the last close to it, so the same
+    day and symbol always get the same data, in any order.
+    Subclass turns ticks into columns.
+    """
+
+    EPOCH = '20180102'
+    TRADING_DAYS = 252
+    # day sessions of chinese futures
+    FUTURES_SESSIONS = (
+        ('09:00:00', '10:15:00'),
+        ('10:30:00', '11:30:00'),
+        ('13:30:00', '15:00:00'),
+    )
+
+    def __init__(
+            self,
+            _instruments: typing.Iterable[SyntheticInstrument] = None,
+            _sessions: typing.Sequence[typing.Tuple[str, str]] = None,
+            _tick_interval: float = 0.5,
+            _seed: int = 0,
+            _register_type: type = RegisterInstrument,
+            _columnar: bool = False,
+    ):
+        """
+
+        :param _instruments: default rb, hc, cu and ru
+        :param _sessions: (begin, end) time of each session,
+            default FUTURES_SESSIONS
+        :param _tick_interval: seconds between ticks
+        :param _seed: change it to get another market
+        :param _register_type: RegisterInstrument or RegisterIndex
+        :param _columnar: if True, numeric columns are typed numpy arrays
+        """
+        super().__init__()
+        self.register_type = _register_type
+
+        if _instruments is None:
+            _instruments = [
+                SyntheticInstrument('rb', 3500.0),
+                SyntheticInstrument('hc', 3600.0),
+                SyntheticInstrument('cu', 50000.0, _tick_size=10.0),
+                SyntheticInstrument('ru', 13000.0, 0.25, _tick_size=5.0),
+            ]
+        self.instrument_dict: typing.Dict[str, SyntheticInstrument] = dict(
+            (d.name, d) for d in _instruments
+        )
+        if _sessions is None:
+            _sessions = self.FUTURES_SESSIONS
+        self.sessions: typing.List[typing.Tuple[timedelta, timedelta]] = [
+            (self._to_timedelta(b), self._to_timedelta(e))
+            for b, e in _sessions
+        ]
+        self.tick_interval: float = _tick_interval
+        self.seed: int = _seed
+
+        self.columns: typing.List[str] = []
+        self.dtypes: typing.Dict[str, str] = {}
+        self.index: str = None
+        self.columnar: bool = _columnar
+
+        # tick offsets in seconds from midnight, same for each day
+        self.offsets: np.ndarray = np.concatenate([
+            np.arange(
+                b.total_seconds(), e.total_seconds(), _tick_interval
+            ) for b, e in self.sessions
+        ])
+        session_seconds = sum(
+            (e - b).total_seconds() for b, e in self.sessions
+        )
+        # variance of one tick, as part of one year
+        self.tick_time: float = _tick_interval / session_seconds / \
+            self.TRADING_DAYS
+
+        # map (name, direction) to the cumsum of daily log returns
+        # after EPOCH (1) or before EPOCH (-1)
+        self.walk_dict: typing.Dict[typing.Tuple[str, int], np.ndarray] = {}
+        self.cache: typing.Dict[typing.Tuple[str, str], DataStruct] = {}
+        self.lock: threading.Lock = threading.Lock()
+
+    def cacheKey(self) -> str:
+        return '{}_{}_{}_{}_{}_{}_{}'.format(
+            type(self).__name__, self.seed, self.tick_interval,
+            self.sessions, self.register_type.__name__, self.columnar,
+            sorted(
+                tuple(sorted(vars(d).items()))
+                for d in self.instrument_dict.values()
+            )
+        )
+
+    @staticmethod
+    def _to_timedelta(_time: str) -> timedelta:
+        t = datetime.strptime(_time, '%H:%M:%S')
+        return timedelta(hours=t.hour, minutes=t.minute, seconds=t.second)
+
+    def _seed_of(self, *_keys) -> int:
+        return crc32('_'.join(
+            str(k) for k in (self.seed,) + _keys
+        ).encode())
+
+    def isTradingDay(self, _tradingday: str) -> bool:
+        return bool(np.is_busday(self._to_date(_tradingday)))
+
+    @staticmethod
+    def _to_date(_tradingday: str) -> np.datetime64:
+        return np.datetime64('{}-{}-{}'.format(
+            _tradingday[:4], _tradingday[4:6], _tradingday[6:]
+        ))
+
+    def fetchTradingDayList(
+            self, _begin_day: str, _end_day: str
+    ) -> typing.List[str]:
+        """
+        weekdays from _begin_day to _end_day(excluded)
+        """
+        days = np.arange(
+            self._to_date(_begin_day), self._to_date(_end_day),
+            dtype='datetime64[D]'
+        )
+        return [
+            str(d).replace('-', '') for d in days[np.is_busday(days)]
+        ]
+
+    def instrumentLastTradingDay(
+            self, _instrument: str, _tradingday: str
+    ) -> str:
+        day = np.busday_offset(
+            self._to_date(_tradingday), -1, roll='backward'
+        )
+        return str(day).replace('-', '')
+
+    def fetchSymbol(
+            self, _tradingday: str, _product: str = None,
+            _type: int = RegisterInstrument.DOMINANT,
+    ) -> typing.Union[None, str]:
+        """
+        the dominant is the contract two months later, so it rolls
+        each month. Return product itself if register type is index
+        """
+        assert _product is not None
+        try:
+            return self._get_calendar_symbol(_tradingday, _product, _type)
+        except KeyError:
+            pass
+        if _product not in self.instrument_dict:
+            return None
+        if not self.isTradingDay(_tradingday):
+            return None
+        if self.register_type is RegisterIndex:
+            return _product
+        month = int(_tradingday[:4]) * 12 + int(_tradingday[4:6]) + 1
+        return '{}{:02d}{:02d}'.format(
+            _product, month // 12 % 100, month % 12 + 1
+        )
+
+    def _get_instrument(
+            self, _symbol: typing.Union[str, typing.Tuple[str, str]]
+    ) -> SyntheticInstrument:
+        if isinstance(_symbol, tuple):  # (exname, symbol) of crypto
+            name = _symbol[1]
+        else:  # instrument or product
+            name = re.match(r'^[^\d]*', _symbol).group()
+        return self.instrument_dict[name]
+
+    def _log_close(
+            self, _instrument: SyntheticInstrument, _idx: int
+    ) -> float:
+        """
+        log close price of the _idx-th tradingday from EPOCH, negative
+        if before it. The walk is regenerated longer by the same seed
+        when needed, so it does not depend on fetch order
+        """
+        if _idx == 0:
+            return np.log(_instrument.price)
+        direction = 1 if _idx > 0 else -1
+        num = abs(_idx)
+        key = (_instrument.name, direction)
+        with self.lock:
+            walk = self.walk_dict.get(key)
+            if walk is None or len(walk) < num:
+                num = max(num, 2 * (0 if walk is None else len(walk)), 256)
+                rand = np.random.RandomState(self._seed_of(*key))
+                day_time = 1.0 / self.TRADING_DAYS
+                walk = np.cumsum(rand.normal(
+                    (_instrument.drift - 0.5 * _instrument.volatility ** 2)
+                    * day_time,
+                    _instrument.volatility * np.sqrt(day_time), num
+                ))
+                self.walk_dict[key] = walk
+        return np.log(_instrument.price) + direction * walk[abs(_idx) - 1]
+
+    def _gen_ticks(
+            self, _tradingday: str, _instrument: SyntheticInstrument
+    ) -> typing.Tuple[np.ndarray, np.ndarray, float, np.random.RandomState]:
+        """
+        ticks of one day
+
+        :return: (happentime, price, preclose, random state)
+        """
+        idx = int(np.busday_count(
+            self._to_date(self.EPOCH), self._to_date(_tradingday)
+        ))
+        pre_close = self._log_close(_instrument, idx - 1)
+        close = self._log_close(_instrument, idx)
+
+        rand = np.random.RandomState(self._seed_of(
+            _instrument.name, _tradingday
+        ))
+        num = len(self.offsets)
+        walk = np.cumsum(rand.normal(
+            0.0, _instrument.volatility * np.sqrt(self.tick_time), num
+        ))
+        # brownian bridge ends at close
+        walk -= np.arange(1, num + 1) / num * (walk[-1] - (close - pre_close))
+        tick_size = _instrument.tick_size
+        price = np.round(np.exp(pre_close + walk) / tick_size) * tick_size
+
+        happentime = self._to_date(_tradingday).astype('datetime64[us]') + \
+            (self.offsets * 1e6).astype('timedelta64[us]')
+        return happentime, price, float(np.exp(pre_close)), rand
+
+    def _gen_columns(
+            self, _tradingday: str,
+            _symbol: typing.Union[str, typing.Tuple[str, str]],
+            _instrument: SyntheticInstrument
+    ) -> typing.Dict[str, typing.Union[list, np.ndarray]]:
+        raise NotImplementedError('_gen_columns')
+
+    def _to_struct(
+            self, _columns: typing.Dict[str, typing.Union[list, np.ndarray]]
+    ) -> DataStruct:
+        dtypes = self.dtypes if self.columnar else None
+        data = DataStruct(self.columns, self.index, _dtypes=dtypes)
+        columns = {}
+        for k in self.columns:
+            v = _columns[k]
+            if isinstance(v, np.ndarray):
+                if v.dtype.kind == 'M':
+                    v = v.astype(datetime)
+                if not self.columnar or k not in self.dtypes:
+                    v = v.tolist()
+            columns[k] = v
+        data.addColumns(columns)
+        return data
+
+    def fetchData(
+            self, _tradingday: str,
+            _symbol: typing.Union[str, typing.Tuple[str, str]],
+            _cache: bool = True
+    ) -> typing.Union[None, DataStruct]:
+        """
+        :param _tradingday:
+        :param _symbol: instrument like 'rb1801', product like 'rb'
+            or (exname, symbol) of crypto
+        :param _cache: keep generated data in memory
+        :return: None if not a tradingday
+        """
+        key = (_tradingday, _symbol)
+        if _cache:
+            try:
+                return self.cache[key]
+            except KeyError:
+                pass
+
+        data = None
+        if self.isTradingDay(_tradingday):
+            data = self._to_struct(self._gen_columns(
+                _tradingday, _symbol, self._get_instrument(_symbol)
+            ))
+
+        if _cache:
+            self.cache[key] = data
+        return data
+
+    def fetchDayData(
+            self, _begin_day: str, _end_day: str,
+            _symbol: typing.Union[str, typing.Tuple[str, str]], **kwargs
+    ) -> DataStruct:
+        """
+        get the data from _begin_day to _end_day(excluded)
+        """
+        instrument = self._get_instrument(_symbol)
+        days = self.fetchTradingDayList(_begin_day, _end_day)
+        day_columns = [
+            self._gen_columns(d, _symbol, instrument) for d in days
+        ]
+        if not day_columns:
+            return DataStruct(self.columns, self.index)
+        columns = {}
+        for k in self.columns:
+            if isinstance(day_columns[0][k], np.ndarray):
+                columns[k] = np.concatenate([c[k] for c in day_columns])
+            else:
+                columns[k] = [v for c in day_columns for v in c[k]]
+        return self._to_struct(columns)
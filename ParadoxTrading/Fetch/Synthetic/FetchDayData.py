@@ -0,0 +1,59 @@
+import typing
+
+import numpy as np
+
+from ParadoxTrading.Fetch.ChineseFutures.FetchBase import RegisterInstrument
+from ParadoxTrading.Fetch.Synthetic.FetchBase import FetchBase, \
+    SyntheticInstrument
+
+
+class FetchDayData(FetchBase):
+    """
+    synthetic day bars with the columns of
+    ChineseFutures.FetchInstrumentDayData, aggregated from the ticks.
+    Ticks are sparse by default to be fast, close is the same as
+    other fetchers, but open, high and low are not
+    """
+
+    def __init__(
+            self,
+            _instruments: typing.Iterable[SyntheticInstrument] = None,
+            _sessions: typing.Sequence[typing.Tuple[str, str]] = None,
+            _tick_interval: float = 60.0,
+            _seed: int = 0,
+            _register_type: type = RegisterInstrument,
+            _columnar: bool = False,
+    ):
+        super().__init__(
+            _instruments, _sessions, _tick_interval, _seed,
+            _register_type, _columnar
+        )
+
+        self.index = 'tradingday'
+        self.columns = [
+            'tradingday',
+            'openprice', 'highprice', 'lowprice', 'closeprice',
+            'settlementprice', 'volume', 'openinterest',
+            'presettlementprice',
+        ]
+        self.dtypes = dict((k, 'float64') for k in self.columns[1:])
+
+    def _gen_columns(
+            self, _tradingday: str, _symbol: str,
+            _instrument: SyntheticInstrument
+    ) -> typing.Dict[str, typing.Union[list, np.ndarray]]:
+        happentime, price, pre_close, rand = self._gen_ticks(
+            _tradingday, _instrument
+        )
+        volume = rand.poisson(_instrument.volume, len(price))
+        return {
+            'tradingday': [_tradingday],
+            'openprice': price[:1],
+            'highprice': np.array([price.max()]),
+            'lowprice': np.array([price.min()]),
+            'closeprice': price[-1:],
+            'settlementprice': price[-1:],
+            'volume': np.array([volume.sum()], dtype='float64'),
+            'openinterest': np.array([1e5 + rand.randint(-500, 501)]),
+            'presettlementprice': np.array([pre_close]),
+        }
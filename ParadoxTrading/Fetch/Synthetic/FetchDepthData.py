@@ -0,0 +1,98 @@
+import typing
+
+import numpy as np
+
+from ParadoxTrading.Fetch.Crypto.DepthArray import DEPTH_ARRAY_COLUMNS, \
+    DEPTH_KEYS, DEPTH_LEVEL
+from ParadoxTrading.Fetch.Crypto.FetchBase import RegisterSymbol
+from ParadoxTrading.Fetch.Synthetic.FetchBase import FetchBase, \
+    SyntheticInstrument
+
+
+class FetchDepthData(FetchBase):
+    """
+    synthetic 10 levels depth with the columns of Crypto.FetchDepth,
+    or the array layout of Crypto.DepthArray. Market opens all day,
+    one snapshot every 5 seconds by default
+    """
+
+    def __init__(
+            self,
+            _instruments: typing.Iterable[SyntheticInstrument] = None,
+            _sessions: typing.Sequence[typing.Tuple[str, str]] = (
+                    ('00:00:00', '23:59:59'),
+            ),
+            _tick_interval: float = 5.0,
+            _seed: int = 0,
+            _columnar: bool = False,
+            _depth_array: bool = False,
+    ):
+        if _instruments is None:
+            _instruments = [SyntheticInstrument(
+                'BTC_USDT', 6000.0, 0.8, _tick_size=0.01, _volume=1.0
+            )]
+        super().__init__(
+            _instruments, _sessions, _tick_interval, _seed,
+            RegisterSymbol, _columnar
+        )
+
+        self.index = 'datetime'
+        self.depth_array: bool = _depth_array
+        if _depth_array:
+            self.columns = list(DEPTH_ARRAY_COLUMNS)
+            self.dtypes = {}
+        else:
+            self.columns = []
+            for side in ('ask', 'bid'):
+                for price_key, amount_key in DEPTH_KEYS[side]:
+                    self.columns.append(price_key)
+                    self.columns.append(amount_key)
+            self.columns.append('datetime')
+            self.dtypes = dict((k, 'float64') for k in self.columns[:-1])
+
+    def cacheKey(self) -> str:
+        return '{}_{}'.format(super().cacheKey(), self.depth_array)
+
+    def fetchSymbol(
+            self, _tradingday: str, _exname: str = None, _symbol: str = None
+    ) -> typing.Tuple[str, str]:
+        assert _exname is not None
+        assert _symbol is not None
+
+        return (_exname, _symbol)
+
+    def _gen_columns(
+            self, _tradingday: str, _symbol: typing.Tuple[str, str],
+            _instrument: SyntheticInstrument
+    ) -> typing.Dict[str, typing.Union[list, np.ndarray]]:
+        happentime, price, pre_close, rand = self._gen_ticks(
+            _tradingday, _instrument
+        )
+        num = len(price)
+        tick_size = _instrument.tick_size
+        # each level is 1 to 5 ticks away from the previous one
+        ask_gap = np.cumsum(
+            rand.randint(1, 6, (DEPTH_LEVEL, num)), axis=0
+        )
+        bid_gap = np.cumsum(
+            rand.randint(1, 6, (DEPTH_LEVEL, num)), axis=0
+        )
+        ask_amount = rand.exponential(_instrument.volume, (DEPTH_LEVEL, num))
+        bid_amount = rand.exponential(_instrument.volume, (DEPTH_LEVEL, num))
+        ask_price = price + ask_gap * tick_size
+        bid_price = price - bid_gap * tick_size
+
+        ret = {'datetime': happentime}
+        if self.depth_array:
+            # (num x levels x 2), one array of each snapshot
+            ret['ask'] = list(np.stack([ask_price.T, ask_amount.T], axis=-1))
+            ret['bid'] = list(np.stack([bid_price.T, bid_amount.T], axis=-1))
+            return ret
+        for i in range(DEPTH_LEVEL):
+            ask_keys = DEPTH_KEYS['ask'][i]
+            bid_keys = DEPTH_KEYS['bid'][i]
+            ret[ask_keys[0]] = ask_price[i]
+            ret[ask_keys[1]] = ask_amount[i]
+            ret[bid_keys[0]] = bid_price[i]
+            ret[bid_keys[1]] = bid_amount[i]
+        return ret
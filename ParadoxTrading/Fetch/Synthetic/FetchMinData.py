@@ -0,0 +1,52 @@
+import typing
+
+import numpy as np
+
+from ParadoxTrading.Fetch.Synthetic.FetchBase import FetchBase, \
+    SyntheticInstrument
+
+
+class FetchMinData(FetchBase):
+    """
+    synthetic minute bars with the columns of
+    ChineseFutures.FetchInstrumentMinData, aggregated from the ticks
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.index = 'datetime'
+        self.columns = [
+            'tradingday', 'datetime',
+            'openprice', 'highprice', 'lowprice', 'closeprice',
+            'volume', 'openinterest',
+        ]
+        self.dtypes = dict((k, 'float64') for k in self.columns[2:])
+
+        # first tick of each minute
+        minutes = (self.offsets // 60).astype('int64')
+        self.bar_begin: np.ndarray = np.flatnonzero(
+            np.diff(minutes, prepend=-1)
+        )
+
+    def _gen_columns(
+            self, _tradingday: str, _symbol: str,
+            _instrument: SyntheticInstrument
+    ) -> typing.Dict[str, typing.Union[list, np.ndarray]]:
+        happentime, price, pre_close, rand = self._gen_ticks(
+            _tradingday, _instrument
+        )
+        begin = self.bar_begin
+        end = np.append(begin[1:], len(price)) - 1
+        num = len(begin)
+        volume = rand.poisson(_instrument.volume, len(price))
+        return {
+            'tradingday': [_tradingday] * num,
+            'datetime': happentime[begin].astype('datetime64[m]'),
+            'openprice': price[begin],
+            'highprice': np.maximum.reduceat(price, begin),
+            'lowprice': np.minimum.reduceat(price, begin),
+            'closeprice': price[end],
+            'volume': np.add.reduceat(volume, begin).astype('float64'),
+            'openinterest': 1e5 + np.cumsum(rand.randint(-50, 51, num)),
+        }
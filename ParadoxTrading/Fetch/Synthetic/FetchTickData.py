@@ -0,0 +1,58 @@
+import typing
+
+import numpy as np
+
+from ParadoxTrading.Fetch.Synthetic.FetchBase import FetchBase, \
+    SyntheticInstrument
+
+
+class FetchTickData(FetchBase):
+    """
+    synthetic ticks with the columns of
+    ChineseFutures.FetchInstrumentTickData
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.index = 'happentime'
+        self.columns = [
+            'tradingday',
+            'lastprice', 'highestprice', 'lowestprice',
+            'volume', 'turnover', 'openinterest',
+            'upperlimitprice', 'lowerlimitprice',
+            'askprice', 'askvolume', 'bidprice', 'bidvolume',
+            'happentime',
+        ]
+        self.dtypes = dict((k, 'float64') for k in self.columns[1:-1])
+
+    def _gen_columns(
+            self, _tradingday: str, _symbol: str,
+            _instrument: SyntheticInstrument
+    ) -> typing.Dict[str, typing.Union[list, np.ndarray]]:
+        happentime, price, pre_close, rand = self._gen_ticks(
+            _tradingday, _instrument
+        )
+        num = len(price)
+        tick_size = _instrument.tick_size
+        volume = rand.poisson(_instrument.volume, num).astype('float64')
+        return {
+            'tradingday': [_tradingday] * num,
+            'lastprice': price,
+            'highestprice': np.maximum.accumulate(price),
+            'lowestprice': np.minimum.accumulate(price),
+            'volume': np.cumsum(volume),
+            'turnover': np.cumsum(volume * price),
+            'openinterest': 1e5 + np.cumsum(rand.randint(-5, 6, num)),
+            'upperlimitprice': np.full(
+                num, np.floor(pre_close * 1.1 / tick_size) * tick_size
+            ),
+            'lowerlimitprice': np.full(
+                num, np.ceil(pre_close * 0.9 / tick_size) * tick_size
+            ),
+            'askprice': price + tick_size,
+            'askvolume': rand.randint(1, 100, num).astype('float64'),
+            'bidprice': price - tick_size,
+            'bidvolume': rand.randint(1, 100, num).astype('float64'),
+            'happentime': happentime,
+        }
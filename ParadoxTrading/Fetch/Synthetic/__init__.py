@@ -0,0 +1,5 @@
+from .FetchBase import FetchBase, SyntheticInstrument
+from .FetchDayData import FetchDayData
+from .FetchDepthData import FetchDepthData
+from .FetchMinData import FetchMinData
+from .FetchTickData import FetchTickData
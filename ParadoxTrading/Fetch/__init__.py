@@ -1 +1,3 @@
+from .ContractCalendar import ContractCalendar
 from .FetchAbstract import FetchAbstract, RegisterAbstract
+from .FetchShared import FetchShared, SharedMarketStore
@@ -16,6 +16,19 @@ class IndicatorAbstract:
     def getAllData(self) -> DataStruct:
         return self.data
 
+    def setDtypes(
+            self, _dtypes: typing.Dict[str, typing.Any]
+    ) -> "IndicatorAbstract":
+        """
+        store the result columns as typed numpy arrays,
+        like EMA(20).setDtypes({'ema': 'float64'})
+
+        :param _dtypes: map column to numpy dtype
+        :return: self
+        """
+        self.data.setDtypes(_dtypes)
+        return self
+
     def addOne(self, _data_struct: DataStruct) -> "IndicatorAbstract":
         assert len(_data_struct) == 1
         self._addOne(_data_struct)
@@ -28,6 +41,8 @@ class IndicatorAbstract:
             self,
             _data_list: typing.Union[DataStruct, typing.List[DataStruct]],
     ) -> "IndicatorAbstract":
+        if isinstance(_data_list, DataStruct):
+            _data_list = _data_list.iterRows(True)
         for data in _data_list:
             self.addOne(data)
         return self
@@ -1,5 +1,6 @@
 import math
 import statistics
+import typing
 
 from tabulate import tabulate
 
@@ -13,8 +14,21 @@ def dailyReturn(
         _mongo_database='Backtest'
 ) -> DataStruct:
     fetcher = FetchRecord(_mongo_host, _mongo_database)
-    fund_data = fetcher.settlement(_backtest_key).clone(['fund'])
+    return settlementReturn(fetcher.settlement(_backtest_key))
+
+
+def settlementReturn(_settlement: DataStruct) -> DataStruct:
+    """
+    pick fund from settlement data, and drop the days before
+    the fund first changes
+
+    :param _settlement: settlement data, like portfolio.getSettlementData()
+    :return:
+    """
+    fund_data = _settlement.clone(['fund'])
     fund_list = fund_data['fund']
+    if not len(fund_list):
+        return fund_data
     first_value = fund_list[0]
     i = 1
     for i in range(1, len(fund_list)):
@@ -88,6 +102,36 @@ def calmarRatio(
     )
 
 
+def performanceDict(
+        _returns: DataStruct,
+        _factor: int = 252,
+        _risk_free: float = 0.0,
+        _fund_index: str = 'fund'
+) -> typing.Dict[str, float]:
+    """
+    calc all the metrics, nan if one can not be calculated,
+    for example, fund never changes
+
+    :return: map metric name to value
+    """
+    funcs = [
+        ('AvgYearRet', lambda: avgYearReturn(
+            _returns, _factor, _fund_index)),
+        ('SharpRatio', lambda: sharpRatio(
+            _returns, _factor, _risk_free, _fund_index)),
+        ('MaxDrawdown', lambda: maxDrawdown(_returns, _fund_index)),
+        ('CalmarRatio', lambda: calmarRatio(
+            _returns, _factor, _fund_index)),
+    ]
+    ret = {}
+    for name, func in funcs:
+        try:
+            ret[name] = func()
+        except (ZeroDivisionError, IndexError, statistics.StatisticsError):
+            ret[name] = float('nan')
+    return ret
+
+
 def performance(
         _backtest_key: str,
         _mongo_host: str = 'localhost',
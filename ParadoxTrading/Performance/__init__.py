@@ -1,3 +1,3 @@
 from .Functions import avgYearReturn, calmarRatio, dailyReturn, marginRate, \
-    maxDrawdown, performance, sharpRatio
+    maxDrawdown, performance, performanceDict, settlementReturn, sharpRatio
 from .Utils import FetchRecord
@@ -1,11 +1,232 @@
 import pickle
 import typing
+from collections.abc import Sequence
+from itertools import islice
 from bisect import bisect_left, bisect_right
 
+import numpy as np
 import pandas as pd
 import tabulate
 
 
+class TypedColumn:
+    """
+    a growable numpy array used as a typed column of DataStruct,
+    the capacity is doubled when it is full, so append is amortized O(1)
+
+    :param _dtype: numpy dtype of this column, like 'float64', 'int64'
+        or 'datetime64[us]'
+    :param _values: init values
+    """
+
+    MIN_CAPACITY = 16
+
+    def __init__(
+            self, _dtype: typing.Any,
+            _values: typing.Sequence[typing.Any] = ()
+    ):
+        self.dtype: np.dtype = np.dtype(_dtype)
+        self.size: int = 0
+        self.buf: np.ndarray = np.empty(
+            max(len(_values), self.MIN_CAPACITY), self.dtype
+        )
+        self.extend(_values)
+
+    def _reserve(self, _size: int):
+        """
+        make sure the capacity is at least _size
+
+        :param _size:
+        """
+        capacity = len(self.buf)
+        if _size > capacity:
+            new_buf = np.empty(max(_size, capacity * 2), self.dtype)
+            new_buf[:self.size] = self.buf[:self.size]
+            self.buf = new_buf
+
+    def values(self) -> np.ndarray:
+        """
+        return the valid part of buffer, it is a view, not a copy
+
+        :return:
+        """
+        return self.buf[:self.size]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, _item: typing.Union[int, slice]):
+        return self.values()[_item]
+
+    def __setitem__(self, _item: typing.Union[int, slice], _value):
+        if not self.buf.flags.writeable:
+            # wrapped by fromArray, copy it before the first write
+            self.buf = self.values().copy()
+        self.values()[_item] = _value
+
+    def __iter__(self):
+        return iter(self.values())
+
+    def append(self, _value: typing.Any):
+        self._reserve(self.size + 1)
+        self.buf[self.size] = _value
+        self.size += 1
+
+    def insert(self, _index: int, _value: typing.Any):
+        if _index >= self.size:
+            self.append(_value)
+            return
+        self._reserve(self.size + 1)
+        self.buf[_index + 1:self.size + 1] = self.buf[_index:self.size]
+        self.buf[_index] = _value
+        self.size += 1
+
+    def extend(self, _values: typing.Sequence[typing.Any]):
+        num = len(_values)
+        self._reserve(self.size + num)
+        self.buf[self.size:self.size + num] = _values
+        self.size += num
+
+    @staticmethod
+    def fromArray(_array: np.ndarray) -> 'TypedColumn':
+        """
+        wrap an existing array without copying, like a read-only mmap.
+        The buffer is full, so the first append copies it into a new one,
+        and a read-only one is copied by the first __setitem__. The numpy
+        array returned by values() is still read-only
+
+        :param _array: one dimension array
+        :return:
+        """
+        assert _array.ndim == 1
+        column = TypedColumn.__new__(TypedColumn)
+        column.dtype = _array.dtype
+        column.buf = _array
+        column.size = len(_array)
+        return column
+
+    def copy(self) -> 'TypedColumn':
+        return TypedColumn(self.dtype, self.values())
+
+    def tolist(self) -> list:
+        return self.values().tolist()
+
+    def __getstate__(self):
+        # only store the valid part
+        return {'dtype': self.dtype, 'values': self.values().copy()}
+
+    def __setstate__(self, _state):
+        self.dtype = _state['dtype']
+        self.buf = _state['values']
+        self.size = len(self.buf)
+
+    def __repr__(self):
+        return 'TypedColumn({}, {})'.format(self.dtype, self.values())
+
+
+def _create_column(
+        _dtype: typing.Any = None,
+        _values: typing.Sequence[typing.Any] = ()
+) -> typing.Union[list, TypedColumn]:
+    """
+    create a python list column if _dtype is None,
+    else create a typed column
+    """
+    if _dtype is None:
+        return list(_values)
+    return TypedColumn(_dtype, _values)
+
+
+class ColumnView(Sequence):
+    """
+    read-only view of rows [start, stop) of a python list column,
+    it references the list and copies nothing
+
+    :param _column: the list column
+    :param _start: first row, included
+    :param _stop: last row, excluded
+    """
+
+    __slots__ = ('column', 'start', 'stop')
+
+    def __init__(self, _column: list, _start: int, _stop: int):
+        self.column = _column
+        self.start = _start
+        self.stop = _stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, _item: typing.Union[int, slice]):
+        if isinstance(_item, slice):
+            return self.column[self.start:self.stop][_item]
+        if _item < 0:
+            _item += self.stop - self.start
+        if not 0 <= _item < self.stop - self.start:
+            raise IndexError('column view index out of range')
+        return self.column[self.start + _item]
+
+    def __iter__(self):
+        return islice(self.column, self.start, self.stop)
+
+    def __eq__(self, _other) -> bool:
+        if isinstance(_other, (list, ColumnView)):
+            return self.tolist() == list(_other)
+        return NotImplemented
+
+    def tolist(self) -> list:
+        return self.column[self.start:self.stop]
+
+    def __repr__(self):
+        return 'ColumnView({})'.format(self.tolist())
+
+
+def _is_sorted(_values: typing.Sequence[typing.Any]) -> bool:
+    return all(not b < a for a, b in zip(_values, _values[1:]))
+
+
+def _bisect_right(
+        _column: typing.Union[list, TypedColumn], _value: typing.Any
+) -> int:
+    if isinstance(_column, TypedColumn):
+        return int(np.searchsorted(_column.values(), _value, 'right'))
+    return bisect_right(_column, _value)
+
+
+def _bisect_left(
+        _column: typing.Union[list, np.ndarray, TypedColumn],
+        _value: typing.Any
+) -> int:
+    if isinstance(_column, TypedColumn):
+        _column = _column.values()
+    if isinstance(_column, np.ndarray):
+        return int(np.searchsorted(_column, _value, 'left'))
+    return bisect_left(_column, _value)
+
+
+def _merge_column(
+        _column: typing.Union[list, TypedColumn],
+        _positions: typing.Sequence[int],
+        _values: typing.Sequence[typing.Any]
+) -> typing.Union[list, TypedColumn]:
+    """
+    insert _values[i] before _column[_positions[i]],
+    _positions should be sorted
+    """
+    if isinstance(_column, TypedColumn):
+        return TypedColumn(_column.dtype, np.insert(
+            _column.values(), _positions, np.asarray(_values)
+        ))
+    ret = []
+    prev = 0
+    for pos, value in zip(_positions, _values):
+        ret.extend(_column[prev:pos])
+        ret.append(value)
+        prev = pos
+    ret.extend(_column[prev:])
+    return ret
+
+
 class DataStruct:
     """
     the core data struct of ParadoxTrading.
@@ -14,6 +235,9 @@ class DataStruct:
     :param _index_name: the index of this datastruct
     :param _rows: init data, add as rows
     :param _dicts: init data, add as dicts
+    :param _dtypes: map column to numpy dtype, these columns will be stored
+        as typed numpy arrays instead of python lists, and reading them
+        by __getitem__ returns a numpy view without copying
 
     """
 
@@ -25,14 +249,23 @@ class DataStruct:
             _keys: typing.Sequence[str],
             _index_name: str,
             _rows: typing.Sequence[typing.Sequence] = None,
-            _dicts: typing.Sequence[dict] = None
+            _dicts: typing.Sequence[dict] = None,
+            _dtypes: typing.Dict[str, typing.Any] = None
     ):
         assert _index_name in _keys
 
         self.index_name = _index_name
-        self.data: typing.Dict[str, typing.List] = {}
+        # map column to its numpy dtype, only typed columns are stored
+        self.dtypes: typing.Dict[str, np.dtype] = {}
+        if _dtypes is not None:
+            for k, v in _dtypes.items():
+                assert k in _keys
+                self.dtypes[k] = np.dtype(v)
+        self.data: typing.Dict[
+            str, typing.Union[typing.List, TypedColumn]
+        ] = {}
         for key in _keys:
-            self.data[key] = []
+            self.data[key] = _create_column(self.dtypes.get(key))
 
         # this is the slice by index value
         self.loc: Loc = Loc(self)
@@ -45,15 +278,26 @@ class DataStruct:
         if _dicts is not None:
             self.addDicts(_dicts)
 
-    def __getitem__(self, _item: str) -> typing.List[typing.Any]:
+    def __setstate__(self, _state: dict):
+        # datastructs pickled by older versions have no dtypes
+        self.__dict__.update(_state)
+        self.__dict__.setdefault('dtypes', {})
+
+    def __getitem__(
+            self, _item: str
+    ) -> typing.Union[typing.List[typing.Any], np.ndarray]:
         """
-        get one column of data
+        get one column of data, typed column will return a numpy view,
+        which is read-only if the data is attached from SharedMarketStore
 
         :param _item: which column to pick
         :return: column of _item
         """
         assert type(_item) == str
-        return self.data[_item]
+        column = self.data[_item]
+        if isinstance(column, TypedColumn):
+            return column.values()
+        return column
 
     def __len__(self) -> int:
         """
@@ -64,11 +308,40 @@ class DataStruct:
         return len(self.index())
 
     def __iter__(self):
+        """
+        iter the row one by one, each row is a new datastruct
+        """
+        return self.iterRows()
+
+    def iterRows(self, _view: bool = False) -> typing.Iterator['DataStruct']:
         """
         iter the row one by one
+
+        :param _view: if True, each row is a read-only view referencing
+            self without copying, see DataStructView
+        :return:
+        """
+        if not _view:
+            for i in range(len(self)):
+                yield self.iloc[i]
+            return
+        base, offset = _view_base(self)
+        for i in range(offset, offset + len(self)):
+            yield DataStructView(base, i, i + 1)
+
+    @property
+    def loc_view(self) -> 'Loc':
+        """
+        the same as loc, but returns read-only views, see DataStructView
+        """
+        return Loc(self, True)
+
+    @property
+    def iloc_view(self) -> 'ILoc':
+        """
+        the same as iloc, but returns read-only views, see DataStructView
         """
-        for i in range(len(self.index())):
-            yield self.iloc[i]
+        return ILoc(self, True)
 
     def __repr__(self):
         """
@@ -77,9 +350,9 @@ class DataStruct:
         :return: the str of this table
         """
         if len(self) > 20:
-            tmp_rows, tmp_keys = self.iloc[:8].toRows()
+            tmp_rows, tmp_keys = self.iloc_view[:8].toRows()
             tmp_rows.append(['...' for _ in tmp_keys])
-            tmp_rows += self.iloc[-8:].toRows()[0]
+            tmp_rows += self.iloc_view[-8:].toRows()[0]
             return tabulate.tabulate(tmp_rows, headers=tmp_keys)
         tmp_rows, tmp_keys = self.toRows()
         return tabulate.tabulate(tmp_rows, headers=tmp_keys)
@@ -104,35 +377,95 @@ class DataStruct:
             _keys: typing.Sequence[str]
     ):
         """
-        add multi rows like addRow
+        add multi rows like addRow, the rows are turned into columns
+        and added by addColumns in one pass
 
         :param _rows:
         :param _keys:
         """
-        for row in _rows:
-            self.addRow(row, _keys)
+        rows = _rows if isinstance(_rows, list) else list(_rows)
+        if not rows:
+            return
+        key_num = len(_keys)
+        assert all(len(row) == key_num for row in rows)
+        self.addColumns(dict(zip(_keys, zip(*rows))))
 
     def addDict(self, _dict: typing.Dict[str, typing.Any]):
         """
-        add dict into self
+        add dict into self, if its index value is not less than
+        the last one, append it directly
 
         :param _dict: map key to value
         :return:
         """
         index_value = _dict[self.index_name]
-        insert_idx = bisect_right(self.index(), index_value)
-        for k in self.data.keys():
-            self.data[k].insert(insert_idx, _dict[k])
+        index = self.data[self.index_name]
+        if not len(index) or not index_value < index[-1]:
+            for k, v in self.data.items():
+                v.append(_dict[k])
+        else:
+            insert_idx = _bisect_right(index, index_value)
+            for k, v in self.data.items():
+                v.insert(insert_idx, _dict[k])
 
     def addDicts(self, _dicts: typing.Sequence[dict]):
         """
-        add dicts into self, like addDict
+        add dicts into self, like addDict, but in one pass
 
         :param _dicts:
         :return:
         """
-        for _dict in _dicts:
-            self.addDict(_dict)
+        dicts = _dicts if isinstance(_dicts, list) else list(_dicts)
+        if not dicts:
+            return
+        self.addColumns(dict(
+            (k, [d[k] for d in dicts]) for k in self.data.keys()
+        ))
+
+    def addColumns(
+            self, _columns: typing.Dict[str, typing.Sequence[typing.Any]]
+    ):
+        """
+        add data stored as columns into self. The new rows are sorted
+        by index once (stable), then appended directly if all of them are
+        not less than the last index, else merged into self in one pass.
+        The result is the same as adding rows one by one by addDict.
+
+        :param _columns: map key to column, all the columns have
+            the same length
+        :return:
+        """
+        index_values = _columns[self.index_name]
+        num = len(index_values)
+        if not num:
+            return
+        for k in self.data.keys():
+            assert len(_columns[k]) == num
+
+        columns = _columns
+        if not _is_sorted(index_values):
+            order = sorted(range(num), key=index_values.__getitem__)
+            columns = dict(
+                (k, [_columns[k][i] for i in order])
+                for k in self.data.keys()
+            )
+            index_values = columns[self.index_name]
+
+        index = self.data[self.index_name]
+        if not len(index) or not index_values[0] < index[-1]:
+            # fast path, append all
+            for k, v in self.data.items():
+                v.extend(columns[k])
+        else:
+            # find where to insert each new row, then merge
+            if isinstance(index, TypedColumn):
+                positions = np.searchsorted(
+                    index.values(), np.asarray(index_values), 'right'
+                )
+            else:
+                positions = [bisect_right(index, d) for d in index_values]
+            for k, v in self.data.items():
+                self.data[k] = _merge_column(v, positions, columns[k])
 
     def toRows(
             self, _keys=None
@@ -151,8 +484,9 @@ class DataStruct:
         keys: typing.List[str] = _keys
         if keys is None:
             keys = self.getColumnNames()
-        for i in range(len(self)):
-            rows.append([self.data[k][i] for k in keys])
+        columns = [self[k] for k in keys]
+        for row in zip(*columns):
+            rows.append(list(row))
         return rows, keys
 
     def toRow(
@@ -169,7 +503,7 @@ class DataStruct:
         keys: typing.List[str] = _keys
         if keys is None:
             keys = self.getColumnNames()
-        row = [self.data[k][_index] for k in keys]
+        row = [self[k][_index] for k in keys]
         return row, keys
 
     def toDicts(self) -> (typing.List[typing.Dict[str, typing.Any]]):
@@ -204,7 +538,15 @@ class DataStruct:
         :return: the new datastruct
         """
         if _columns is None:
-            return self.iloc[:]
+            datastruct = DataStruct(
+                self.getColumnNames(), self.index_name,
+                _dtypes=self.dtypes
+            )
+            for k in datastruct.data.keys():
+                datastruct.data[k] = _create_column(
+                    self.dtypes.get(k), self[k]
+                )
+            return datastruct
 
         # check column available
         keys_self = self.getColumnNames(_include_index_name=False)
@@ -216,7 +558,8 @@ class DataStruct:
             keys_new.append(self.index_name)
         # create new datastruct
         datastruct = DataStruct(
-            keys_new, self.index_name
+            keys_new, self.index_name,
+            _dtypes=self._sub_dtypes(keys_new)
         )
 
         datastruct.addRows(*self.toRows(keys_new))
@@ -262,17 +605,21 @@ class DataStruct:
 
         new_names = self_names + struct_names
         new_names.append(self.index_name)
-        new_struct = DataStruct(new_names, self.index_name)
+        new_dtypes = dict(_struct.dtypes)
+        new_dtypes.update(self.dtypes)
+        new_struct = DataStruct(
+            new_names, self.index_name, _dtypes=new_dtypes
+        )
 
         for i in index:
             tmp_dict = {self.index_name: i}
-            self_dict = self.loc[i]
+            self_dict = self.loc_view[i]
             if self_dict is None:
                 self_dict = dict([(d, None) for d in self_names])
             else:
                 self_dict = self_dict.toDict()
             tmp_dict.update(self_dict)
-            struct_dict = _struct.loc[i]
+            struct_dict = _struct.loc_view[i]
             if struct_dict is None:
                 struct_dict = dict([(d, None) for d in struct_names])
             else:
@@ -283,7 +630,10 @@ class DataStruct:
         return new_struct
 
     def toPandas(self) -> pd.DataFrame:
-        df = pd.DataFrame(data=self.data, index=self.index())
+        df = pd.DataFrame(
+            data=dict((k, self[k]) for k in self.getColumnNames()),
+            index=self.index()
+        )
         del df[self.index_name]
         df.index.name = self.index_name
         return df
@@ -307,13 +657,13 @@ class DataStruct:
     def load(_path: str) -> 'DataStruct':
         return pickle.load(open(_path, 'rb'))
 
-    def index(self) -> list:
+    def index(self) -> typing.Union[list, np.ndarray]:
         """
         return the column of index
 
         :return:
         """
-        return self.data[self.index_name]
+        return self[self.index_name]
 
     def getColumnNames(
             self, _include_index_name: bool = True
@@ -339,7 +689,9 @@ class DataStruct:
         :return:
         """
         assert _new_index in self.data.keys()
-        tmp = DataStruct(self.getColumnNames(), _new_index)
+        tmp = DataStruct(
+            self.getColumnNames(), _new_index, _dtypes=self.dtypes
+        )
         tmp.merge(self)
         return tmp
 
@@ -356,15 +708,17 @@ class DataStruct:
             self.index_name = _new_name
         self.data[_new_name] = self.data[_old_name]
         del self.data[_old_name]
+        if _old_name in self.dtypes:
+            self.dtypes[_new_name] = self.dtypes.pop(_old_name)
 
-    def getColumn(self, _key: str) -> list:
+    def getColumn(self, _key: str) -> typing.Union[list, np.ndarray]:
         """
         return one column by key
 
         :param _key:
         :return:
         """
-        return self.data[_key]
+        return self[_key]
 
     def dropColumn(self, _key: str):
         """
@@ -376,24 +730,68 @@ class DataStruct:
         assert _key != self.index_name
         assert _key in self.data.keys()
         del self.data[_key]
+        self.dtypes.pop(_key, None)
 
-    def createColumn(self, _key: str, _column: typing.Sequence[typing.Any]):
+    def createColumn(
+            self, _key: str, _column: typing.Sequence[typing.Any],
+            _dtype: typing.Any = None
+    ):
         """
         add one column into self, check the len of new column,
         !!! WARN !!! you should keep the sort by yourself
 
         :param _key:
         :param _column:
+        :param _dtype: store as typed column if set
         :return:
         """
         assert _key not in self.data.keys()
         assert len(_column) == len(self)
-        self.data[_key] = list(_column)
+        self.data[_key] = _create_column(_dtype, _column)
+        if _dtype is not None:
+            self.dtypes[_key] = np.dtype(_dtype)
+
+    def setDtypes(self, _dtypes: typing.Dict[str, typing.Any]):
+        """
+        change the storage of columns in place,
+        set dtype to None to turn a typed column back into python list
+
+        :param _dtypes: map column to numpy dtype or None
+        :return: self
+        """
+        for k, v in _dtypes.items():
+            assert k in self.data.keys()
+            column = self.data[k]
+            if isinstance(column, TypedColumn):
+                column = column.tolist()
+            if v is None:
+                self.data[k] = column
+                self.dtypes.pop(k, None)
+            else:
+                self.data[k] = TypedColumn(v, column)
+                self.dtypes[k] = np.dtype(v)
+        return self
+
+    def _sub_dtypes(
+            self, _keys: typing.Iterable[str]
+    ) -> typing.Dict[str, np.dtype]:
+        """
+        pick dtypes of _keys
+        """
+        return dict(
+            (k, self.dtypes[k]) for k in _keys if k in self.dtypes
+        )
 
 
 class Loc:
-    def __init__(self, _struct: DataStruct):
+    def __init__(self, _struct: DataStruct, _view: bool = False):
+        """
+
+        :param _struct:
+        :param _view: return read-only views instead of copies
+        """
         self.struct = _struct
+        self.view = _view
 
     def __getitem__(self, _item: typing.Union[typing.Any, slice]):
         """
@@ -410,37 +808,196 @@ class Loc:
         if isinstance(_item, slice):
             new_start = None
             if _item.start is not None:
-                new_start = bisect_left(self.struct.index(), _item.start)
+                new_start = _bisect_left(
+                    self.struct.index(), _item.start
+                )
             new_stop = None
             if _item.stop is not None:
-                new_stop = bisect_left(self.struct.index(), _item.stop)
+                new_stop = _bisect_left(
+                    self.struct.index(), _item.stop
+                )
             new_item = slice(new_start, new_stop)
-            return self.struct.iloc.__getitem__(new_item)
+            return ILoc(self.struct, self.view)[new_item]
         else:
-            n_i = bisect_left(self.struct.index(), _item)
+            n_i = _bisect_left(self.struct.index(), _item)
             if n_i != len(self.struct) and _item == self.struct.index()[n_i]:
-                return self.struct.iloc.__getitem__(n_i)
+                return ILoc(self.struct, self.view)[n_i]
             else:
                 return None
 
 
 class ILoc:
-    def __init__(self, _struct: DataStruct):
+    def __init__(self, _struct: DataStruct, _view: bool = False):
+        """
+
+        :param _struct:
+        :param _view: return read-only views instead of copies
+        """
         self.struct = _struct
+        self.view = _view
 
-    def __getitem__(self, _item: typing.Union[int, slice]) -> DataStruct:
+    def _copy(self, _item: typing.Union[int, slice]) -> DataStruct:
         """
         create a new datastruct according to self,
         and add the data according to _item
+        """
+        dtypes = self.struct.dtypes
+        ret = DataStruct(
+            self.struct.getColumnNames(), self.struct.index_name,
+            _dtypes=dtypes
+        )
+        if isinstance(_item, slice):
+            for k in ret.data.keys():
+                ret.data[k] = _create_column(
+                    dtypes.get(k), self.struct[k][_item]
+                )
+        else:
+            for k in ret.data.keys():
+                ret.data[k] = _create_column(
+                    dtypes.get(k), [self.struct[k][_item]]
+                )
+        return ret
+
+    def __getitem__(self, _item: typing.Union[int, slice]) -> DataStruct:
+        """
+        return a new datastruct of the rows according to _item.
+        If created with _view, return a read-only view which references
+        the data of self.struct without copying, slices with step other
+        than 1 are still copied
 
         :param _item:
         :return:
         """
-        ret = DataStruct(self.struct.getColumnNames(), self.struct.index_name)
+        if not self.view:
+            return self._copy(_item)
+        base, offset = _view_base(self.struct)
+        length = len(self.struct)
         if isinstance(_item, slice):
-            for k, v in self.struct.data.items():
-                ret.data[k] = v.__getitem__(_item)
-        else:
-            for k, v in self.struct.data.items():
-                ret.data[k] = [v[_item]]
-        return ret
+            start, stop, step = _item.indices(length)
+            if step == 1:
+                return DataStructView(
+                    base, offset + start, offset + max(start, stop)
+                )
+            return self._copy(_item)
+        if _item < 0:
+            _item += length
+        if not 0 <= _item < length:
+            raise IndexError('datastruct index out of range')
+        return DataStructView(base, offset + _item, offset + _item + 1)
+
+
+class DataStructView(DataStruct):
+    """
+    read-only view of rows [start, stop) of a datastruct, returned by
+    iloc_view, loc_view and iterRows(_view=True). It references
+    the storage of the parent instead of copying. Reading works as
+    a normal datastruct, and the first time it is changed, the rows are
+    copied and it turns into a normal datastruct (copy on write).
+
+    !!! WARN !!! the parent should not be changed while the view is used
+
+    :param _struct: the parent datastruct
+    :param _start: first row, included
+    :param _stop: last row, excluded
+    """
+
+    def __init__(self, _struct: DataStruct, _start: int, _stop: int):
+        # DataStruct.__init__ is not called, nothing is allocated
+        self.struct = _struct
+        self.start = _start
+        self.stop = _stop
+        self.index_name = _struct.index_name
+        self.dtypes = _struct.dtypes
+
+    @property
+    def data(self) -> typing.Dict[str, typing.Union[list, TypedColumn]]:
+        """
+        the storage is asked, maybe to change it, so copy the rows
+        """
+        return self._materialize()
+
+    @property
+    def loc(self) -> Loc:
+        return Loc(self)
+
+    @property
+    def iloc(self) -> ILoc:
+        return ILoc(self)
+
+    def __getitem__(
+            self, _item: str
+    ) -> typing.Union[ColumnView, np.ndarray]:
+        """
+        get one column of the view, typed column returns a read-only
+        numpy view, list column returns a read-only ColumnView
+
+        :param _item: which column to pick
+        :return:
+        """
+        assert type(_item) == str
+        column = self.struct.data[_item]
+        if isinstance(column, TypedColumn):
+            values = column.buf[self.start:self.stop]
+            values.setflags(write=False)
+            return values
+        return ColumnView(column, self.start, self.stop)
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __reduce_ex__(self, _protocol):
+        # pickle and copy as a normal datastruct
+        return _rebuild_datastruct, (self.clone().__dict__,)
+
+    def toRow(
+            self, _index: int = 0, _keys=None
+    ) -> (typing.Sequence[typing.Any], typing.List[str]):
+        keys: typing.List[str] = _keys
+        if keys is None:
+            keys = self.getColumnNames()
+        if _index < 0:
+            _index += self.stop - self.start
+        if not 0 <= _index < self.stop - self.start:
+            raise IndexError('datastruct index out of range')
+        data = self.struct.data
+        i = self.start + _index
+        return [data[k][i] for k in keys], keys
+
+    def getColumnNames(
+            self, _include_index_name: bool = True
+    ) -> typing.List[str]:
+        return DataStruct.getColumnNames(self.struct, _include_index_name)
+
+    def _materialize(
+            self
+    ) -> typing.Dict[str, typing.Union[list, TypedColumn]]:
+        """
+        copy the rows, and turn self into a normal datastruct
+        """
+        dtypes = dict(self.struct.dtypes)
+        data = dict(
+            (k, _create_column(dtypes.get(k), self[k]))
+            for k in self.struct.data.keys()
+        )
+        del self.struct, self.start, self.stop
+        self.__class__ = DataStruct
+        self.dtypes = dtypes
+        self.data = data
+        self.loc = Loc(self)
+        self.iloc = ILoc(self)
+        return data
+
+
+def _rebuild_datastruct(_state: dict) -> DataStruct:
+    datastruct = DataStruct.__new__(DataStruct)
+    datastruct.__setstate__(_state)
+    return datastruct
+
+
+def _view_base(_struct: DataStruct) -> (DataStruct, int):
+    """
+    return the datastruct owning the storage, and the offset of _struct in it
+    """
+    if isinstance(_struct, DataStructView):
+        return _struct.struct, _struct.start
+    return _struct, 0
@@ -0,0 +1,285 @@
+import typing
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+from ParadoxTrading.Utils.DataStruct import DataStruct, TypedColumn
+
+
+class CategoryColumn:
+    """
+    a column of repeated values, like symbol or tradingday, stored as
+    int32 codes into the list of distinct values
+
+    :param _values: init values
+    """
+
+    def __init__(self, _values: typing.Sequence[typing.Any] = ()):
+        self.codes: TypedColumn = TypedColumn('int32')
+        self.categories: typing.List[typing.Any] = []
+        self.code_dict: typing.Dict[typing.Any, int] = {}
+        self.extend(_values)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, _item: int) -> typing.Any:
+        return self.categories[self.codes[_item]]
+
+    def extend(self, _values: typing.Sequence[typing.Any]):
+        code_dict = self.code_dict
+        codes = []
+        for v in _values:
+            try:
+                codes.append(code_dict[v])
+            except KeyError:
+                code_dict[v] = len(self.categories)
+                codes.append(code_dict[v])
+                self.categories.append(v)
+        self.codes.extend(codes)
+
+    def values(self) -> np.ndarray:
+        """
+        decode all the values in one step
+
+        :return: object array
+        """
+        categories = np.empty(len(self.categories), dtype=object)
+        categories[:] = self.categories
+        return categories[self.codes.values()]
+
+    def __getstate__(self):
+        return {'codes': self.codes, 'categories': self.categories}
+
+    def __setstate__(self, _state):
+        self.codes = _state['codes']
+        self.categories = _state['categories']
+        self.code_dict = dict(
+            (v, i) for i, v in enumerate(self.categories)
+        )
+
+
+class RecordStore:
+    """
+    append-only columnar store of records, like fills of a backtest.
+    Records are buffered as tuples and moved into typed columns chunk
+    by chunk, so append is cheap and the memory is linear. Export to
+    DataStruct or pandas decodes each column in one vectorized step.
+
+    :param _fields: list of (field, dtype), dtype is a numpy dtype
+        for numbers, or None for values stored as categories
+    :param _enums: map int field to its toStr, like ActionType.toStr,
+        these fields are exported as strings
+    """
+
+    CHUNK_SIZE = 1024
+
+    def __init__(
+            self,
+            _fields: typing.Sequence[typing.Tuple[str, typing.Any]],
+            _enums: typing.Dict[str, typing.Callable[[int], str]] = None
+    ):
+        self.fields: typing.List[str] = [f for f, _ in _fields]
+        assert len(self.fields) > 1
+        # pick the values of fields from dict as tuple
+        self.getter: itemgetter = itemgetter(*self.fields)
+        self.dtypes: typing.Dict[str, np.dtype] = dict(
+            (f, np.dtype(d)) for f, d in _fields if d is not None
+        )
+        self.enums: typing.Dict[str, typing.Callable[[int], str]] = \
+            {} if _enums is None else _enums
+        for k in self.enums.keys():
+            assert k in self.dtypes
+
+        self.columns: typing.Dict[
+            str, typing.Union[TypedColumn, CategoryColumn]
+        ] = {}
+        self.buf: typing.List[tuple] = []
+        self.clear()
+
+    def clear(self):
+        self.columns = dict(
+            (f, TypedColumn(self.dtypes[f]) if f in self.dtypes
+             else CategoryColumn())
+            for f in self.fields
+        )
+        self.buf = []
+
+    def detach(self) -> 'RecordStore':
+        """
+        move all records into a new store, self is empty after it
+
+        :return: store of the records moved
+        """
+        ret = RecordStore.__new__(RecordStore)
+        ret.__dict__.update(self.__dict__)
+        self.clear()
+        return ret
+
+    def _flush(self):
+        """
+        move the buffered records into columns
+        """
+        if not self.buf:
+            return
+        for f, values in zip(self.fields, zip(*self.buf)):
+            self.columns[f].extend(values)
+        self.buf = []
+
+    def append(self, _record: tuple):
+        """
+        :param _record: values in the order of fields, None of float
+            fields is stored as nan
+        """
+        assert len(_record) == len(self.fields)
+        self.buf.append(_record)
+        if len(self.buf) >= self.CHUNK_SIZE:
+            self._flush()
+
+    def appendDict(self, _dict: typing.Dict[str, typing.Any]):
+        """
+        :param _dict: map field to value, other keys are ignored
+        """
+        self.buf.append(self.getter(_dict))
+        if len(self.buf) >= self.CHUNK_SIZE:
+            self._flush()
+
+    def __len__(self) -> int:
+        return len(self.columns[self.fields[0]]) + len(self.buf)
+
+    def _to_value(self, _field: str, _value: typing.Any) -> typing.Any:
+        dtype = self.dtypes.get(_field)
+        if dtype is None:
+            return _value
+        if dtype.kind == 'f':
+            return None if _value != _value else float(_value)
+        return _value.item()
+
+    def __getitem__(self, _index: int) -> typing.Dict[str, typing.Any]:
+        """
+        one record as dict, enum fields keep their int codes
+
+        :param _index: position of record, negative is allowed
+        :return:
+        """
+        self._flush()
+        num = len(self)
+        if _index < 0:
+            _index += num
+        if not 0 <= _index < num:
+            raise IndexError('record index out of range')
+        return dict(
+            (f, self._to_value(f, self.columns[f][_index]))
+            for f in self.fields
+        )
+
+    def __iter__(self):
+        return iter(self.toDicts())
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def toDicts(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        """
+        all records as dicts, enum fields keep their int codes
+        """
+        self._flush()
+        columns = [
+            self._to_list(f, self.columns[f].values()) for f in self.fields
+        ]
+        return [dict(zip(self.fields, row)) for row in zip(*columns)]
+
+    def getColumn(self, _field: str) -> np.ndarray:
+        """
+        one column, enum fields are decoded into strings
+
+        :param _field:
+        :return: numpy array, object array for categories and enums
+        """
+        self._flush()
+        values = self.columns[_field].values()
+        if _field in self.enums:
+            codes, inverse = np.unique(values, return_inverse=True)
+            names = np.empty(len(codes), dtype=object)
+            names[:] = [self.enums[_field](c) for c in codes.tolist()]
+            return names[inverse]
+        return values
+
+    def _to_list(self, _field: str, _values: np.ndarray) -> list:
+        """
+        numpy column to python list, nan of float fields is None
+        """
+        ret = _values.tolist()
+        dtype = self.dtypes.get(_field)
+        if dtype is not None and dtype.kind == 'f':
+            ret = [None if v != v else v for v in ret]
+        return ret
+
+    def toRows(
+            self, _keys: typing.Sequence[str] = None
+    ) -> typing.Iterator[tuple]:
+        """
+        records as tuples in the order of _keys, enum fields are decoded
+        into strings, nan of float fields is None. Cheaper than
+        toPandas to feed csv.writer
+
+        :param _keys: fields to export, all fields if None
+        :return:
+        """
+        keys = self.fields if _keys is None else list(_keys)
+        return zip(*[self._to_list(k, self.getColumn(k)) for k in keys])
+
+    def toDataStruct(
+            self, _index_name: str, _keys: typing.Sequence[str] = None,
+            _typed: bool = False
+    ) -> DataStruct:
+        """
+        columns are python lists as records appended by dict, nan of
+        float fields is None
+
+        :param _index_name: index of datastruct
+        :param _keys: fields to export, all fields if None
+        :param _typed: store numeric fields as typed columns, and nan
+            is kept
+        :return:
+        """
+        keys = self.fields if _keys is None else list(_keys)
+        dtypes = {}
+        if _typed:
+            dtypes = dict(
+                (k, self.dtypes[k]) for k in keys
+                if k in self.dtypes and k not in self.enums
+            )
+        columns = dict((k, self.getColumn(k)) for k in keys)
+        index = columns[_index_name]
+        if len(index) > 1 and not (index[:-1] <= index[1:]).all():
+            # sort once by numpy, stable as datastruct
+            order = index.argsort(kind='stable')
+            columns = dict((k, v[order]) for k, v in columns.items())
+
+        for k, v in columns.items():
+            if k not in dtypes:
+                columns[k] = self._to_list(k, v)
+
+        ret = DataStruct(keys, _index_name, _dtypes=dtypes)
+        ret.addColumns(columns)
+        return ret
+
+    def toPandas(self, _keys: typing.Sequence[str] = None) -> pd.DataFrame:
+        """
+        :param _keys: fields to export, all fields if None
+        :return:
+        """
+        keys = self.fields if _keys is None else list(_keys)
+        return pd.DataFrame(dict((k, self.getColumn(k)) for k in keys))
+
+    def __getstate__(self):
+        self._flush()
+        return self.__dict__
+
+    def __setstate__(self, _state):
+        self.__dict__.update(_state)
+
+    def __repr__(self):
+        return 'RecordStore({}, {} records)'.format(self.fields, len(self))
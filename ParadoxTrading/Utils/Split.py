@@ -91,7 +91,7 @@ class SplitAbstract:
         Args:
             _data (DataStruct): continute data
         """
-        for d in _data:
+        for d in _data.iterRows(True):
             self.addOne(d)
 
         return self
@@ -1,4 +1,5 @@
-from .DataStruct import DataStruct
+from .DataStruct import DataStruct, DataStructView
+from .RecordStore import CategoryColumn, RecordStore
 from .Serializable import Serializable
 from .Split import SplitIntoHour, SplitIntoMinute, SplitIntoMonth, \
     SplitIntoSecond, SplitIntoWeek, SplitTickImbalance, SplitVolumeBars
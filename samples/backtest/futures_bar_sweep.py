@@ -0,0 +1,62 @@
+import logging
+
+from tabulate import tabulate
+
+from ParadoxTrading.Engine import StrategyAbstract, MarketEvent, \
+    SettlementEvent, SignalType
+from ParadoxTrading.EngineExt.Futures import BarBacktestExecution, BarPortfolio
+from ParadoxTrading.EngineExt import BacktestMarketSupply, ParameterSweep
+from ParadoxTrading.Fetch.ChineseFutures import RegisterInstrument, \
+    FetchInstrumentMinData, FetchInstrumentDayData
+from ParadoxTrading.Indicator import EMA
+
+logging.basicConfig(level=logging.WARNING)
+
+
+class MAStrategy(StrategyAbstract):
+    def __init__(self, _period: int):
+        super().__init__('ma_rb')
+
+        self.addMarketRegister(RegisterInstrument('rb'))
+        self.period: int = _period
+        self.ema: EMA = EMA(self.period)
+        self.last_status: int = SignalType.EMPTY
+
+    def deal(self, _market_event: MarketEvent):
+        data = _market_event.data
+        closeprice = data['closeprice'][0]
+        ema_value = self.ema.addOne(data).getLastData()['ema'][0]
+
+        if closeprice > ema_value and self.last_status != SignalType.LONG:
+            self.addEvent(_market_event.symbol, SignalType.LONG)
+            self.last_status = SignalType.LONG
+        if closeprice < ema_value and self.last_status != SignalType.SHORT:
+            self.addEvent(_market_event.symbol, SignalType.SHORT)
+            self.last_status = SignalType.SHORT
+
+    def settlement(self, _settlement_event: SettlementEvent):
+        pass
+
+
+def factory(_period: int):
+    # all workers share the same cache path
+    market_supply = BacktestMarketSupply(
+        '20170601', '20171021',
+        FetchInstrumentMinData(_cache_path='cache')
+    )
+    portfolio = BarPortfolio(
+        FetchInstrumentDayData(_cache_path='cache'), 50_0000, 0.15
+    )
+    execution = BarBacktestExecution(5e-4)
+    return market_supply, execution, portfolio, MAStrategy(_period)
+
+
+if __name__ == '__main__':
+    results = ParameterSweep(
+        factory, {'_period': [10, 20, 40, 80]}, _warm_up=True
+    ).run()
+    print(tabulate([
+        [d['params']['_period']] + list(d['metrics'].values())
+        for d in results if d['error'] is None
+    ], headers=['period', 'AvgYearRet', 'SharpRatio',
+                'MaxDrawdown', 'CalmarRatio']))
@@ -0,0 +1,102 @@
+"""
+cost of fetchSymbol of chinese futures, resolved from cached product
+records on each call, and looked up in the ContractCalendar
+"""
+import tempfile
+import time
+import typing
+
+import numpy as np
+
+from ParadoxTrading.Fetch.ChineseFutures import FetchInstrumentDayData, \
+    RegisterInstrument
+
+PRODUCTS = ['rb', 'hc', 'cu', 'ru', 'a', 'm', 'y', 'p', 'i', 'j']
+TYPES = [
+    RegisterInstrument.DOMINANT,
+    RegisterInstrument.SUB_DOMINANT,
+    RegisterInstrument.BEFORE_DOMINANT,
+    RegisterInstrument.AFTER_DOMINANT,
+]
+
+
+class CachedFetcher(FetchInstrumentDayData):
+    """
+    product records are only in diskcache, no mongodb needed
+    """
+
+    def fetchProductInfoMany(
+            self, _products: typing.Iterable[str],
+            _tradingdays: typing.Sequence[str]
+    ) -> typing.Dict[typing.Tuple[str, str], typing.Dict]:
+        ret = {}
+        for product in _products:
+            for day in _tradingdays:
+                data = self.fetchProductInfo(product, day)
+                if data is not None:
+                    ret[product, day] = data
+        return ret
+
+
+def product_record(_product: str, _tradingday: str) -> dict:
+    # 12 monthly contracts, the one two months later is dominant
+    month = int(_tradingday[:4]) * 12 + int(_tradingday[4:6]) - 1
+    instruments = [
+        '{}{:02d}{:02d}'.format(_product, m // 12 % 100, m % 12 + 1)
+        for m in range(month + 1, month + 13)
+    ]
+    return {
+        'TradingDay': _tradingday,
+        'Product': _product,
+        'Dominant': instruments[1],
+        'SubDominant': instruments[2],
+        'InstrumentList': instruments[::-1],
+    }
+
+
+def lookup(_fetcher: CachedFetcher, _tradingdays: typing.List[str]):
+    ret = []
+    for day in _tradingdays:
+        for product in PRODUCTS:
+            for _type in TYPES:
+                ret.append(_fetcher.fetchSymbol(
+                    day, _product=product, _type=_type
+                ))
+    return ret
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as path:
+        fetcher = CachedFetcher(_cache_path=path)
+        tradingdays = [
+            str(d).replace('-', '') for d in np.arange(
+                np.datetime64('2015-01-01'), np.datetime64('2018-01-01'),
+                dtype='datetime64[D]'
+            ) if np.is_busday(d)
+        ]
+        for day in tradingdays:
+            for product in PRODUCTS:
+                fetcher.cache[fetcher.prod_key.format(product, day)] = \
+                    product_record(product, day)
+        num = len(tradingdays) * len(PRODUCTS) * len(TYPES)
+
+        begin = time.perf_counter()
+        record_symbols = lookup(fetcher, tradingdays)
+        record_cost = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        fetcher.loadContractCalendar(tradingdays, [
+            RegisterInstrument(p, t) for p in PRODUCTS for t in TYPES
+        ])
+        load_cost = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        calendar_symbols = lookup(fetcher, tradingdays)
+        calendar_cost = time.perf_counter() - begin
+
+        assert calendar_symbols == record_symbols
+        print('{} lookups'.format(num))
+        print('product record: {:.2f} us'.format(record_cost / num * 1e6))
+        print('calendar: {:.2f} us, load {:.2f}s'.format(
+            calendar_cost / num * 1e6, load_cost
+        ))
@@ -0,0 +1,78 @@
+"""
+crypto depth backtest on the flat and the array layout of depth, the
+strategy flips its position often, so most of the time is spent in
+market supply, execution and portfolio. Also times the vwap walk alone.
+"""
+import time
+
+from ParadoxTrading.Engine import MarketEvent, SettlementEvent, \
+    StrategyAbstract
+from ParadoxTrading.EngineExt import BacktestEngine, BacktestMarketSupply
+from ParadoxTrading.Fetch.Crypto import RegisterSymbol, depthVWAP, \
+    getDepthArray
+from ParadoxTrading.Fetch.Synthetic import FetchDepthData
+
+FLIP_INTERVAL = 10
+
+
+class FlipStrategy(StrategyAbstract):
+    def __init__(self):
+        super().__init__('flip')
+
+        self.addMarketRegister(RegisterSymbol(
+            _exname='binance', _symbol='BTC_USDT'
+        ))
+        self.count = 0
+
+    def deal(self, _market_event: MarketEvent):
+        self.count += 1
+        if self.count % FLIP_INTERVAL == 0:
+            strength = 30 if self.count // FLIP_INTERVAL % 2 else -30
+            self.addEvent(_market_event.symbol, strength)
+
+    def settlement(self, _settlement_event: SettlementEvent):
+        pass
+
+
+def bench(_depth_array: bool) -> (float, list):
+    # EngineExt.Crypto needs the online trading server package
+    from ParadoxTrading.EngineExt.Crypto import DepthBacktestExecution, \
+        DepthPortfolio
+
+    fetcher = FetchDepthData(_depth_array=_depth_array)
+    fetcher.fetchDayData('20180701', '20180704', ('binance', 'BTC_USDT'))
+    engine = BacktestEngine(
+        BacktestMarketSupply('20180701', '20180704', fetcher),
+        DepthBacktestExecution(_commission_rate=1e-3),
+        DepthPortfolio(),
+        FlipStrategy()
+    )
+    begin = time.perf_counter()
+    engine.run()
+    cost = time.perf_counter() - begin
+    fills = engine.portfolio.portfolio_mgr.fill_record
+    return cost, [f['price'] for f in fills]
+
+
+if __name__ == '__main__':
+    flat_cost, flat_prices = bench(False)
+    array_cost, array_prices = bench(True)
+    print('flat: {:.3f}s, array: {:.3f}s, {} fills, '
+          'max price diff {:.3g}'.format(
+              flat_cost, array_cost, len(flat_prices),
+              max(abs(a - b) for a, b in zip(flat_prices, array_prices))
+          ))
+
+    symbol = ('binance', 'BTC_USDT')
+    for depth_array in (False, True):
+        data = FetchDepthData(_depth_array=depth_array).fetchData(
+            '20180702', symbol
+        )
+        num = len(data)
+        begin = time.perf_counter()
+        for i in range(num):
+            depthVWAP(getDepthArray(data, 'ask', i), 30.0)
+        print('walk {}: {:.2f} us'.format(
+            'array' if depth_array else 'flat',
+            (time.perf_counter() - begin) / num * 1e6
+        ))
@@ -0,0 +1,157 @@
+"""
+compare the events per second of BacktestEngine.run with the old
+if/elif loop, on a synthetic tick stream without any database.
+runs are interleaved and the min time is used, to reduce noise
+"""
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+from ParadoxTrading.Engine import EventType, MarketEvent, ReturnMarket, \
+    ReturnSettlement, SettlementEvent, StrategyAbstract
+from ParadoxTrading.EngineExt import BacktestEngine, BacktestMarketSupply
+from ParadoxTrading.EngineExt.Futures import TickBacktestExecution, \
+    TickPortfolio
+from ParadoxTrading.Fetch import FetchAbstract
+from ParadoxTrading.Fetch.ChineseFutures import RegisterInstrument
+from ParadoxTrading.Utils import DataStruct
+
+logging.basicConfig(level=logging.WARNING)
+
+TICK_NUM = 20000  # ticks of each day
+PRODUCTS = ['rb', 'hc', 'cu', 'ru']
+ROUNDS = 5
+
+
+class RandomTickFetcher(FetchAbstract):
+    def __init__(self):
+        super().__init__()
+        self.register_type = RegisterInstrument
+        self.cache = {}
+
+    def fetchSymbol(self, _tradingday, _product=None, **kwargs):
+        return _product + '1801'
+
+    def fetchData(self, _tradingday, _symbol, **kwargs):
+        key = (_tradingday, _symbol)
+        if key not in self.cache:
+            rand = random.Random(_tradingday + _symbol)
+            begin = datetime.strptime(_tradingday, '%Y%m%d') + \
+                timedelta(hours=9)
+            price = 3000.0
+            rows = []
+            for i in range(TICK_NUM):
+                price += rand.choice((-1.0, 0.0, 1.0))
+                rows.append([
+                    _tradingday, price, price + 1.0, price - 1.0,
+                    begin + timedelta(milliseconds=500 * i)
+                ])
+            self.cache[key] = DataStruct([
+                'tradingday', 'lastprice', 'askprice', 'bidprice',
+                'happentime'
+            ], 'happentime', rows)
+        return self.cache[key]
+
+
+class FlipStrategy(StrategyAbstract):
+    def __init__(self, _product: str, _period: int):
+        super().__init__('flip_{}'.format(_product))
+        self.addMarketRegister(RegisterInstrument(_product))
+        self.period = _period
+        self.count = 0
+
+    def deal(self, _market_event: MarketEvent):
+        self.count += 1
+        if self.count % self.period == 0:
+            self.addEvent(
+                _market_event.symbol,
+                1 if self.count // self.period % 2 else -1
+            )
+
+    def settlement(self, _settlement_event: SettlementEvent):
+        pass
+
+
+class CountEngine(BacktestEngine):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.event_count = 0
+
+    def addEvent(self, _event):
+        self.event_count += 1
+        super().addEvent(_event)
+
+
+class LegacyEngine(CountEngine):
+    def run(self):
+        """
+        the loop before dispatch table
+        """
+        while True:
+            ret = self.market_supply.updateData()
+            if ret is None:
+                return
+
+            while True:
+                if isinstance(ret, ReturnMarket):
+                    self.execution.matchMarket(ret.symbol, ret.data)
+
+                if len(self.event_queue):
+                    event = self.event_queue.popleft()
+                    if event.type == EventType.MARKET:
+                        self.strategy_dict[event.strategy].deal(event)
+                    elif event.type == EventType.SIGNAL:
+                        self.portfolio.dealSignal(event)
+                    elif event.type == EventType.ORDER:
+                        self.execution.dealOrderEvent(event)
+                    elif event.type == EventType.FILL:
+                        self.portfolio.dealFill(event)
+                    elif event.type == EventType.SETTLEMENT:
+                        for s in self.strategy_dict.values():
+                            s.settlement(event)
+                    else:
+                        raise Exception('Unknown event type!')
+                else:
+                    break
+
+            if isinstance(ret, ReturnSettlement):
+                self.portfolio.dealSettlement(ret.tradingday)
+            elif isinstance(ret, ReturnMarket):
+                self.portfolio.dealMarket(ret.symbol, ret.data)
+            else:
+                raise Exception('unknown ret instance')
+
+
+def bench(_engine_type, _fetcher):
+    engine = _engine_type(
+        BacktestMarketSupply('20180102', '20180106', _fetcher),
+        TickBacktestExecution(),
+        TickPortfolio(_fetcher, 1e6),
+        [FlipStrategy(p, 500 + i * 100) for i, p in enumerate(PRODUCTS)]
+    )
+    begin = time.perf_counter()
+    engine.run()
+    cost = time.perf_counter() - begin
+    return engine.event_count, cost, \
+        engine.portfolio.getSettlementData()['fund']
+
+
+if __name__ == '__main__':
+    fetcher = RandomTickFetcher()
+    bench(CountEngine, fetcher)  # warm up the data cache
+    engine_types = (LegacyEngine, CountEngine)
+    cost_dict = dict((t, []) for t in engine_types)
+    result = {}
+    for _ in range(ROUNDS):
+        for engine_type in engine_types:
+            count, cost, fund = bench(engine_type, fetcher)
+            cost_dict[engine_type].append(cost)
+            result[engine_type] = count, list(fund)
+    for engine_type in engine_types:
+        count = result[engine_type][0]
+        cost = min(cost_dict[engine_type])
+        print('{:>12}: {} events, {:.3f}s, {:.0f} events/s'.format(
+            engine_type.__name__, count, cost, count / cost
+        ))
+    assert result[LegacyEngine] == result[CountEngine]
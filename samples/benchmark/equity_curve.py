@@ -0,0 +1,40 @@
+"""
+cost of sampling intraday equity curve in the tick and bar scenarios
+of suite, and the drawdown seen by intraday samples and by settlements
+"""
+import time
+
+import numpy as np
+
+from suite import SCENARIOS
+
+
+def drawdown(_fund: np.ndarray) -> float:
+    fund = np.asarray(_fund)
+    return float(((np.maximum.accumulate(fund) - fund) / fund).max())
+
+
+def bench(_name: str, _seconds: float = None):
+    engine = SCENARIOS[_name]()
+    engine.portfolio.setEquityInterval(_seconds)
+    begin = time.perf_counter()
+    engine.run()
+    cost = time.perf_counter() - begin
+    return cost, engine.portfolio
+
+
+if __name__ == '__main__':
+    for name in ('tick', 'bar'):
+        base_cost, portfolio = bench(name)
+        settlement = portfolio.getSettlementData()
+        print('{}: no sampling {:.2f}s, settlement drawdown {:.4%}'.format(
+            name, base_cost, drawdown(settlement['fund'])
+        ))
+        for seconds in (60, 1):
+            cost, portfolio = bench(name, seconds)
+            equity = portfolio.getEquityData()
+            print(' - every {}s: {:.2f}s, {} samples, '
+                  'intraday drawdown {:.4%}'.format(
+                      seconds, cost, len(equity),
+                      drawdown(equity['equity'])
+                  ))
@@ -0,0 +1,52 @@
+"""
+cost of querying equity and margin of PortfolioMgr after each price
+update, with positions in many symbols
+"""
+import time
+
+from ParadoxTrading.Engine import SignalType
+from ParadoxTrading.Engine.Portfolio import PortfolioMgr
+
+UPDATES = 100000
+
+
+def bench(_symbols: int) -> (float, float):
+    portfolio_mgr = PortfolioMgr(1e7, 0.1)
+    symbols = ['s{}'.format(i) for i in range(_symbols)]
+    for i, symbol in enumerate(symbols):
+        portfolio_mgr.incPosition(
+            symbol, SignalType.LONG if i % 2 else SignalType.SHORT,
+            1 + i % 5, 100.0
+        )
+
+    # walk all positions by the price table
+    begin = time.perf_counter()
+    for i in range(UPDATES):
+        symbol = symbols[i % _symbols]
+        portfolio_mgr.updatePrice(symbol, 100.0 + i % 7)
+        portfolio_mgr.getDynamicFund(portfolio_mgr.getProfitAndLoss(
+            portfolio_mgr.last_price_dict
+        ))
+        sum(p.margin for p in portfolio_mgr.position_mgr.values())
+    walk_cost = time.perf_counter() - begin
+
+    # running sums
+    begin = time.perf_counter()
+    for i in range(UPDATES):
+        symbol = symbols[i % _symbols]
+        portfolio_mgr.updatePrice(symbol, 100.0 + i % 7)
+        portfolio_mgr.getEquity()
+        portfolio_mgr.getMargin()
+    running_cost = time.perf_counter() - begin
+
+    full = portfolio_mgr.getProfitAndLoss(portfolio_mgr.last_price_dict)
+    assert abs(portfolio_mgr.getProfitAndLoss() - full) < 1e-6
+    return walk_cost, running_cost
+
+
+if __name__ == '__main__':
+    for num in (1, 10, 100, 1000):
+        walk_cost, running_cost = bench(num)
+        print('{:>5} symbols: walk {:8.2f} us, running {:.2f} us'.format(
+            num, walk_cost / UPDATES * 1e6, running_cost / UPDATES * 1e6
+        ))
@@ -0,0 +1,82 @@
+"""
+compare memory and time of creating events, the old dict backed
+FillEvent against the __slots__ one
+"""
+import time
+import tracemalloc
+
+from ParadoxTrading.Engine import FillEvent
+
+EVENT_NUM = 200000
+REPEAT = 5
+
+
+class DictFillEvent:
+    """
+    FillEvent before __slots__
+    """
+
+    def __init__(
+            self, _index, _symbol, _tradingday, _datetime,
+            _quantity, _action, _direction, _price, _commission
+    ):
+        self.type = 4
+        self.index = _index
+        self.symbol = _symbol
+        self.tradingday = _tradingday
+        self.datetime = _datetime
+        self.quantity = _quantity
+        self.action = _action
+        self.direction = _direction
+        self.price = _price
+        self.commission = _commission
+
+    def toDict(self) -> dict:
+        return {
+            'type': self.type,
+            'index': self.index,
+            'symbol': self.symbol,
+            'tradingday': self.tradingday,
+            'datetime': self.datetime,
+            'quantity': self.quantity,
+            'action': self.action,
+            'direction': self.direction,
+            'price': self.price,
+            'commission': self.commission,
+        }
+
+
+def create_events(_event_type):
+    return [
+        _event_type(i, 'rb1801', '20180102', None, 1, 1, 1, 3000.0, 1.5)
+        for i in range(EVENT_NUM)
+    ]
+
+
+def bench_event(_event_type):
+    # the list and index ints are counted too, they are the same for both
+    tracemalloc.start()
+    create_events(_event_type)
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # best of REPEAT runs, single runs are noisy
+    create_cost = dict_cost = float('inf')
+    for _ in range(REPEAT):
+        begin = time.perf_counter()
+        events = create_events(_event_type)
+        create_cost = min(create_cost, time.perf_counter() - begin)
+
+        begin = time.perf_counter()
+        for e in events:
+            e.toDict()
+        dict_cost = min(dict_cost, time.perf_counter() - begin)
+    return size / EVENT_NUM, create_cost, dict_cost
+
+
+if __name__ == '__main__':
+    for event_type in (DictFillEvent, FillEvent):
+        print('{:>14}: {:.0f} bytes/event, create {:.3f}s, '
+              'toDict {:.3f}s'.format(
+                  event_type.__name__, *bench_event(event_type)))
+
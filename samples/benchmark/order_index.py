@@ -0,0 +1,70 @@
+"""
+cost of TickBacktestExecution.matchMarket with many resting limit orders,
+spread over several symbols and far from the market
+"""
+import time
+
+from ParadoxTrading.Engine import ActionType, DirectionType, OrderEvent, \
+    OrderType
+from ParadoxTrading.EngineExt.Futures import TickBacktestExecution
+from ParadoxTrading.Utils import DataStruct
+
+SYMBOLS = ['rb1805', 'hc1805', 'cu1805', 'ru1805']
+TICKS = 20000
+
+
+class CountEngine:
+    """
+    the parts of engine used by execution
+    """
+
+    def __init__(self):
+        self.fill_count = 0
+
+    def addEvent(self, _event):
+        self.fill_count += 1
+
+    def getTradingDay(self) -> str:
+        return '20180102'
+
+    def getDatetime(self) -> str:
+        return '20180102 09:00:00'
+
+
+def bench(_resting: int) -> float:
+    execution = TickBacktestExecution()
+    engine = CountEngine()
+    execution.setEngine(engine)
+
+    for i in range(_resting):
+        buy = i % 2 == 0
+        execution.dealOrderEvent(OrderEvent(
+            _index=i,
+            _symbol=SYMBOLS[i % len(SYMBOLS)],
+            _tradingday='20180102',
+            _datetime='20180102 09:00:00',
+            _order_type=OrderType.LIMIT,
+            _action=ActionType.OPEN,
+            _direction=DirectionType.BUY if buy else DirectionType.SELL,
+            # never crossed
+            _price=1000.0 - i % 100 if buy else 5000.0 + i % 100,
+        ))
+
+    data = DataStruct(
+        ['happentime', 'askprice', 'bidprice'], 'happentime',
+        [['20180102 09:00:00', 3001.0, 3000.0]]
+    )
+    begin = time.perf_counter()
+    for i in range(TICKS):
+        execution.matchMarket(SYMBOLS[i % len(SYMBOLS)], data)
+    cost = time.perf_counter() - begin
+    assert engine.fill_count == 0
+    return cost
+
+
+if __name__ == '__main__':
+    for resting in (0, 10, 100, 1000, 10000):
+        cost = bench(resting)
+        print('{:>6} resting orders: {:7.2f} us/tick'.format(
+            resting, cost / TICKS * 1e6
+        ))
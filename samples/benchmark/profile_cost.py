@@ -0,0 +1,52 @@
+"""
+overhead of Engine profiler on a tick backtest, and its report.
+runs are interleaved and the min cpu time is used, to reduce noise
+"""
+import time
+
+from engine_dispatch import PRODUCTS, FlipStrategy, RandomTickFetcher
+from ParadoxTrading.EngineExt import BacktestEngine, BacktestMarketSupply
+from ParadoxTrading.EngineExt.Futures import TickBacktestExecution, \
+    TickPortfolio
+
+ROUNDS = 5
+
+
+def bench(_fetcher, _profile):
+    engine = BacktestEngine(
+        BacktestMarketSupply('20180102', '20180106', _fetcher),
+        TickBacktestExecution(),
+        TickPortfolio(_fetcher, 1e6),
+        [FlipStrategy(p, 500 + i * 100) for i, p in enumerate(PRODUCTS)]
+    )
+    if _profile:
+        engine.enableProfiler()
+    begin = time.process_time()
+    engine.run()
+    cost = time.process_time() - begin
+    engine.disableProfiler()
+    return cost
+
+
+if __name__ == '__main__':
+    fetcher = RandomTickFetcher()
+    bench(fetcher, False)  # warm up the data cache
+
+    plain, profiled = [], []
+    for _ in range(ROUNDS):
+        plain.append(bench(fetcher, False))
+        profiled.append(bench(fetcher, True))
+    plain, profiled = min(plain), min(profiled)
+    print('plain: {:.3f}s, profiled: {:.3f}s, overhead: {:.1f}%'.format(
+        plain, profiled, (profiled / plain - 1) * 100
+    ))
+
+    engine = BacktestEngine(
+        BacktestMarketSupply('20180102', '20180106', fetcher),
+        TickBacktestExecution(),
+        TickPortfolio(fetcher, 1e6),
+        [FlipStrategy(p, 500 + i * 100) for i, p in enumerate(PRODUCTS)]
+    )
+    profiler = engine.enableProfiler()
+    engine.run()
+    print(profiler.getTable())
@@ -0,0 +1,83 @@
+"""
+memory and end of run cost of records, kept in memory and dumped to csv
+at the end, or streamed to csv by CSVRecordSink during the run
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+from ParadoxTrading.Engine import ActionType, CSVRecordSink, \
+    DirectionType, FillEvent, OrderEvent, OrderType
+from ParadoxTrading.Engine.Portfolio import PortfolioMgr
+
+SYMBOLS = ['rb1805', 'hc1805', 'cu1805', 'ru1805']
+FILLS = 300000
+
+
+def deal(_portfolio_mgr: PortfolioMgr, _num: int):
+    for i in range(_num):
+        symbol = SYMBOLS[i % len(SYMBOLS)]
+        action = ActionType.OPEN if i // 4 % 2 == 0 else ActionType.CLOSE
+        datetime = '20180102 {:09d}'.format(i)
+        _portfolio_mgr.dealOrder('bench', OrderEvent(
+            _index=i, _symbol=symbol, _tradingday='20180102',
+            _datetime=datetime, _order_type=OrderType.MARKET,
+            _action=action, _direction=DirectionType.BUY,
+        ))
+        _portfolio_mgr.dealFill('bench', FillEvent(
+            _index=i, _symbol=symbol, _tradingday='20180102',
+            _datetime=datetime, _quantity=1, _action=action,
+            _direction=DirectionType.BUY
+            if action == ActionType.OPEN else DirectionType.SELL,
+            _price=3000.0 + i % 10, _commission=1.0,
+        ))
+
+
+def bench(_path: str, _stream: bool, _trace: bool) -> (float, float, int):
+    """
+    tracemalloc slows python down, so time and memory are measured
+    by separate runs
+    """
+    portfolio_mgr = PortfolioMgr(1e7)
+    if _stream:
+        portfolio_mgr.setRecordSink(CSVRecordSink(_path), 10000)
+
+    if _trace:
+        tracemalloc.start()
+    begin = time.perf_counter()
+    deal(portfolio_mgr, FILLS)
+    deal_cost = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    if _stream:
+        portfolio_mgr.closeRecordSink()
+    else:
+        portfolio_mgr.getOrderData().toPandas().to_csv(
+            os.path.join(_path, 'order.csv')
+        )
+        portfolio_mgr.getFillData().toPandas().to_csv(
+            os.path.join(_path, 'fill.csv')
+        )
+    end_cost = time.perf_counter() - begin
+    peak = 0
+    if _trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    with open(os.path.join(_path, 'fill.csv')) as f:
+        assert sum(1 for _ in f) == FILLS + 1
+    return deal_cost, end_cost, peak
+
+
+if __name__ == '__main__':
+    for stream in (False, True):
+        with tempfile.TemporaryDirectory() as path:
+            deal_cost, end_cost, _ = bench(path, stream, False)
+        with tempfile.TemporaryDirectory() as path:
+            _, _, peak = bench(path, stream, True)
+        print('{}: deal {:.2f}s, end of run {:.3f}s, total {:.2f}s, '
+              'peak memory {:.1f}MB'.format(
+                  'stream' if stream else 'memory',
+                  deal_cost, end_cost, deal_cost + end_cost, peak / 2 ** 20
+              ))
@@ -0,0 +1,57 @@
+"""
+cost of recording fills in PortfolioMgr and exporting them by
+getFillData, the export should stay linear in the number of fills,
+as lists by default or as typed columns
+"""
+import time
+
+from ParadoxTrading.Engine import ActionType, DirectionType, FillEvent, \
+    OrderEvent, OrderType
+from ParadoxTrading.Engine.Portfolio import PortfolioMgr
+
+SYMBOLS = ['rb1805', 'hc1805', 'cu1805', 'ru1805']
+
+
+def bench(_num: int) -> (float, float, float):
+    portfolio_mgr = PortfolioMgr(1e7)
+    begin = time.perf_counter()
+    for i in range(_num):
+        symbol = SYMBOLS[i % len(SYMBOLS)]
+        action = ActionType.OPEN if i // 4 % 2 == 0 else ActionType.CLOSE
+        datetime = '20180102 09:{:02d}:{:02d} {:06d}'.format(
+            i // 60 % 60, i % 60, i
+        )
+        portfolio_mgr.dealOrder('bench', OrderEvent(
+            _index=i, _symbol=symbol, _tradingday='20180102',
+            _datetime=datetime, _order_type=OrderType.MARKET,
+            _action=action, _direction=DirectionType.BUY,
+        ))
+        portfolio_mgr.dealFill('bench', FillEvent(
+            _index=i, _symbol=symbol, _tradingday='20180102',
+            _datetime=datetime, _quantity=1, _action=action,
+            _direction=DirectionType.BUY
+            if action == ActionType.OPEN else DirectionType.SELL,
+            _price=3000.0 + i % 10, _commission=1.0,
+        ))
+    deal_cost = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    fill_data = portfolio_mgr.getFillData()
+    portfolio_mgr.getOrderData()
+    export_cost = time.perf_counter() - begin
+    assert len(fill_data) == _num
+
+    begin = time.perf_counter()
+    portfolio_mgr.getFillData(_typed=True)
+    portfolio_mgr.getOrderData(_typed=True)
+    typed_cost = time.perf_counter() - begin
+    return deal_cost, export_cost, typed_cost
+
+
+if __name__ == '__main__':
+    for num in (10000, 100000, 300000):
+        deal_cost, export_cost, typed_cost = bench(num)
+        print('{:>7} fills: deal {:.2f} us/fill, export {:.3f}s, '
+              'typed {:.3f}s'.format(
+                  num, deal_cost / num * 1e6, export_cost, typed_cost
+              ))
@@ -0,0 +1,300 @@
+"""
+benchmark of tick, bar, inter-day and crypto depth backtests on synthetic
+data, the strategies mirror samples/backtest. It reports market events
+per second and the peak memory traced by tracemalloc (in a second run,
+because tracing slows down python).
+
+usage: python suite.py [scenario ...]
+"""
+import logging
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from ParadoxTrading.Engine import MarketEvent, SettlementEvent, SignalType, \
+    StrategyAbstract
+from ParadoxTrading.EngineExt import BacktestEngine, BacktestMarketSupply
+from ParadoxTrading.EngineExt.Futures import BarBacktestExecution, \
+    BarPortfolio, DailyPriceService, InterDayBacktestExecution, \
+    TickBacktestExecution, TickPortfolio
+from ParadoxTrading.EngineExt.Futures.Trend import CTAEqualFundPortfolio, \
+    CTAStrategy
+from ParadoxTrading.Fetch.ChineseFutures import RegisterIndex, \
+    RegisterInstrument
+from ParadoxTrading.Fetch.Crypto import RegisterSymbol
+from ParadoxTrading.Fetch.Synthetic import FetchDayData, FetchDepthData, \
+    FetchMinData, FetchTickData
+from ParadoxTrading.Indicator import EMA
+from ParadoxTrading.Indicator.General import FastMA
+
+logging.basicConfig(level=logging.WARNING)
+
+
+class CountStrategy(StrategyAbstract):
+    """
+    count market events for throughput
+    """
+
+    def __init__(self, _name: str):
+        super().__init__(_name)
+        self.count = 0
+
+    def deal(self, _market_event: MarketEvent):
+        self.count += 1
+        self.do_deal(_market_event)
+
+    def do_deal(self, _market_event: MarketEvent):
+        raise NotImplementedError('do_deal not implemented')
+
+    def settlement(self, _settlement_event: SettlementEvent):
+        pass
+
+
+class RangeStrategy(CountStrategy):
+    """
+    samples/backtest/futures_tick_backtest.py
+    """
+
+    def __init__(self, _product: str):
+        super().__init__('range_{}'.format(_product))
+
+        self.addMarketRegister(RegisterInstrument(_product))
+        self.ask_ema: EMA = EMA(60, _use_key='askprice')
+        self.bid_ema: EMA = EMA(60, _use_key='bidprice')
+        self.last_status: int = SignalType.EMPTY
+        self.empty_time: datetime = None
+
+    def do_deal(self, _market_event: MarketEvent):
+        if self.empty_time is None:
+            self.empty_time = datetime.strptime(
+                self.engine.getTradingDay(), '%Y%m%d'
+            ) + timedelta(hours=14, minutes=45)
+
+        if self.engine.getDatetime() > self.empty_time:
+            if self.last_status != SignalType.EMPTY:
+                self.addEvent(_market_event.symbol, 0)
+                self.last_status = SignalType.EMPTY
+            return
+
+        data = _market_event.data
+        lastprice = data['lastprice'][0]
+        ask_ema_value = self.ask_ema.addOne(data).getLastData()['ema'][0]
+        bid_ema_value = self.bid_ema.addOne(data).getLastData()['ema'][0]
+
+        if len(self.ask_ema) < 60:
+            return
+
+        if self.last_status != SignalType.LONG and \
+                lastprice > ask_ema_value:
+            self.addEvent(_market_event.symbol, 1)
+            self.last_status = SignalType.LONG
+        elif self.last_status != SignalType.SHORT and \
+                lastprice < bid_ema_value:
+            self.addEvent(_market_event.symbol, -1)
+            self.last_status = SignalType.SHORT
+
+    def settlement(self, _settlement_event: SettlementEvent):
+        self.last_status = SignalType.EMPTY
+        self.empty_time = None
+
+
+class BarMAStrategy(CountStrategy):
+    """
+    samples/backtest/futures_bar_backtest.py
+    """
+
+    def __init__(self, _product: str):
+        super().__init__('ma_{}'.format(_product))
+
+        self.addMarketRegister(RegisterInstrument(_product))
+        self.ema: EMA = EMA(20)
+        self.last_status: int = SignalType.EMPTY
+        self.empty_time: datetime = None
+
+    def do_deal(self, _market_event: MarketEvent):
+        if self.empty_time is None:
+            self.empty_time = datetime.strptime(
+                self.engine.getTradingDay(), '%Y%m%d'
+            ) + timedelta(hours=14, minutes=45)
+
+        if self.engine.getDatetime() > self.empty_time:
+            if self.last_status != SignalType.EMPTY:
+                self.addEvent(_market_event.symbol, 0)
+                self.last_status = SignalType.EMPTY
+            return
+
+        data = _market_event.data
+        closeprice = data['closeprice'][0]
+        ema_value = self.ema.addOne(data).getLastData()['ema'][0]
+
+        if len(self.ema) < 10:
+            return
+
+        if self.last_status != SignalType.LONG and closeprice > ema_value:
+            self.addEvent(_market_event.symbol, 1)
+            self.last_status = SignalType.LONG
+        elif self.last_status != SignalType.SHORT and \
+                closeprice < ema_value:
+            self.addEvent(_market_event.symbol, -1)
+            self.last_status = SignalType.SHORT
+
+    def settlement(self, _settlement_event: SettlementEvent):
+        self.ema = EMA(20)
+        self.last_status = SignalType.EMPTY
+        self.empty_time = None
+
+
+class InterDayMAStrategy(CTAStrategy):
+    """
+    daily moving average cross on product index
+    """
+
+    def __init__(self, _product: str):
+        super().__init__('interday_{}'.format(_product))
+
+        self.addMarketRegister(RegisterIndex(_product))
+        self.fast = FastMA(5, _use_key='closeprice')
+        self.slow = FastMA(20, _use_key='closeprice')
+        self.count = 0
+
+    def do_deal(self, _market_event: MarketEvent):
+        self.count += 1
+        data = _market_event.data
+        fast = self.fast.addOne(data).getLastData()['ma'][0]
+        slow = self.slow.addOne(data).getLastData()['ma'][0]
+        if len(self.slow) < 20:
+            return
+        if fast > slow:
+            self.addEvent(_market_event.symbol, 1)
+        elif fast < slow:
+            self.addEvent(_market_event.symbol, -1)
+
+    def dealStatusChanged(self, _market_event: MarketEvent):
+        pass
+
+    def dealStatusNotChanged(self, _market_event: MarketEvent):
+        pass
+
+    def settlement(self, _settlement_event: SettlementEvent):
+        pass
+
+
+class DepthMAStrategy(CountStrategy):
+    """
+    samples/backtest/crypto_depth_backtest.py
+    """
+
+    def __init__(self):
+        super().__init__('ma_strategy')
+
+        self.addMarketRegister(RegisterSymbol(
+            _exname='binance', _symbol='BTC_USDT'
+        ))
+        self.ma_5 = FastMA(5, _use_key='askprice0')
+        self.ma_10 = FastMA(10, _use_key='askprice0')
+        self.status = SignalType.EMPTY
+
+    def do_deal(self, _market_event: MarketEvent):
+        symbol = _market_event.symbol
+        data = _market_event.data
+
+        ma_5_value = self.ma_5.addOne(data).getLastData()['ma'][0]
+        ma_10_value = self.ma_10.addOne(data).getLastData()['ma'][0]
+
+        if ma_5_value > ma_10_value:
+            if self.status != SignalType.LONG:
+                self.addEvent(symbol, 1)
+                self.status = SignalType.LONG
+        elif ma_5_value < ma_10_value:
+            if self.status != SignalType.SHORT:
+                self.addEvent(symbol, -1)
+                self.status = SignalType.SHORT
+
+
+PRODUCTS = ['rb', 'hc', 'cu', 'ru']
+
+
+def tick_engine() -> BacktestEngine:
+    return BacktestEngine(
+        BacktestMarketSupply('20180102', '20180106', FetchTickData()),
+        TickBacktestExecution(3e-4),
+        TickPortfolio(FetchDayData(), 1e7, 0.15, 'closeprice'),
+        [RangeStrategy(p) for p in PRODUCTS]
+    )
+
+
+def bar_engine() -> BacktestEngine:
+    return BacktestEngine(
+        BacktestMarketSupply('20180102', '20180301', FetchMinData()),
+        BarBacktestExecution(5e-4),
+        BarPortfolio(FetchDayData(), 1e7, 0.15),
+        [BarMAStrategy(p) for p in PRODUCTS]
+    )
+
+
+def interday_engine() -> BacktestEngine:
+    fetcher = FetchDayData()
+    # execution fills from the bars prefetched by portfolio
+    price_service = DailyPriceService(fetcher)
+    execution = InterDayBacktestExecution(fetcher, 1e-4)
+    execution.setPriceService(price_service)
+    portfolio = CTAEqualFundPortfolio(fetcher, 1e7)
+    portfolio.setPriceService(price_service)
+    return BacktestEngine(
+        BacktestMarketSupply(
+            '20150101', '20180101', FetchDayData(_register_type=RegisterIndex)
+        ),
+        execution,
+        portfolio,
+        [InterDayMAStrategy(p) for p in PRODUCTS]
+    )
+
+
+def depth_engine() -> BacktestEngine:
+    # EngineExt.Crypto needs the online trading server package
+    from ParadoxTrading.EngineExt.Crypto import DepthBacktestExecution, \
+        DepthPortfolio
+    return BacktestEngine(
+        BacktestMarketSupply('20180701', '20180704', FetchDepthData()),
+        DepthBacktestExecution(_commission_rate=1e-3),
+        DepthPortfolio(),
+        DepthMAStrategy()
+    )
+
+
+SCENARIOS = {
+    'tick': tick_engine,
+    'bar': bar_engine,
+    'interday': interday_engine,
+    'depth': depth_engine,
+}
+
+
+def run(_create_engine) -> int:
+    engine = _create_engine()
+    engine.run()
+    return sum(s.count for s in engine.strategy_dict.values())
+
+
+def bench(_name: str):
+    create_engine = SCENARIOS[_name]
+
+    begin = time.perf_counter()
+    count = run(create_engine)
+    cost = time.perf_counter() - begin
+
+    tracemalloc.start()
+    run(create_engine)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print('{:>8}: {:>8} events, {:7.3f}s, {:>8.0f} events/s, '
+          'peak {:7.1f} MB'.format(
+              _name, count, cost, count / cost, peak / 2 ** 20
+          ))
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or SCENARIOS.keys():
+        bench(name)
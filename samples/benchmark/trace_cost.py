@@ -0,0 +1,41 @@
+"""
+run time of a tick backtest with trace disabled, sampled and full,
+and the last records dumped from the ring buffer
+"""
+import time
+
+from engine_dispatch import PRODUCTS, FlipStrategy, RandomTickFetcher
+from ParadoxTrading.Engine import TRACER, Tracer
+from ParadoxTrading.EngineExt import BacktestEngine, BacktestMarketSupply
+from ParadoxTrading.EngineExt.Futures import TickBacktestExecution, \
+    TickPortfolio
+
+
+def bench(_fetcher):
+    engine = BacktestEngine(
+        BacktestMarketSupply('20180102', '20180106', _fetcher),
+        TickBacktestExecution(),
+        TickPortfolio(_fetcher, 1e6),
+        [FlipStrategy(p, 500 + i * 100) for i, p in enumerate(PRODUCTS)]
+    )
+    begin = time.perf_counter()
+    engine.run()
+    return time.perf_counter() - begin
+
+
+if __name__ == '__main__':
+    fetcher = RandomTickFetcher()
+    bench(fetcher)  # warm up the data cache
+
+    TRACER.disable()
+    print('disabled: {:.3f}s'.format(bench(fetcher)))
+
+    TRACER.enable()
+    TRACER.setSampleRate(Tracer.MARKET, 0.01)
+    print('market 1%: {:.3f}s'.format(bench(fetcher)))
+
+    TRACER.setSampleRate(Tracer.MARKET, 1.0)
+    print('full: {:.3f}s'.format(bench(fetcher)))
+
+    for line in TRACER.getRecords()[-5:]:
+        print(line)
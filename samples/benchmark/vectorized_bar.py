@@ -0,0 +1,126 @@
+"""
+compare VectorizedBarBacktest with the event driven BacktestEngine on the
+same minute bars and signals (EMA cross of closeprice), then time a ten
+years vectorized backtest
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from ParadoxTrading.Engine import MarketEvent, SettlementEvent, SignalType, \
+    StrategyAbstract
+from ParadoxTrading.EngineExt import BacktestEngine, BacktestMarketSupply
+from ParadoxTrading.EngineExt.Futures import BarBacktestExecution, \
+    BarPortfolio, VectorizedBarBacktest
+from ParadoxTrading.Fetch.ChineseFutures import RegisterInstrument
+from ParadoxTrading.Fetch.Synthetic import FetchDayData, FetchMinData
+from ParadoxTrading.Indicator import EMA
+
+PRODUCTS = ['rb', 'hc', 'cu', 'ru']
+PERIOD = 20
+WARM_UP = 10
+
+
+class EMAStrategy(StrategyAbstract):
+    def __init__(self, _product: str):
+        super().__init__('ema_{}'.format(_product))
+
+        self.addMarketRegister(RegisterInstrument(_product))
+        self.ema: EMA = EMA(PERIOD)
+        self.last_status: int = SignalType.EMPTY
+
+    def deal(self, _market_event: MarketEvent):
+        data = _market_event.data
+        closeprice = data['closeprice'][0]
+        ema_value = self.ema.addOne(data).getLastData()['ema'][0]
+        if len(self.ema) < WARM_UP:
+            return
+
+        if self.last_status != SignalType.LONG and closeprice > ema_value:
+            self.addEvent(_market_event.symbol, 1)
+            self.last_status = SignalType.LONG
+        elif self.last_status != SignalType.SHORT and \
+                closeprice < ema_value:
+            self.addEvent(_market_event.symbol, -1)
+            self.last_status = SignalType.SHORT
+
+    def settlement(self, _settlement_event: SettlementEvent):
+        pass
+
+
+def ema_signal(_closeprice: np.ndarray) -> np.ndarray:
+    """
+    the same signal as EMAStrategy
+    """
+    ema = pd.Series(_closeprice).ewm(
+        alpha=1.0 / PERIOD, adjust=False
+    ).mean().values
+    signal = np.where(
+        _closeprice > ema, 1.0,
+        np.where(_closeprice < ema, -1.0, np.nan)
+    )
+    signal[:WARM_UP - 1] = np.nan
+    return signal
+
+
+def vectorized(
+        _min_fetcher, _day_fetcher, _begin_day: str, _end_day: str
+) -> (VectorizedBarBacktest, int):
+    backtest = VectorizedBarBacktest(1e7, 0.15, 5e-4, _fetcher=_day_fetcher)
+    num = 0
+    for product in PRODUCTS:
+        symbol = _min_fetcher.fetchSymbol(_begin_day, product)
+        data = _min_fetcher.fetchDayData(_begin_day, _end_day, symbol)
+        backtest.addSymbol(symbol, data, ema_signal(
+            np.asarray(data['closeprice'])
+        ))
+        num += len(data)
+    return backtest, num
+
+
+if __name__ == '__main__':
+    # one month, so that the dominant contracts do not change
+    begin_day, end_day = '20180102', '20180201'
+    min_fetcher = FetchMinData(_tick_interval=60.0, _columnar=True)
+    day_fetcher = FetchDayData()
+
+    engine = BacktestEngine(
+        BacktestMarketSupply(begin_day, end_day, min_fetcher),
+        BarBacktestExecution(5e-4),
+        BarPortfolio(day_fetcher, 1e7, 0.15),
+        [EMAStrategy(p) for p in PRODUCTS]
+    )
+    begin = time.perf_counter()
+    engine.run()
+    event_cost = time.perf_counter() - begin
+    event_fund = np.asarray(engine.portfolio.getSettlementData()['fund'])
+
+    backtest, num = vectorized(min_fetcher, day_fetcher, begin_day, end_day)
+    vector_fund = np.asarray(backtest.run()['fund'])
+    print('event driven: {} bars, {:.3f}s, {:.0f} bars/s'.format(
+        num, event_cost, num / event_cost
+    ))
+    print('max fund diff: {:.6f}, last fund: {:.2f} / {:.2f}'.format(
+        np.abs(event_fund - vector_fund).max(),
+        event_fund[-1], vector_fund[-1]
+    ))
+
+    begin = time.perf_counter()
+    backtest, num = vectorized(min_fetcher, None, '20080101', '20180101')
+    fetch_cost = time.perf_counter() - begin
+    begin = time.perf_counter()
+    settlement = backtest.run()
+    run_cost = time.perf_counter() - begin
+    print('vectorized 10 years: {} bars, fetch and signal {:.3f}s, '
+          'backtest {:.3f}s, {} tradingdays'.format(
+              num, fetch_cost, run_cost, len(settlement)
+          ))
+
+    # settled by the day data, mostly the cost of generating it
+    backtest.fetcher = day_fetcher
+    begin = time.perf_counter()
+    backtest.run()
+    print('settled by day fetcher: {:.3f}s'.format(
+        time.perf_counter() - begin
+    ))